@@ -1,98 +1,96 @@
+import numpy as np
 import pandas as pd
-import requests
 import logging
 import holidays
+from edf_forecasting.components.eco2mix_weather_store import OpenMeteoWeatherStore
 
 logging.basicConfig(level=logging.INFO)
 
+DAILY_TEMPERATURE_VARS = ["apparent_temperature_min", "apparent_temperature_max", "apparent_temperature_mean"]
+HOURLY_TEMPERATURE_VARS = ["temperature"]
+SUNSHINE_VARS = ["sunshine_duration"]
+
+WEEKDAYS_FR = ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche"]
+MONTHS_FR = [
+    "janvier", "février", "mars", "avril", "mai", "juin",
+    "juillet", "août", "septembre", "octobre", "novembre", "décembre"
+]
+SEASONS_FR = ["hiver", "printemps", "été", "automne"]
+# Season code indexed by month number (index 0 unused)
+SEASON_BY_MONTH = np.array([-1, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0])
+VACATION_RANGES = {
+    "winter": ("02-05", "03-07"), "spring": ("04-09", "05-09"),
+    "summer": ("07-06", "08-31"), "Toussaint": ("10-17", "11-02"),
+    "christmas": ("12-18", "12-31")
+}
+
+def weekday_feature(dates):
+    """French weekday names as an ordered categorical, built from integer codes."""
+    return pd.Categorical.from_codes(dates.dt.dayofweek.to_numpy(), categories=WEEKDAYS_FR, ordered=True)
+
+def month_feature(dates):
+    return pd.Categorical.from_codes(dates.dt.month.to_numpy() - 1, categories=MONTHS_FR, ordered=True)
+
+def season_feature(dates):
+    return pd.Categorical.from_codes(SEASON_BY_MONTH[dates.dt.month.to_numpy()], categories=SEASONS_FR, ordered=True)
+
+def vacation_calendar(years):
+    """Sorted datetime64[D] array of the public holidays and school vacation days of `years`."""
+    years = [int(y) for y in years]
+    days = [np.array(list(holidays.FR(years=years).keys()), dtype="datetime64[D]")]
+    for year in years:
+        for start, end in VACATION_RANGES.values():
+            days.append(np.arange(f"{year}-{start}", np.datetime64(f"{year}-{end}") + 1, dtype="datetime64[D]"))
+    return np.unique(np.concatenate(days))
+
+def vacation_feature(dates):
+    """1 for rows falling on a holiday or vacation day, 0 otherwise."""
+    days = dates.to_numpy().astype("datetime64[D]")
+    calendar = vacation_calendar(dates.dt.year.dropna().unique())
+    return np.isin(days, calendar).astype(np.int8)
+
 class Eco2mixFeaturesDay:
     """Adds selected external features to daily Eco2mix data."""
 
-    def __init__(self, df):
+    def __init__(self, df, weather_store=None):
         self.df = df.copy()
         self.df['Date'] = pd.to_datetime(self.df['Date'])
+        self.weather_store = weather_store or OpenMeteoWeatherStore()
 
     def add_temperature(self, latitude=48.85, longitude=2.35):
-        start_date = self.df['Date'].min().strftime("%Y-%m-%d")
-        end_date = self.df['Date'].max().strftime("%Y-%m-%d")
-        url = "https://archive-api.open-meteo.com/v1/archive"
-        params = {
-            "latitude": latitude, "longitude": longitude,
-            "start_date": start_date, "end_date": end_date,
-            "daily": "apparent_temperature_min,apparent_temperature_max,apparent_temperature_mean",
-            "timezone": "Europe/Paris"
-        }
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            temp_df = pd.DataFrame(response.json()["daily"])
-            temp_df["Date"] = pd.to_datetime(temp_df["time"])
-            temp_df.drop(columns=["time"], inplace=True)
-            self.df = self.df.merge(temp_df, on="Date", how="left")
-            logging.info("Temperature features added.")
-        except requests.RequestException as e:
-            logging.error(f"[API Error - Temperature] {e}")
+        self._add_daily_weather(DAILY_TEMPERATURE_VARS, latitude, longitude)
+        logging.info("Temperature features added.")
 
     def add_sunshine(self, latitude=48.85, longitude=2.35):
-        start_date = self.df['Date'].min().strftime("%Y-%m-%d")
-        end_date = self.df['Date'].max().strftime("%Y-%m-%d")
-        url = "https://archive-api.open-meteo.com/v1/archive"
-        params = {
-            "latitude": latitude, "longitude": longitude,
-            "start_date": start_date, "end_date": end_date,
-            "daily": "sunshine_duration",
-            "timezone": "Europe/Paris"
-        }
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            sun_df = pd.DataFrame(response.json()["daily"])
-            sun_df["Date"] = pd.to_datetime(sun_df["time"])
-            sun_df.drop(columns=["time"], inplace=True)
-            self.df = self.df.merge(sun_df, on="Date", how="left")
-            logging.info("Sunshine features added.")
-        except requests.RequestException as e:
-            logging.error(f"[API Error - Sunshine] {e}")
+        self._add_daily_weather(SUNSHINE_VARS, latitude, longitude)
+        logging.info("Sunshine features added.")
+
+    def _add_daily_weather(self, variables, latitude, longitude):
+        weather = self.weather_store.get(
+            "daily", variables, self.df['Date'].min(), self.df['Date'].max(), latitude, longitude
+        )
+        weather = weather.rename(columns={"time": "Date"})
+        self.df = self.df.merge(weather, on="Date", how="left")
 
     def add_weekday(self):
-        jours = ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche"]
-        self.df["weekday"] = self.df["Date"].dt.dayofweek.apply(lambda x: jours[x])
+        self.df["weekday"] = weekday_feature(self.df["Date"])
 
     def add_month(self):
-        mois = [
-            "janvier", "février", "mars", "avril", "mai", "juin",
-            "juillet", "août", "septembre", "octobre", "novembre", "décembre"
-        ]
-        self.df["month"] = self.df["Date"].dt.month.apply(lambda x: mois[x - 1])
+        self.df["month"] = month_feature(self.df["Date"])
 
     def add_season(self):
-        def season(m):
-            return (
-                "hiver" if m in [12, 1, 2] else
-                "printemps" if m in [3, 4, 5] else
-                "été" if m in [6, 7, 8] else
-                "automne"
-            )
-        self.df["season"] = self.df["Date"].dt.month.apply(season)
+        self.df["season"] = season_feature(self.df["Date"])
 
     def add_vacation(self):
-        years = self.df["Date"].dt.year.unique()
-        public_holidays = holidays.FR(years=years)
-        vacation_ranges = {
-            "winter": ("02-05", "03-07"), "spring": ("04-09", "05-09"),
-            "summer": ("07-06", "08-31"), "Toussaint": ("10-17", "11-02"),
-            "christmas": ("12-18", "12-31")
-        }
-        vacations = set()
-        for y in years:
-            for start, end in vacation_ranges.values():
-                vacations.update(pd.date_range(f"{y}-{start}", f"{y}-{end}").date)
-        self.df["is_vacation"] = self.df["Date"].dt.date.apply(
-            lambda d: int(d in public_holidays or d in vacations)
-        )
+        self.df["is_vacation"] = vacation_feature(self.df["Date"])
 
     def run(self, include=None):
         include = include or []
+        # One request for every daily variable still missing from the weather cache
+        daily_vars = (DAILY_TEMPERATURE_VARS if "temperature" in include else []) + \
+            (SUNSHINE_VARS if "sunshine" in include else [])
+        if daily_vars:
+            self.weather_store.prefetch("daily", daily_vars, self.df['Date'].min(), self.df['Date'].max())
         if "temperature" in include:
             self.add_temperature()
         if "sunshine" in include:
@@ -110,118 +108,45 @@ class Eco2mixFeaturesDay:
 class Eco2mixFeaturesMinute:
     """Adds selected external features to 30-min Eco2mix data."""
 
-    def __init__(self, df):
+    def __init__(self, df, weather_store=None):
         self.df = df.copy()
         self.df["Datetime"] = pd.to_datetime(self.df["Datetime"])
+        self.weather_store = weather_store or OpenMeteoWeatherStore()
 
     def add_temperature(self, latitude=48.85, longitude=2.35):
         self.df["Hour"] = self.df["Datetime"].dt.floor("h")
-        start_date = self.df["Hour"].min().strftime("%Y-%m-%d")
-        end_date = self.df["Hour"].max().strftime("%Y-%m-%d")
-
-        url = "https://archive-api.open-meteo.com/v1/archive"
-        params = {
-            "latitude": latitude,
-            "longitude": longitude,
-            "start_date": start_date,
-            "end_date": end_date,
-            "hourly": "temperature",
-            "timezone": "Europe/Paris"
-        }
-
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            temp_df = pd.DataFrame(data["hourly"])
-            temp_df["Hour"] = pd.to_datetime(temp_df["time"])
-            temp_df.drop(columns=["time"], inplace=True)
-            self.df = self.df.merge(temp_df, on="Hour", how="left")
-            self.df.drop(columns=["Hour"], inplace=True)
-
-            logging.info("Temperature features added.")
-        except requests.RequestException as e:
-            logging.error(f"[API Error - Temperature] {e}")
+        temp_df = self.weather_store.get(
+            "hourly", HOURLY_TEMPERATURE_VARS, self.df["Hour"].min(), self.df["Hour"].max(), latitude, longitude
+        )
+        temp_df = temp_df.rename(columns={"time": "Hour"})
+        self.df = self.df.merge(temp_df, on="Hour", how="left")
+        self.df.drop(columns=["Hour"], inplace=True)
+        logging.info("Temperature features added.")
 
     def add_sunshine(self, latitude=48.85, longitude=2.35):
-        self.df["Date"] = self.df["Datetime"].dt.date
-        start_date = min(self.df["Date"]).strftime("%Y-%m-%d")
-        end_date = max(self.df["Date"]).strftime("%Y-%m-%d")
-
-        url = "https://archive-api.open-meteo.com/v1/archive"
-        params = {
-            "latitude": latitude,
-            "longitude": longitude,
-            "start_date": start_date,
-            "end_date": end_date,
-            "daily": "sunshine_duration",
-            "timezone": "Europe/Paris"
-        }
-
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            sun_df = pd.DataFrame(data["daily"])
-            sun_df["Date"] = pd.to_datetime(sun_df["time"]).dt.date
-            sun_df.drop(columns=["time"], inplace=True)
-            self.df = self.df.merge(sun_df, on="Date", how="left")
-            self.df.drop(columns=["Date"], inplace=True)
-            logging.info("Sunshine features added.")
-        except requests.RequestException as e:
-            logging.error(f"[API Error - Sunshine] {e}")
+        self.df["Date"] = self.df["Datetime"].dt.normalize()
+        sun_df = self.weather_store.get(
+            "daily", SUNSHINE_VARS, self.df["Date"].min(), self.df["Date"].max(), latitude, longitude
+        )
+        sun_df = sun_df.rename(columns={"time": "Date"})
+        self.df = self.df.merge(sun_df, on="Date", how="left")
+        self.df.drop(columns=["Date"], inplace=True)
+        logging.info("Sunshine features added.")
 
     def add_weekday(self):
-        self.df["Date"] = self.df["Datetime"].dt.date
-        jours_fr = ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche"]
-        self.df["weekday"] = pd.to_datetime(self.df["Date"]).dt.dayofweek.apply(lambda x: jours_fr[x])
-        self.df.drop(columns=["Date"], inplace=True)
+        self.df["weekday"] = weekday_feature(self.df["Datetime"])
         logging.info("Weekday column added.")
 
     def add_month(self):
-        self.df["Date"] = self.df["Datetime"].dt.date
-        mois_fr = [
-            "janvier", "février", "mars", "avril", "mai", "juin",
-            "juillet", "août", "septembre", "octobre", "novembre", "décembre"
-        ]
-        self.df["month"] = pd.to_datetime(self.df["Date"]).dt.month.apply(lambda x: mois_fr[x - 1])
-        self.df.drop(columns=["Date"], inplace=True)
+        self.df["month"] = month_feature(self.df["Datetime"])
         logging.info("Month column added.")
 
     def add_season(self):
-        self.df["Date"] = self.df["Datetime"].dt.date
-
-        def get_season(month):
-            return (
-                "hiver" if month in [12, 1, 2] else
-                "printemps" if month in [3, 4, 5] else
-                "été" if month in [6, 7, 8] else
-                "automne"
-            )
-        self.df["season"] = pd.to_datetime(self.df["Date"]).dt.month.apply(get_season)
-        self.df.drop(columns=["Date"], inplace=True)
+        self.df["season"] = season_feature(self.df["Datetime"])
         logging.info("Season column added.")
 
     def add_vacation(self):
-        self.df["Date"] = self.df["Datetime"].dt.date
-        years = pd.to_datetime(self.df["Date"]).dt.year.unique()
-        public_holidays = holidays.FR(years=years)
-
-        zone_vacations_by_year = {
-            "winter": ("02-05", "03-07"),
-            "spring": ("04-09", "05-09"),
-            "summer": ("07-06", "08-31"),
-            "Toussaint": ("10-17", "11-02"),
-            "christmas": ("12-18", "12-31")
-        }
-
-        vacations = set()
-        for year in years:
-            for start, end in zone_vacations_by_year.values():
-                vacations.update(pd.date_range(start=f"{year}-{start}", end=f"{year}-{end}").date)
-
-        self.df["is_vacation"] = self.df["Date"].apply(lambda d: int(d in public_holidays or d in vacations))
-        self.df.drop(columns=["Date"], inplace=True)
+        self.df["is_vacation"] = vacation_feature(self.df["Datetime"])
         logging.info("Vacation flag added.")
 
     def run(self, include=None):
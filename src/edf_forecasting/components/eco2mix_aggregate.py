@@ -1,13 +1,19 @@
+import numpy as np
 import pandas as pd
 import logging
 
 logging.basicConfig(level=logging.INFO)
 
+SLOTS_PER_DAY = 48
+SLOT_LABELS = [f"{h:02d}h{m:02d}" for h in range(24) for m in (0, 30)]
+# Slots skipped when clocks go from 02h00 to 03h00 in spring: 02h00 and 02h30
+SPRING_FORWARD_SLOTS = slice(4, 6)
+
 class Eco2mixAggregate:
     """Class for aggregating Eco2mix 30-min data into daily vectors."""
 
-    def __init__(self):
-        pass
+    def __init__(self, mode='pivot'):
+        self.mode = mode
 
     def aggregate(self, df):
         """Aggregate 30-min data into daily vectors."""
@@ -15,6 +21,57 @@ class Eco2mixAggregate:
             logging.error("Missing 'Datetime' column in definitive data.")
             raise ValueError("Missing 'Datetime' column in definitive data.")
 
+        if self.mode == 'pivot':
+            return self._aggregate_pivot(df)
+        elif self.mode == 'loop':
+            return self._aggregate_loop(df)
+        else:
+            raise ValueError(f"Unknown mode: {self.mode}")
+
+    def _aggregate_pivot(self, df):
+        """Scatter rows into a days x slots x features block, then flatten it day by day.
+
+        Every day gets the same 48 slots: duplicated slots of the 50-slot DST day are
+        averaged, and the two missing slots of the 46-slot DST day are interpolated.
+        """
+        datetimes = pd.to_datetime(df['Datetime'], errors='coerce')
+        valid = datetimes.notna().to_numpy()
+        datetimes = datetimes[valid]
+
+        feature_cols = [col for col in df.columns if col not in ['Datetime', 'Date', 'HourMinute']]
+        values = df.loc[valid, feature_cols].to_numpy(dtype=float)
+
+        day_codes, days = pd.factorize(datetimes.dt.normalize(), sort=True)
+        slots = ((datetimes.dt.hour * 60 + datetimes.dt.minute) // 30).to_numpy()
+
+        n_days, n_features = len(days), len(feature_cols)
+        sums = np.zeros((n_days, SLOTS_PER_DAY, n_features))
+        counts = np.zeros((n_days, SLOTS_PER_DAY, n_features))
+        np.add.at(sums, (day_codes, slots), np.nan_to_num(values))
+        np.add.at(counts, (day_codes, slots), ~np.isnan(values))
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            block = sums / counts
+
+        rows_per_day = np.bincount(day_codes, minlength=n_days)
+        n_short, n_long = int(np.sum(rows_per_day == 46)), int(np.sum(rows_per_day == 50))
+        if n_short or n_long:
+            logging.info(f"DST days aligned to {SLOTS_PER_DAY} slots: {n_short} with 46 slots, {n_long} with 50 slots.")
+
+        # Fill the spring-forward hour of 46-slot days linearly between 01h30 and 03h00;
+        # measurements missing on any other day or slot stay NaN
+        if n_short:
+            gap = (rows_per_day == 46)[:, None, None] & (counts[:, SPRING_FORWARD_SLOTS] == 0)
+            before, after = block[:, 3:4], block[:, 6:7]
+            filled = before + (after - before) * np.array([1 / 3, 2 / 3])[None, :, None]
+            block[:, SPRING_FORWARD_SLOTS] = np.where(gap, filled, block[:, SPRING_FORWARD_SLOTS])
+
+        columns = [f"{feature}_{label}" for label in SLOT_LABELS for feature in feature_cols]
+        df_final = pd.DataFrame(block.reshape(n_days, SLOTS_PER_DAY * n_features), columns=columns)
+        df_final.insert(0, 'Date', days.date)
+        return df_final
+
+    def _aggregate_loop(self, df):
         df['Datetime'] = pd.to_datetime(df['Datetime'], errors='coerce')
         df['Date'] = df['Datetime'].dt.date
         df['HourMinute'] = df['Datetime'].dt.strftime('%Hh%M')
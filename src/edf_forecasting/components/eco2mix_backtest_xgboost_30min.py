@@ -0,0 +1,165 @@
+import os
+import json
+import hashlib
+import logging
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from edf_forecasting.components.eco2mix_optuna_study import thread_budget
+from edf_forecasting.components.eco2mix_train_xgboost_30min import Eco2mixTrainGBoost30min
+from edf_forecasting.components.eco2mix_calibrate_xgboost_30min import XGBCalibrator30min
+from edf_forecasting.components.eco2mix_evaluate_xgboost_30min import XGBEvaluate30min
+
+logging.basicConfig(level=logging.INFO)
+
+def rolling_origins(years, n_origins, window="expanding", train_years=None, min_train_years=1):
+    """Origins `{"train_years", "cal_year", "test_year"}` for the last `n_origins` test years.
+
+    Each origin calibrates on the year before its test year and trains on the years
+    before that: all of them (`window="expanding"`), or the last `train_years`
+    (`window="rolling"`). Origins with fewer than `min_train_years` training years are dropped.
+    """
+    if window == "rolling" and not train_years:
+        raise ValueError("A rolling window needs train_years, the number of years each origin trains on.")
+    years = sorted(set(int(year) for year in years))
+    origins = []
+    for test_year in years[-n_origins:]:
+        cal_year = test_year - 1
+        train = [year for year in years if year < cal_year]
+        if window == "rolling":
+            train = train[-train_years:]
+        elif window != "expanding":
+            raise ValueError(f"Unknown window: {window}")
+        if cal_year not in years or len(train) < min_train_years:
+            continue
+        origins.append({"train_years": train, "cal_year": cal_year, "test_year": test_year})
+    return origins
+
+def origin_name(origin):
+    return f"{origin['train_years'][0]}-{origin['train_years'][-1]}_cal{origin['cal_year']}_test{origin['test_year']}"
+
+def origin_digest(values, years, origin, training_params, params):
+    """Short SHA-256 of everything an origin's scores depend on, used as its cache key."""
+    digest = hashlib.sha256()
+    used = years <= origin["test_year"]
+    digest.update(np.ascontiguousarray(values[used]).tobytes())
+    digest.update(np.ascontiguousarray(years[used]).tobytes())
+    digest.update(json.dumps([origin, training_params, params], sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+def run_origin(values_path, years_path, origin, training_params, params):
+    """Train, calibrate and evaluate one origin (runs in a worker process)."""
+    values = np.load(values_path, mmap_mode="r")
+    years = np.load(years_path, mmap_mode="r")
+    target_col = params["target_col"]
+
+    def frame(mask):
+        return pd.DataFrame({target_col: values[mask]})
+
+    trainer = Eco2mixTrainGBoost30min(
+        df_train=frame(np.isin(years, origin["train_years"])),
+        training_params=training_params,
+        windows_size=params["windows_size"],
+        target_col=target_col,
+        score_train=False
+    )
+    model, _, _ = trainer.run()
+
+    calibrator = XGBCalibrator30min(
+        df_cal=frame(years == origin["cal_year"]),
+        model=model,
+        error_type=params["error_type"],
+        windows_size=params["windows_size"],
+        target_col=target_col
+    )
+    q_inf, q_sup = calibrator.run(alpha=params["alpha"])
+
+    evaluator = XGBEvaluate30min(
+        model,
+        frame(years == origin["test_year"]),
+        q_inf,
+        q_sup,
+        params["quantile"],
+        params["windows_size"],
+        target_col,
+        breakdowns=()
+    )
+    return {**evaluator.run(), "q_inf": q_inf, "q_sup": q_sup}
+
+class XGBBacktest30min:
+    """Rolling-origin backtest of the 30-min train, calibrate and evaluate stages.
+
+    Origins run in a process pool. The target series is written once to ``.npy``
+    files that every worker memory-maps, and each worker gets a fixed XGBoost thread
+    budget. Scores are cached in `cache_dir` by a hash of the data up to the test year,
+    the origin and the parameters, so a re-run only computes new or changed origins.
+    """
+
+    def __init__(self, training_params, params, cache_dir="data/07_model_output/eco2mix/xgboost/30min/backtest/.cache",
+                 n_workers=1, threads_per_worker=None):
+        self.training_params = dict(training_params)
+        self.params = params
+        self.cache_dir = cache_dir
+        self.n_workers = n_workers
+        self.threads_per_worker = threads_per_worker
+
+    def run(self, df, origins):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        values = df[self.params["target_col"]].to_numpy(dtype=np.float32)
+        years = np.asarray(df.index.year, dtype=np.int32)
+
+        training_params = dict(self.training_params, n_jobs=thread_budget(self.n_workers, self.threads_per_worker))
+        cache_paths = {
+            origin_name(origin): os.path.join(
+                self.cache_dir,
+                f"{origin_name(origin)}-{origin_digest(values, years, origin, self.training_params, self.params)}.json"
+            )
+            for origin in origins
+        }
+        to_run = [origin for origin in origins if not os.path.exists(cache_paths[origin_name(origin)])]
+        logging.info(f"Backtest: {len(origins) - len(to_run)} cached origins, {len(to_run)} to run.")
+
+        if to_run:
+            values_path = os.path.join(self.cache_dir, "values.npy")
+            years_path = os.path.join(self.cache_dir, "years.npy")
+            np.save(values_path, values)
+            np.save(years_path, years)
+
+            # spawn rather than fork: forking after XGBoost has started its OpenMP threads can deadlock
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.n_workers, mp_context=context) as executor:
+                futures = {
+                    executor.submit(run_origin, values_path, years_path, origin, training_params, self.params): origin
+                    for origin in to_run
+                }
+                for future in as_completed(futures):
+                    name = origin_name(futures[future])
+                    scores = future.result()
+                    with open(cache_paths[name], "w") as f:
+                        json.dump(scores, f)
+                    logging.info(f"Backtest origin {name}: rmse={scores['rmse']:.1f}, coverage={scores['coverage']:.3f}")
+
+            os.remove(values_path)
+            os.remove(years_path)
+
+        rows = []
+        for origin in origins:
+            with open(cache_paths[origin_name(origin)]) as f:
+                scores = json.load(f)
+            rows.append({
+                "origin": origin_name(origin),
+                "train_start": origin["train_years"][0],
+                "train_end": origin["train_years"][-1],
+                "cal_year": origin["cal_year"],
+                "test_year": origin["test_year"],
+                **scores
+            })
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def summarize(df_scores):
+        """Mean, standard deviation, min and max of each metric across origins."""
+        metrics = df_scores.drop(columns=["origin", "train_start", "train_end", "cal_year", "test_year"])
+        summary = metrics.agg(["mean", "std", "min", "max"])
+        return {metric: {stat: float(value) for stat, value in summary[metric].items()} for metric in summary.columns}
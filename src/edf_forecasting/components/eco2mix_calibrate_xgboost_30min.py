@@ -1,4 +1,127 @@
 import numpy as np
+from edf_forecasting.components.eco2mix_windowed_dataset import Eco2mixWindowedDataset
+
+class OnlineConformalCalibrator:
+    """Conformal interval bounds updated as actuals arrive, in constant memory.
+
+    Residuals go into an `n_bins` histogram over `[low, high]`, whose weights decay
+    by `decay` per residual so old patterns fade out. A residual outside the range
+    doubles it towards that side, as many times as needed, merging the old bins in
+    pairs, so the range only grows and its resolution coarsens with it. On top of it, adaptive conformal inference moves the
+    miscoverage level: `alpha_t += gamma * (alpha - miss_rate)` after each update,
+    which widens the interval after misses and narrows it after hits.
+
+    `update` recomputes the bounds from the histogram and swaps them in as one tuple,
+    so `bounds()` is O(1), never sees a half-updated pair, and nothing of the residual
+    history is stored beyond the `n_bins` weights.
+    """
+
+    def __init__(self, low, high, alpha=0.05, gamma=0.005, n_bins=2048, decay=1.0, error_type="raw"):
+        if high <= low:
+            raise ValueError("The residual range must satisfy low < high.")
+        self.low = float(low)
+        self.high = float(high)
+        self.alpha = alpha
+        self.alpha_t = alpha
+        self.gamma = gamma
+        self.n_bins = n_bins
+        self.decay = decay
+        self.error_type = error_type
+        self.weights = np.zeros(n_bins)
+        self.n_seen = 0
+        self._bounds = (0.0, 0.0)
+
+    @classmethod
+    def from_errors(cls, errors, margin=0.5, **kwargs):
+        """Calibrator whose range covers `errors` widened by `margin` of their span on each side."""
+        errors = np.asarray(errors, dtype=float)
+        if kwargs.get("error_type") == "absolute":
+            errors = np.abs(errors)
+        low, high = float(np.nanmin(errors)), float(np.nanmax(errors))
+        span = max(high - low, 1e-6)
+        return cls(low - margin * span, high + margin * span, **kwargs)
+
+    def _bins(self, errors):
+        width = (self.high - self.low) / self.n_bins
+        return np.clip(((errors - self.low) / width).astype(np.int64), 0, self.n_bins - 1)
+
+    def _grow(self, errors):
+        """Double the range towards the residuals outside it, re-binning the weights."""
+        low, high = self.low, self.high
+        while errors.min() < low or errors.max() > high:
+            span = high - low
+            if errors.min() < low:
+                low -= span
+            else:
+                high += span
+        if (low, high) == (self.low, self.high):
+            return
+        width = (self.high - self.low) / self.n_bins
+        centers = self.low + (np.arange(self.n_bins) + 0.5) * width
+        self.low, self.high = low, high
+        self.weights = np.bincount(self._bins(centers), weights=self.weights, minlength=self.n_bins)
+
+    def _quantile(self, q):
+        cdf = np.cumsum(self.weights)
+        total = cdf[-1]
+        if total <= 0:
+            return 0.0
+        target = np.clip(q, 0.0, 1.0) * total
+        idx = int(min(np.searchsorted(cdf, target), self.n_bins - 1))
+        # Linear interpolation inside the bin holding the target weight
+        before = cdf[idx - 1] if idx > 0 else 0.0
+        frac = (target - before) / self.weights[idx] if self.weights[idx] > 0 else 0.5
+        width = (self.high - self.low) / self.n_bins
+        return self.low + (idx + frac) * width
+
+    def add_errors(self, errors):
+        """Feed residuals `y_true - y_pred` in time order, without moving the level `alpha_t`.
+
+        Non-finite residuals (missing actuals or forecasts) are skipped.
+        """
+        errors = np.ravel(np.asarray(errors, dtype=float))
+        errors = errors[np.isfinite(errors)]
+        if self.error_type == "absolute":
+            errors = np.abs(errors)
+        n = len(errors)
+        if n == 0:
+            return
+        self._grow(errors)
+        # The i-th of n residuals has decayed n - 1 - i times by the end of the batch
+        self.weights *= self.decay ** n
+        age_weights = self.decay ** np.arange(n - 1, -1, -1, dtype=float)
+        self.weights += np.bincount(self._bins(errors), weights=age_weights, minlength=self.n_bins)
+        self.n_seen += n
+        self._refresh()
+
+    def update(self, y_true, y_pred):
+        """Score the current bounds against new actuals, adapt `alpha_t`, then add their residuals.
+
+        A batch is scored against the bounds in force before it and counts as one
+        adaptive step, driven by its miss rate. Pairs with a non-finite value are
+        skipped; a batch without any finite pair leaves the calibrator unchanged.
+        """
+        y_true = np.ravel(np.asarray(y_true, dtype=float))
+        y_pred = np.ravel(np.asarray(y_pred, dtype=float))
+        errors = y_true - y_pred
+        errors = errors[np.isfinite(errors)]
+        if len(errors) == 0:
+            return self.bounds()
+        q_inf, q_sup = self._bounds
+        if self.error_type == "absolute":
+            miss = (np.abs(errors) < q_inf) | (np.abs(errors) > q_sup)
+        else:
+            miss = (errors < q_inf) | (errors > q_sup)
+        self.alpha_t = float(np.clip(self.alpha_t + self.gamma * (self.alpha - np.mean(miss)), 0.0, 1.0))
+        self.add_errors(errors)
+        return self.bounds()
+
+    def _refresh(self):
+        self._bounds = (float(self._quantile(self.alpha_t / 2)), float(self._quantile(1 - self.alpha_t / 2)))
+
+    def bounds(self):
+        """Current `(q_inf, q_sup)` to add to a point forecast."""
+        return self._bounds
 
 class XGBCalibrator30min:
     def __init__(self, df_cal, model, error_type, windows_size, target_col):
@@ -13,16 +136,9 @@ class XGBCalibrator30min:
         self.y_cal = None
 
     def _create_windows(self):
-        if self.target_col not in self.df_cal.columns:
-            raise ValueError(f"Target column '{self.target_col}' not found in calibration dataframe.")
-
-        values = self.df_cal[self.target_col].values
-
-        if len(values) <= self.windows_size:
-            raise ValueError("Insufficient data to create at least one window.")
-
-        self.X_cal = np.lib.stride_tricks.sliding_window_view(values, window_shape=self.windows_size)[:-1]
-        self.y_cal = values[self.windows_size:]
+        windows = Eco2mixWindowedDataset.from_frame(self.df_cal, self.target_col, self.windows_size, name="calibration")
+        self.X_cal = windows.X
+        self.y_cal = windows.y
 
     def run(self, alpha=0.05):
         self._create_windows()
@@ -38,3 +154,27 @@ class XGBCalibrator30min:
 
         return float(self.q_inf), float(self.q_sup)
 
+    def run_online(self, alpha=0.05, gamma=0.005, n_bins=2048, decay=1.0, step_size=48, chunk_size=4096):
+        """Online calibrator replayed over the calibration split in time order.
+
+        The split is predicted in chunks of `chunk_size` windows, and every `step_size`
+        actuals (a day by default) make one adaptive step. The range of the sketch starts
+        from the first chunk, whose first step seeds the histogram, and grows as later
+        residuals fall outside it.
+        """
+        windows = Eco2mixWindowedDataset.from_frame(self.df_cal, self.target_col, self.windows_size, name="calibration")
+        calibrator = None
+        for _, X, y in windows.chunks(chunk_size):
+            y_pred = self.model.predict(X)
+            start = 0
+            if calibrator is None:
+                calibrator = OnlineConformalCalibrator.from_errors(
+                    y - y_pred, alpha=alpha, gamma=gamma, n_bins=n_bins, decay=decay, error_type=self.error_type
+                )
+                calibrator.add_errors(y[:step_size] - y_pred[:step_size])
+                start = step_size
+            for step in range(start, len(y), step_size):
+                calibrator.update(y[step:step + step_size], y_pred[step:step + step_size])
+
+        self.q_inf, self.q_sup = calibrator.bounds()
+        return calibrator
@@ -1,26 +1,71 @@
 import pandas as pd
+import logging
+
+logging.basicConfig(level=logging.INFO)
 
 class Eco2mixCleaner:
     def __init__(self,
         columns_to_keep,
         tempo_column_name='Type de jour Tempo',
         new_tempo_column_name='tempo',
-        consumption_col='Consommation'
+        consumption_col='Consommation',
+        tempo_repair='vectorized'
     ):
         self.columns_to_keep = columns_to_keep
         self.tempo_column_name = tempo_column_name
         self.new_tempo_column_name = new_tempo_column_name
         self.consumption_col = consumption_col
+        self.tempo_repair = tempo_repair
+        self.synthesized_dates = pd.DataFrame({'Date': pd.DatetimeIndex([]), 'repair': pd.Series(dtype=object)})
 
     def clean_definitive(self, df):
         df = df.dropna(subset=[self.consumption_col])
         return df[self.columns_to_keep]
 
     def clean_tempo(self, df):
-        df = self._fill_missing_dates(df)
-        df[self.tempo_column_name] = self._fill_missing_values(df, self.tempo_column_name)
+        if self.tempo_repair == 'vectorized':
+            df = self._repair_calendar(df)
+        elif self.tempo_repair == 'loop':
+            df = self._fill_missing_dates(df.copy())
+            df[self.tempo_column_name] = self._fill_missing_values(df, self.tempo_column_name)
+        else:
+            raise ValueError(f"Unknown tempo_repair: {self.tempo_repair}")
         return df.rename(columns={self.tempo_column_name: self.new_tempo_column_name})
 
+    def _repair_calendar(self, df):
+        """Rebuild a complete daily tempo calendar without Python loops.
+
+        Unparsable dates become the last valid date plus their distance to it, days
+        still absent are added by reindexing on a full daily range, and the tempo
+        colour is forward-filled. The rebuilt and inserted dates end up in
+        `self.synthesized_dates`, one row per date with its `repair`.
+        """
+        df = df.reset_index(drop=True)
+        dates = pd.to_datetime(df['Date'], errors='coerce')
+        missing = dates.isna()
+
+        # Rows since the last valid date: 0 on valid rows, 1, 2, ... on the NaT rows after them
+        run_id = (~missing).cumsum()
+        offsets = dates.groupby(run_id).cumcount()
+        dates = dates.ffill() + pd.to_timedelta(offsets, unit='D')
+        rebuilt = dates[missing].dropna()
+
+        df = df.assign(Date=dates).dropna(subset=['Date'])
+        df = df.drop_duplicates(subset='Date', keep='last').set_index('Date').sort_index()
+
+        calendar = pd.date_range(df.index.min(), df.index.max(), freq='D', name='Date')
+        inserted = calendar.difference(df.index)
+        df = df.reindex(calendar)
+        df[self.tempo_column_name] = self._fill_missing_values(df, self.tempo_column_name)
+
+        self.synthesized_dates = pd.concat([
+            pd.DataFrame({'Date': pd.DatetimeIndex(rebuilt), 'repair': 'rebuilt'}),
+            pd.DataFrame({'Date': inserted, 'repair': 'inserted'})
+        ], ignore_index=True).sort_values('Date', ignore_index=True)
+        if len(self.synthesized_dates):
+            logging.info(f"Tempo calendar: {len(rebuilt)} dates rebuilt, {len(inserted)} dates inserted.")
+        return df.reset_index()
+
     def _fill_missing_dates(self, df):
         df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
         for idx in range(1, len(df)):
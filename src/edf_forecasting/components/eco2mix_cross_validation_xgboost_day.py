@@ -1,7 +1,6 @@
 from sklearn.model_selection import cross_val_score, KFold
-from xgboost import XGBRegressor
-from sklearn.multioutput import MultiOutputRegressor
 import numpy as np
+from edf_forecasting.components.eco2mix_train_gboost_day import build_day_model
 
 class Eco2mixCrossValidationXGBoostDay:
     def __init__(self, X, y, training_params, cv_params):
@@ -11,7 +10,7 @@ class Eco2mixCrossValidationXGBoostDay:
         self.cv_params = cv_params
 
     def run(self):
-        model = MultiOutputRegressor(XGBRegressor(**self.training_params))
+        model = build_day_model(self.training_params)
         kf = KFold(**self.cv_params)
 
         scores = cross_val_score(
@@ -28,7 +27,8 @@ class Eco2mixCrossValidationXGBoostDay:
             "rmse_mean": float(np.mean(rmse_scores)),
             "rmse_std": float(np.std(rmse_scores)),
             "n_splits": self.cv_params.get("n_splits", 5),
-            "shuffle": self.cv_params.get("shuffle", False)
+            "shuffle": self.cv_params.get("shuffle", False),
+            "multi_strategy": self.training_params.get("multi_strategy", "one_output_per_tree")
         }
 
         return results
@@ -1,19 +1,40 @@
 import numpy as np
-from sklearn.metrics import r2_score, mean_squared_error
 from sklearn.base import BaseEstimator
+from edf_forecasting.components.eco2mix_streaming_metrics import StreamingMetrics
 
 class Eco2mixEvaluateGBoostDay:
-    def __init__(self, model: BaseEstimator):
+    """Test metrics of the daily model, predicted in chunks of `chunk_size` days.
+
+    Errors are accumulated per output slot, which gives the per-slot breakdown and
+    the global scores from the same pass: RMSE over all slots, and R² averaged over
+    slots like sklearn's `r2_score` does for several outputs.
+    """
+
+    def __init__(self, model: BaseEstimator, chunk_size=4096):
         self.model = model
+        self.chunk_size = chunk_size
+
     def run(self, X_test, y_test):
-        y_pred = self.model.predict(X_test)
-        r2 = r2_score(y_test, y_pred)
-        rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+        X_test = np.asarray(X_test)
+        y_test = np.asarray(y_test)
+        n_slots = y_test.shape[1]
+        metrics = StreamingMetrics(n_groups=n_slots)
+        slot_codes = np.arange(n_slots)
+
+        for start in range(0, len(X_test), self.chunk_size):
+            y_true = y_test[start:start + self.chunk_size]
+            y_pred = self.model.predict(X_test[start:start + self.chunk_size])
+            metrics.update(y_true, y_pred, codes=np.broadcast_to(slot_codes, y_true.shape))
+
+        per_slot = metrics.result()
+        sq_error = metrics.sums["sq_error"].sum()
+        n = metrics.sums["n"].sum()
 
         scores = {
-            "r2_score": float(r2),
-            "rmse": float(rmse)
+            "r2_score": float(np.mean([slot["r2"] for slot in per_slot])),
+            "rmse": float(np.sqrt(sq_error / n)),
+            "mae": float(metrics.sums["abs_error"].sum() / n),
+            "breakdowns": {"slot": {slot: result for slot, result in enumerate(per_slot)}}
         }
 
         return scores
-
@@ -1,8 +1,22 @@
 import numpy as np
-from sklearn.metrics import mean_absolute_error, r2_score, root_mean_squared_error
+import pandas as pd
+from edf_forecasting.components.eco2mix_windowed_dataset import Eco2mixWindowedDataset
+from edf_forecasting.components.eco2mix_streaming_metrics import StreamingMetrics
+
+BREAKDOWNS = ("month", "weekday", "tempo", "slot")
 
 class XGBEvaluate30min:
-    def __init__(self, model, df_test, q_inf, q_sup, quantile, windows_size, target_col):
+    """Test metrics of the 30-min model, computed in one streaming pass.
+
+    The test windows are predicted `chunk_size` at a time, and each chunk updates the
+    global metrics and every breakdown (month, weekday, tempo colour, half-hour slot
+    of the day) before being dropped, so memory stays bounded whatever the length of
+    the test period. Breakdowns need a datetime index, and a `tempo` column for the
+    tempo one; unavailable ones are skipped.
+    """
+
+    def __init__(self, model, df_test, q_inf, q_sup, quantile, windows_size, target_col,
+                 chunk_size=65536, breakdowns=BREAKDOWNS):
         self.model = model
         self.df_test = df_test
         self.q_inf = q_inf
@@ -10,52 +24,53 @@ class XGBEvaluate30min:
         self.quantile = quantile
         self.windows_size = windows_size
         self.target_col = target_col
+        self.chunk_size = chunk_size
+        self.breakdowns = breakdowns
 
-        self.X_test = None
-        self.y_test = None
-        self.y_pred = None
-        self.lower = None
-        self.upper = None
-
-    def _create_windows(self):
-        if self.target_col not in self.df_test.columns:
-            raise ValueError(f"Target column '{self.target_col}' not found in test dataframe.")
+    def _group_codes(self):
+        """Integer codes and labels of each breakdown, aligned with the test windows' targets."""
+        groups = {}
+        index = self.df_test.index[self.windows_size:]
+        if isinstance(index, pd.DatetimeIndex):
+            if "month" in self.breakdowns:
+                groups["month"] = (index.month.to_numpy() - 1, list(range(1, 13)))
+            if "weekday" in self.breakdowns:
+                groups["weekday"] = (index.weekday.to_numpy(), list(range(7)))
+            if "slot" in self.breakdowns:
+                slots = index.hour.to_numpy() * 2 + index.minute.to_numpy() // 30
+                groups["slot"] = (slots, [f"{s // 2:02d}:{30 * (s % 2):02d}" for s in range(48)])
+        if "tempo" in self.breakdowns and "tempo" in self.df_test.columns:
+            tempo = pd.Categorical(self.df_test["tempo"].iloc[self.windows_size:])
+            # Missing colours (code -1) get their own group
+            codes = np.where(tempo.codes < 0, len(tempo.categories), tempo.codes)
+            groups["tempo"] = (codes, [str(c) for c in tempo.categories] + ["unknown"])
+        return groups
 
-        values = self.df_test[self.target_col].values
-
-        if len(values) <= self.windows_size:
-            raise ValueError("Insufficient data to create at least one window.")
-
-        self.X_test = np.lib.stride_tricks.sliding_window_view(values, window_shape=self.windows_size)[:-1]
-        self.y_test = values[self.windows_size:]
+    def run(self):
+        windows = Eco2mixWindowedDataset.from_frame(self.df_test, self.target_col, self.windows_size, name="test")
+        groups = self._group_codes()
 
-    def _predict(self):
-        self._create_windows()
+        overall = StreamingMetrics(quantile=self.quantile)
+        by_group = {name: StreamingMetrics(len(labels), self.quantile) for name, (_, labels) in groups.items()}
 
-        self.y_pred = self.model.predict(self.X_test)
-        self.lower = self.y_pred + self.q_inf
-        self.upper = self.y_pred + self.q_sup
+        for start, X, y_true in windows.chunks(self.chunk_size):
+            y_pred = self.model.predict(X)
+            lower = y_pred + self.q_inf
+            upper = y_pred + self.q_sup
 
-    def _pinball_loss(self, y_true, y_pred, quantile):
-        delta = y_true - y_pred
-        return np.mean(np.maximum(quantile * delta, (quantile - 1) * delta))
+            overall.update(y_true, y_pred, lower, upper)
+            for name, (codes, _) in groups.items():
+                by_group[name].update(y_true, y_pred, lower, upper, codes[start:start + len(y_true)])
 
-    def run(self):
-        self._create_windows()
-        self._predict()
-
-        y_true = self.y_test
-        y_pred = self.y_pred
-        lower = self.lower
-        upper = self.upper
-
-        return {
-            "rmse": float(root_mean_squared_error(y_true, y_pred)),
-            "mae": float(mean_absolute_error(y_true, y_pred)),
-            "r2": float(r2_score(y_true, y_pred)),
-            "coverage": float(np.mean((y_true >= lower) & (y_true <= upper))),
-            "interval_width": float(np.mean(upper - lower)),
-            "pinball_loss_lower": float(self._pinball_loss(y_true, lower, quantile=self.quantile / 2)),
-            "pinball_loss_upper": float(self._pinball_loss(y_true, upper, quantile=1 - self.quantile / 2)),
-            "overflow_rate": float(np.mean(y_true > upper))
-        }
+        results = overall.result()[0]
+        results.pop("n_samples")
+        if by_group:
+            results["breakdowns"] = {
+                name: {
+                    label: metrics
+                    for label, metrics in zip(groups[name][1], accumulator.result())
+                    if metrics is not None
+                }
+                for name, accumulator in by_group.items()
+            }
+        return results
@@ -0,0 +1,72 @@
+import numpy as np
+from edf_forecasting.components.eco2mix_windowed_dataset import Eco2mixWindowedDataset
+
+class XGBRecursiveForecaster30min:
+    """Multi-step forecasts of the one-step 30-min model, for many origins at once.
+
+    All origins share one `(n_origins, windows_size + horizon)` lag buffer. Step `h`
+    makes a single batched `predict` over the buffer columns `h:h + windows_size`
+    and writes its output into column `windows_size + h`, where step `h + 1` reads
+    it as its most recent lag. No window is copied or shifted between steps.
+    """
+
+    def __init__(self, model, windows_size=48, dtype=np.float32):
+        self.model = model
+        self.windows_size = windows_size
+        self.dtype = dtype
+
+    def forecast(self, windows, horizon=48):
+        """`(horizon, n_origins)` forecasts from the `(n_origins, windows_size)` last lags of each origin."""
+        windows = np.atleast_2d(windows)
+        if windows.shape[1] != self.windows_size:
+            raise ValueError(f"Each origin needs exactly {self.windows_size} lags.")
+
+        n_origins = len(windows)
+        buffer = np.empty((n_origins, self.windows_size + horizon), dtype=self.dtype)
+        buffer[:, :self.windows_size] = windows
+        for step in range(horizon):
+            lags = buffer[:, step:step + self.windows_size]
+            buffer[:, self.windows_size + step] = self.model.predict(lags)
+
+        return buffer[:, self.windows_size:].T
+
+    def forecast_frame(self, df, target_col, horizon=48, stride=48, name="forecast"):
+        """Forecasts from every `stride`-th origin of `df[target_col]`, with the actuals they target.
+
+        Returns `(y_pred, y_true)`, both `(horizon, n_origins)`. Origin `j` forecasts the
+        `horizon` values following its window, so only origins with a full horizon of
+        actuals after them are kept.
+        """
+        values = Eco2mixWindowedDataset.from_frame(df, target_col, self.windows_size, name=name).values
+        n_origins = (len(values) - self.windows_size - horizon) // stride + 1
+        if n_origins <= 0:
+            raise ValueError("Insufficient data to forecast a full horizon from at least one origin.")
+
+        # Rows of `spans` are windows_size lags followed by the horizon actuals, as strided views
+        spans = np.lib.stride_tricks.sliding_window_view(values, self.windows_size + horizon)[::stride][:n_origins]
+        y_pred = self.forecast(spans[:, :self.windows_size], horizon)
+        return y_pred, spans[:, self.windows_size:].T
+
+    @staticmethod
+    def horizon_quantiles(y_pred, y_true, alpha=0.05, error_type="raw"):
+        """Per-horizon conformal quantiles `(q_inf, q_sup)` of the recursive errors, each of length `horizon`."""
+        errors = np.asarray(y_true) - y_pred
+        if error_type == "absolute":
+            errors = np.abs(errors)
+        return np.quantile(errors, alpha / 2, axis=1), np.quantile(errors, 1 - alpha / 2, axis=1)
+
+    @staticmethod
+    def bands(y_pred, q_inf, q_sup):
+        """Lower and upper bands around `(horizon, n_origins)` forecasts.
+
+        Per-horizon quantiles (arrays of length `horizon`, see `horizon_quantiles`) are
+        applied as they are. The one-step scalars from `XGBCalibrator30min` are widened
+        by `sqrt(h)` at step `h`, as if the errors fed back into the lags were independent.
+        """
+        horizon = len(y_pred)
+        if np.ndim(q_inf) == 0:
+            scale = np.sqrt(np.arange(1, horizon + 1))
+            q_inf, q_sup = q_inf * scale, q_sup * scale
+        q_inf = np.asarray(q_inf)[:, None]
+        q_sup = np.asarray(q_sup)[:, None]
+        return y_pred + q_inf, y_pred + q_sup
@@ -0,0 +1,332 @@
+import os
+import json
+import time
+import yaml
+import queue
+import pickle
+import logging
+import argparse
+import threading
+import numpy as np
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from edf_forecasting.datasets.xgboost_model_dataset import MANIFEST_FILE, XGBoostModelBundle
+
+logging.basicConfig(level=logging.INFO)
+
+MODEL_30MIN_PATH = "data/06_models/eco2mix/xgboost/30min/model_bundle.xgb"
+Q_INF_30MIN_PATH = "data/07_model_output/eco2mix/xgboost/30min/metadata/q_inf.yml"
+Q_SUP_30MIN_PATH = "data/07_model_output/eco2mix/xgboost/30min/metadata/q_sup.yml"
+ONLINE_CALIBRATOR_30MIN_PATH = "data/06_models/eco2mix/xgboost/30min/online_calibrator.pkl"
+MODEL_DAY_PATH = "data/06_models/eco2mix/xgboost/day/model.xgb"
+
+def resolve_versioned(path):
+    """File behind `path`, or its latest version when `path` is a versioned Kedro dataset directory."""
+    if os.path.isdir(path) and not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        # Versioned Kedro dataset: <path>/<version>/<file name>, versions sort chronologically
+        latest = sorted(os.listdir(path))[-1]
+        path = os.path.join(path, latest, os.path.basename(path))
+    return path
+
+def load_pickle(path):
+    with open(resolve_versioned(path), "rb") as f:
+        return pickle.load(f)
+
+def load_model(path):
+    """Native `XGBoostModelBundle` directory, loaded lazily, or a pickled model."""
+    path = resolve_versioned(path)
+    if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        return XGBoostModelBundle.load(path)
+    return load_pickle(path)
+
+def load_yaml(path):
+    with open(resolve_versioned(path)) as f:
+        return yaml.safe_load(f)
+
+class MicroBatcher:
+    """Coalesce concurrent `submit` calls into one `predict` call on a background thread.
+
+    A batch is sent as soon as it holds `max_batch_size` rows, or `max_wait_ms` after
+    its first request arrived. A lone request thus waits at most `max_wait_ms`, while
+    under load the model sees a few large batches instead of one call per request.
+    """
+
+    def __init__(self, predict, max_batch_size=1024, max_wait_ms=2.0):
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, rows):
+        """Future of the predictions for the 2D array `rows`."""
+        future = Future()
+        self._queue.put((np.asarray(rows, dtype=np.float32), future))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        batch, n_rows = [first], len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while n_rows < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                # Serve what was collected, then let the loop stop
+                self._queue.put(None)
+                break
+            batch.append(item)
+            n_rows += len(item[0])
+        return batch
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            rows = [item[0] for item in batch]
+            try:
+                y_pred = np.asarray(self.predict(np.concatenate(rows, axis=0)))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            # Hand each request back its own slice of the batch
+            bounds = np.cumsum([len(r) for r in rows])[:-1]
+            for (_, future), part in zip(batch, np.split(y_pred, bounds)):
+                future.set_result(part)
+
+class Eco2mixForecastService:
+    """Models loaded once, serving forecasts through one micro-batcher per model.
+
+    The 30-min model takes the recent consumption history of one or several series and
+    returns the next half-hour with its conformal interval `[forecast + q_inf,
+    forecast + q_sup]`. The daily model takes feature rows built like
+    `Eco2mixPreprocessGBoostDay` does and returns the 48 slots of the next day.
+
+    With an `online_calibrator`, the 30-min interval follows its current bounds
+    instead of the static `q_inf`/`q_sup`, and `update_actuals` feeds it new actuals.
+    """
+
+    def __init__(self, model_30min=None, q_inf=0.0, q_sup=0.0, windows_size=48, model_day=None,
+                 online_calibrator=None, max_batch_size=1024, max_wait_ms=2.0):
+        self.q_inf = float(q_inf)
+        self.q_sup = float(q_sup)
+        self.online_calibrator = online_calibrator
+        self._calibration_lock = threading.Lock()
+        self.windows_size = windows_size
+        self.batcher_30min = None
+        self.batcher_day = None
+        # Checked before batching, so a malformed request cannot fail the others in its batch
+        self.n_features_day = getattr(model_day, "n_features_in_", None)
+        if model_30min is not None:
+            self.batcher_30min = MicroBatcher(model_30min.predict, max_batch_size, max_wait_ms)
+        if model_day is not None:
+            self.batcher_day = MicroBatcher(model_day.predict, max_batch_size, max_wait_ms)
+
+    @classmethod
+    def from_paths(cls, model_30min_path=MODEL_30MIN_PATH, q_inf_path=Q_INF_30MIN_PATH,
+                   q_sup_path=Q_SUP_30MIN_PATH, model_day_path=MODEL_DAY_PATH,
+                   online_calibrator_path=None, windows_size=None, **kwargs):
+        """Load the saved artifacts, skipping a model whose path is None or missing.
+
+        A 30-min bundle carrying `q_inf`/`q_sup` needs no separate quantile files, and
+        its `windows_size` is used unless one is given explicitly (48 otherwise).
+        """
+        model_30min, q_inf, q_sup, model_day, online_calibrator = None, 0.0, 0.0, None, None
+        if model_30min_path and os.path.exists(model_30min_path):
+            model_30min = load_model(model_30min_path)
+            metadata = getattr(model_30min, "metadata", {})
+            q_inf = metadata["q_inf"] if "q_inf" in metadata else load_yaml(q_inf_path)
+            q_sup = metadata["q_sup"] if "q_sup" in metadata else load_yaml(q_sup_path)
+            if windows_size is None:
+                windows_size = metadata.get("windows_size")
+            logging.info(f"Loaded 30-min model from {model_30min_path}.")
+            if online_calibrator_path and os.path.exists(online_calibrator_path):
+                online_calibrator = load_pickle(online_calibrator_path)
+                logging.info(f"Loaded online calibrator from {online_calibrator_path}.")
+        if model_day_path and os.path.exists(model_day_path):
+            model_day = load_model(model_day_path)
+            logging.info(f"Loaded daily model from {model_day_path}.")
+        return cls(
+            model_30min, q_inf, q_sup, windows_size=windows_size or 48, model_day=model_day,
+            online_calibrator=online_calibrator, **kwargs
+        )
+
+    def forecast_30min(self, history):
+        if self.batcher_30min is None:
+            raise ValueError("No 30-min model loaded.")
+        history = np.atleast_2d(np.asarray(history, dtype=np.float32))
+        if history.shape[1] < self.windows_size:
+            raise ValueError(f"History must hold at least {self.windows_size} values.")
+
+        forecast = self.batcher_30min.submit(history[:, -self.windows_size:]).result()
+        q_inf, q_sup = self.bounds()
+        return {
+            "forecast": forecast.tolist(),
+            "lower": (forecast + q_inf).tolist(),
+            "upper": (forecast + q_sup).tolist(),
+            "q_inf": q_inf,
+            "q_sup": q_sup
+        }
+
+    def bounds(self):
+        if self.online_calibrator is None:
+            return self.q_inf, self.q_sup
+        with self._calibration_lock:
+            return self.online_calibrator.bounds()
+
+    def update_actuals(self, y_true, y_pred):
+        """Feed observed values and the forecasts made for them to the online calibrator."""
+        if self.online_calibrator is None:
+            raise ValueError("No online calibrator loaded.")
+        with self._calibration_lock:
+            q_inf, q_sup = self.online_calibrator.update(y_true, y_pred)
+            alpha_t = self.online_calibrator.alpha_t
+        return {"q_inf": q_inf, "q_sup": q_sup, "alpha_t": alpha_t}
+
+    def forecast_day(self, features):
+        if self.batcher_day is None:
+            raise ValueError("No daily model loaded.")
+        features = np.atleast_2d(np.asarray(features, dtype=np.float32))
+        if self.n_features_day is not None and features.shape[1] != self.n_features_day:
+            raise ValueError(f"Feature rows must hold {self.n_features_day} values.")
+        forecast = self.batcher_day.submit(features).result()
+        return {"forecast": forecast.tolist()}
+
+    def close(self):
+        for batcher in (self.batcher_30min, self.batcher_day):
+            if batcher is not None:
+                batcher.close()
+
+def make_handler(service):
+    routes = {
+        "/forecast/30min": lambda body: service.forecast_30min(body["history"]),
+        "/forecast/day": lambda body: service.forecast_day(body["features"]),
+        "/actuals": lambda body: service.update_actuals(body["y_true"], body["y_pred"])
+    }
+
+    class ForecastHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path != "/health":
+                return self._reply(404, {"error": f"Unknown path: {self.path}"})
+            self._reply(200, {
+                "30min": service.batcher_30min is not None,
+                "day": service.batcher_day is not None,
+                "online_calibration": service.online_calibrator is not None
+            })
+
+        def do_POST(self):
+            # Read the body whatever the reply, or it would be parsed as the next request of a keep-alive connection
+            data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            route = routes.get(self.path)
+            if route is None:
+                return self._reply(404, {"error": f"Unknown path: {self.path}"})
+            try:
+                self._reply(200, route(json.loads(data)))
+            except (KeyError, ValueError) as e:
+                self._reply(400, {"error": str(e)})
+            except Exception as e:
+                logging.exception("Forecast failed.")
+                self._reply(500, {"error": str(e)})
+
+        def _reply(self, status, payload):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            logging.debug(format % args)
+
+    return ForecastHandler
+
+def serve(service, host="127.0.0.1", port=8000):
+    """Start the HTTP server on a background thread; `port=0` picks a free port."""
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f"Forecast service listening on http://{server.server_address[0]}:{server.server_address[1]}")
+    return server
+
+class ForecastClient:
+    """Minimal JSON client for a running forecast service."""
+
+    def __init__(self, base_url="http://127.0.0.1:8000", timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def health(self):
+        return self._call("/health")
+
+    def forecast_30min(self, history):
+        return self._call("/forecast/30min", {"history": np.asarray(history).tolist()})
+
+    def forecast_day(self, features):
+        return self._call("/forecast/day", {"features": np.asarray(features).tolist()})
+
+    def update_actuals(self, y_true, y_pred):
+        return self._call("/actuals", {"y_true": np.asarray(y_true).tolist(), "y_pred": np.asarray(y_pred).tolist()})
+
+    def _call(self, path, body=None):
+        data = None if body is None else json.dumps(body).encode()
+        request = Request(self.base_url + path, data=data, headers={"Content-Type": "application/json"})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except HTTPError as e:
+            raise ValueError(json.loads(e.read()).get("error", str(e))) from e
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the 30-min and daily XGBoost forecasts over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model-30min", default=MODEL_30MIN_PATH)
+    parser.add_argument("--q-inf", default=Q_INF_30MIN_PATH)
+    parser.add_argument("--q-sup", default=Q_SUP_30MIN_PATH)
+    parser.add_argument("--model-day", default=MODEL_DAY_PATH)
+    parser.add_argument("--online-calibrator", default=None,
+                        help=f"e.g. {ONLINE_CALIBRATOR_30MIN_PATH}, to adapt the 30-min interval to posted actuals")
+    parser.add_argument("--windows-size", type=int, default=None,
+                        help="history length of the 30-min model, by default the bundle's own, else 48")
+    parser.add_argument("--max-batch-size", type=int, default=1024)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    service = Eco2mixForecastService.from_paths(
+        model_30min_path=args.model_30min,
+        q_inf_path=args.q_inf,
+        q_sup_path=args.q_sup,
+        model_day_path=args.model_day,
+        online_calibrator_path=args.online_calibrator,
+        windows_size=args.windows_size,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms
+    )
+    server = serve(service, args.host, args.port)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        service.close()
+
+if __name__ == "__main__":
+    main()
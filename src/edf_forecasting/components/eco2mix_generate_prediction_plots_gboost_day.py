@@ -1,28 +1,42 @@
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 from sklearn.base import BaseEstimator
+from edf_forecasting.components.eco2mix_plot_jobs import run_plot_jobs
 
-def generate_prediction_plots(model: BaseEstimator, X_test, y_test, output_dir: str, n_days: int = 3, random_seed: int = None):
+def render_prediction_plot(y_true, y_pred, title, fig_path):
+    """Render one day of true and predicted slots to `fig_path` (runs in a worker process)."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 4))
+    plt.plot(y_true, label="True", linewidth=2)
+    plt.plot(y_pred, label="Predicted", linestyle='--')
+    plt.title(title)
+    plt.xlabel("30-minute intervals")
+    plt.ylabel("Consumption")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(fig_path)
+    plt.close()
+
+def generate_prediction_plots(model: BaseEstimator, X_test, y_test, output_dir: str, n_days: int = 3,
+                              random_seed: int = None, mode: str = "background", max_workers: int = None):
+    """Plot `n_days` random test days, predicted in one batch and rendered according to `mode`."""
+    if mode == "skip":
+        return
     if random_seed is not None:
         np.random.seed(random_seed)
 
     os.makedirs(output_dir, exist_ok=True)
 
     indexes = np.random.choice(X_test.shape[0], size=n_days, replace=False)
-    y_pred = model.predict(X_test.iloc[indexes])
-    y_true = y_test.iloc[indexes]
+    y_pred = np.asarray(model.predict(X_test.iloc[indexes]))
+    y_true = y_test.iloc[indexes].to_numpy()
 
-    for i, idx in enumerate(indexes):
-        plt.figure(figsize=(10, 4))
-        plt.plot(y_true.iloc[i], label="True", linewidth=2)
-        plt.plot(y_pred[i], label="Predicted", linestyle='--')
-        plt.title(f"Prediction vs True - Sample {i+1}")
-        plt.xlabel("30-minute intervals")
-        plt.ylabel("Consumption")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        fig_path = os.path.join(output_dir, f"plot_{i+1}.png")
-        plt.savefig(fig_path)
-        plt.close()
+    jobs = [
+        (y_true[i], y_pred[i], f"Prediction vs True - Sample {i+1}", os.path.join(output_dir, f"plot_{i+1}.png"))
+        for i in range(len(indexes))
+    ]
+    run_plot_jobs(render_prediction_plot, jobs, output_dir, mode=mode, max_workers=max_workers)
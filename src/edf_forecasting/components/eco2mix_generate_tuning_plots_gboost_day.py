@@ -1,33 +1,56 @@
 import os
 import logging
-import plotly.io as pio
 import optuna
 
-from optuna.visualization import plot_optimization_history, plot_param_importances
+from edf_forecasting.components.eco2mix_optuna_study import STUDY_FILE, journal_storage
+from edf_forecasting.components.eco2mix_plot_jobs import run_plot_jobs
 
 logging.basicConfig(level=logging.INFO)
 
-def generate_tuning_plots(study: optuna.Study, output_dir: str) -> dict:
+def render_tuning_plots(study_dir: str, study_name: str, output_dir: str, image_format: str = "html"):
+    """Load the study from its journal and write its plots (runs in a worker process).
+
+    HTML is written by Plotly itself; png goes through `pio.write_image`, which starts
+    an image export process and is much slower.
+    """
+    from optuna.visualization import plot_optimization_history, plot_param_importances
+
+    study = optuna.load_study(study_name=study_name, storage=journal_storage(os.path.join(study_dir, STUDY_FILE)))
+    figures = {
+        "optimization_history": plot_optimization_history(study),
+        "param_importances": plot_param_importances(study)
+    }
+
+    paths = {}
+    for name, fig in figures.items():
+        path = os.path.join(output_dir, f"{name}.{image_format}")
+        if image_format == "html":
+            fig.write_html(path, include_plotlyjs="cdn")
+        else:
+            import plotly.io as pio
+            pio.write_image(fig, path)
+        paths[name] = path
+
+    logging.info("Tuning plots saved successfully.")
+    return paths
+
+def generate_tuning_plots(study_dir: str, study_name: str, output_dir: str, image_format: str = "html",
+                          mode: str = "background", max_workers: int = None) -> dict:
+    """Plots of the study in `study_dir`, rendered according to `mode`; returns their future paths."""
     os.makedirs(output_dir, exist_ok=True)
 
     try:
-        fig1 = plot_optimization_history(study)
-        fig2 = plot_param_importances(study)
-
-        path1 = os.path.join(output_dir, "optimization_history.png")
-        path2 = os.path.join(output_dir, "param_importances.png")
-
-        # Sauvegarde en PNG via Plotly
-        pio.write_image(fig1, path1)
-        pio.write_image(fig2, path2)
-
-        logging.info("Tuning plots saved successfully.")
-        return {
-            "optimization_history": path1,
-            "param_importances": path2
-        }
-
+        run_plot_jobs(
+            render_tuning_plots, [(study_dir, study_name, output_dir, image_format)], output_dir,
+            mode=mode, max_workers=max_workers
+        )
     except Exception as e:
         logging.warning(f"Failed to generate tuning plots: {e}")
         return {}
 
+    if mode == "skip":
+        return {}
+    return {
+        name: os.path.join(output_dir, f"{name}.{image_format}")
+        for name in ("optimization_history", "param_importances")
+    }
@@ -0,0 +1,175 @@
+import os
+import yaml
+import logging
+import tempfile
+import multiprocessing
+import numpy as np
+import optuna
+from concurrent.futures import ProcessPoolExecutor
+from optuna.storages.journal import JournalFileBackend, JournalStorage
+from optuna.study import MaxTrialsCallback
+from optuna.trial import TrialState
+
+logging.basicConfig(level=logging.INFO)
+
+STUDY_FILE = "optuna_journal.log"
+
+def journal_storage(path):
+    """Optuna storage in an append-only journal file, safe for several processes writing at once."""
+    return JournalStorage(JournalFileBackend(str(path)))
+
+def open_study(study_dir, study_name, pruner=None):
+    """Create the study stored in `study_dir`, or resume it when an earlier run already started it."""
+    os.makedirs(study_dir, exist_ok=True)
+    study = optuna.create_study(
+        direction="minimize",
+        study_name=study_name,
+        storage=journal_storage(os.path.join(study_dir, STUDY_FILE)),
+        load_if_exists=True,
+        pruner=pruner
+    )
+    if study.trials:
+        logging.info(f"Resuming study '{study_name}' with {len(study.trials)} trials.")
+    return study
+
+def add_prior_trials(study, prior_study_dir):
+    """Copy the completed trials of a sibling study into a new `study`, as a prior for its sampler.
+
+    The sibling is identified by its directory, named after the study it stores. A study
+    that already has trials is left alone, so the prior is only imported once.
+    """
+    if study.trials:
+        return
+    prior_study_dir = os.path.normpath(prior_study_dir)
+    prior = optuna.load_study(
+        study_name=os.path.basename(prior_study_dir),
+        storage=journal_storage(os.path.join(prior_study_dir, STUDY_FILE))
+    )
+    trials = prior.get_trials(deepcopy=False, states=(TrialState.COMPLETE,))
+    study.add_trials(trials)
+    logging.info(f"Added {len(trials)} trials from {prior_study_dir} to study '{study.study_name}'.")
+
+def warm_start(study, params_path=None):
+    """Enqueue the best known params as the next trial, so they are re-scored on the current data.
+
+    These are the best params of the resumed study, or for a new study the ones saved at
+    `params_path`, either a plain params file or a tuning summary with `best_params`.
+    """
+    if study.get_trials(deepcopy=False, states=(TrialState.COMPLETE,)):
+        params = study.best_params
+    elif params_path and os.path.exists(params_path):
+        if os.path.isdir(params_path):
+            # Versioned Kedro dataset: <path>/<version>/<file name>, versions sort chronologically
+            latest = sorted(os.listdir(params_path))[-1]
+            params_path = os.path.join(params_path, latest, os.path.basename(params_path))
+        with open(params_path) as f:
+            params = yaml.safe_load(f)
+        params = params.get("best_params", params)
+    else:
+        return
+    study.enqueue_trial(params)
+    logging.info(f"Warm start with {params}.")
+
+def run_study(tuner, X, y):
+    """Run `tuner.n_trials` more trials of the tuner's study; returns it with its number of earlier trials.
+
+    The study lives in ``<study_dir>/<study_name>``, so later runs resume it. A new one
+    first imports the tuner's `prior_study`, then the best known params are enqueued
+    when `warm_start` is set, and trials run in this process or in `n_workers` workers.
+    """
+    base_dir = os.path.join(tuner.study_dir, tuner.study_name)
+    study = open_study(base_dir, tuner.study_name, tuner.pruner())
+    if tuner.prior_study:
+        add_prior_trials(study, tuner.prior_study)
+    n_previous_trials = len(study.trials)
+    if tuner.warm_start:
+        warm_start(study, tuner.warm_start_from)
+
+    if tuner.n_workers > 1:
+        run_parallel_study(tuner, X, y, base_dir, tuner.study_name, tuner.n_workers, tuner.threads_per_worker)
+    else:
+        study.optimize(tuner.objective(X, y), n_trials=tuner.n_trials, timeout=tuner.timeout, show_progress_bar=True)
+    return study, n_previous_trials
+
+def save_study_summary(study, tuner, best_params, n_previous_trials, timestamp, **settings):
+    """Write the outcome of a tuning run to ``best_params.yml`` next to its journal; returns the summary.
+
+    The settings every tuner shares are read from `tuner`; `settings` adds its own.
+    """
+    base_dir = os.path.join(tuner.study_dir, tuner.study_name)
+    params_path = os.path.join(base_dir, "best_params.yml")
+    n_pruned = len(study.get_trials(deepcopy=False, states=(TrialState.PRUNED,)))
+    logging.info(f"{n_pruned} of {len(study.trials)} trials pruned.")
+
+    summary = {
+        "study_path": os.path.join(base_dir, STUDY_FILE),
+        "best_score_rmse": study.best_value,
+        "best_params": best_params,
+        "n_trials": tuner.n_trials,
+        "n_previous_trials": n_previous_trials,
+        "cv": tuner.cv,
+        "cv_strategy": tuner.cv_strategy,
+        "engine": tuner.engine,
+        "pruning": tuner.pruning,
+        "n_pruned_trials": n_pruned,
+        "n_workers": tuner.n_workers,
+        "seed": tuner.seed,
+        "timestamp": timestamp,
+        **settings
+    }
+
+    with open(params_path, "w") as f:
+        yaml.dump(summary, f)
+
+    logging.info(f"Tuning complete. Params saved to : {params_path}")
+    return summary
+
+def thread_budget(n_workers, threads_per_worker=None):
+    """XGBoost threads given to each worker: the cores split evenly unless set explicitly."""
+    if threads_per_worker is not None:
+        return threads_per_worker
+    return max(1, (os.cpu_count() or 1) // n_workers)
+
+def run_parallel_study(tuner, X, y, study_dir, study_name, n_workers, threads_per_worker=None):
+    """Run `tuner.n_trials` more trials of the study in `study_dir`, spread over `n_workers` processes.
+
+    X and y are written once to ``.npy`` files in a private temporary directory that
+    every worker memory-maps, so concurrent runs on the same study never share them.
+    Each worker builds the tuner's objective with a fixed XGBoost thread budget so
+    workers do not oversubscribe the machine.
+    """
+    with tempfile.TemporaryDirectory(prefix="optuna_workers_") as data_dir:
+        X_path = os.path.join(data_dir, "X.npy")
+        y_path = os.path.join(data_dir, "y.npy")
+        np.save(X_path, np.asarray(X))
+        np.save(y_path, np.asarray(y))
+        _run_workers(tuner, X_path, y_path, study_dir, study_name, n_workers, threads_per_worker)
+
+def _run_workers(tuner, X_path, y_path, study_dir, study_name, n_workers, threads_per_worker):
+    journal_path = os.path.join(study_dir, STUDY_FILE)
+    # An enqueued warm-start trial is one of the n_trials, like in a single-process run
+    study = optuna.load_study(study_name=study_name, storage=journal_storage(journal_path))
+    started = [t for t in study.get_trials(deepcopy=False) if t.state != TrialState.WAITING]
+    max_trials = len(started) + tuner.n_trials
+
+    n_jobs = thread_budget(n_workers, threads_per_worker)
+    logging.info(f"Tuning with {n_workers} workers of {n_jobs} threads each.")
+
+    # spawn rather than fork: forking after XGBoost has started its OpenMP threads can deadlock
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(_worker, tuner, X_path, y_path, journal_path, study_name, n_jobs, max_trials)
+            for _ in range(n_workers)
+        ]
+        for future in futures:
+            future.result()
+
+def _worker(tuner, X_path, y_path, journal_path, study_name, n_jobs, max_trials):
+    X = np.load(X_path, mmap_mode="r")
+    y = np.load(y_path, mmap_mode="r")
+    study = optuna.load_study(study_name=study_name, storage=journal_storage(journal_path), pruner=tuner.pruner())
+
+    # Trials running in other workers count too, so the study stops close to max_trials overall
+    budget = MaxTrialsCallback(max_trials, states=None)
+    study.optimize(tuner.objective(X, y, n_jobs=n_jobs), timeout=tuner.timeout, callbacks=[budget])
@@ -0,0 +1,89 @@
+import os
+import glob
+import atexit
+import pickle
+import logging
+import datetime
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+
+logging.basicConfig(level=logging.INFO)
+
+PLOT_MODES = ("sync", "background", "defer", "skip")
+DEFERRED_DIR = ".deferred"
+
+_executors = {}
+_background = []
+
+def plot_executor(max_workers=None):
+    """Process pool shared by the plotting nodes of a run asking for `max_workers`, created on first use."""
+    if max_workers not in _executors:
+        # spawn rather than fork: forking after XGBoost has started its OpenMP threads can deadlock
+        context = multiprocessing.get_context("spawn")
+        _executors[max_workers] = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+    return _executors[max_workers]
+
+def _log_failure(future):
+    if future.exception() is not None:
+        logging.warning(f"Plot rendering failed: {future.exception()}")
+
+def wait_background():
+    """Wait for the plots rendering in the background; raise if any of them failed."""
+    futures = list(_background)
+    _background.clear()
+    wait(futures)
+    failures = [future.exception() for future in futures if future.exception() is not None]
+    if failures:
+        raise RuntimeError(f"{len(failures)} of {len(futures)} background plots failed, first: {failures[0]!r}")
+
+@atexit.register
+def _report_background():
+    try:
+        wait_background()
+    except RuntimeError as e:
+        logging.error(str(e))
+
+def run_plot_jobs(render, jobs, output_dir, mode="background", max_workers=None):
+    """Call `render(*job)` for each job according to `mode`.
+
+    - sync: render in the worker pool and wait for every figure.
+    - background: submit to the worker pool and return at once; the rest of the run
+      goes on while figures render, and the process waits for them before exiting,
+      logging an error if any failed (`wait_background` raises it instead).
+    - defer: save the jobs under `<output_dir>/.deferred` for `render_deferred`.
+    - skip: render nothing.
+    """
+    jobs = list(jobs)
+    if mode == "skip" or not jobs:
+        return
+    if mode == "defer":
+        deferred_dir = os.path.join(output_dir, DEFERRED_DIR)
+        os.makedirs(deferred_dir, exist_ok=True)
+        path = os.path.join(deferred_dir, datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f.pkl"))
+        with open(path, "wb") as f:
+            pickle.dump((render, jobs), f)
+        logging.info(f"Deferred {len(jobs)} plots to {path}.")
+        return
+    if mode not in ("sync", "background"):
+        raise ValueError(f"Unknown plot mode: {mode}")
+
+    executor = plot_executor(max_workers)
+    futures = [executor.submit(render, *job) for job in jobs]
+    for future in futures:
+        future.add_done_callback(_log_failure)
+    if mode == "sync":
+        for future in futures:
+            future.result()
+    else:
+        _background.extend(futures)
+        logging.info(f"Rendering {len(jobs)} plots in the background.")
+
+def render_deferred(output_dir, max_workers=None):
+    """Render the jobs deferred under `output_dir`, then remove them."""
+    paths = sorted(glob.glob(os.path.join(output_dir, DEFERRED_DIR, "*.pkl")))
+    for path in paths:
+        with open(path, "rb") as f:
+            render, jobs = pickle.load(f)
+        run_plot_jobs(render, jobs, output_dir, mode="sync", max_workers=max_workers)
+        os.remove(path)
+    logging.info(f"Rendered {len(paths)} deferred plot batches from {output_dir}.")
@@ -15,7 +15,8 @@ class Eco2mixPreprocessGBoostDay:
         features_to_include=None,
         target_features_to_include=None,
         test_size=0.2,
-        shuffle=False
+        shuffle=False,
+        windowing='strided'
     ):
         self.target_col_prefix = target_col_prefix
         self.window_size = window_size
@@ -24,11 +25,19 @@ class Eco2mixPreprocessGBoostDay:
         self.target_features_to_include = target_features_to_include or []
         self.test_size = test_size
         self.shuffle = shuffle
+        self.windowing = windowing
 
     def run(self, df):
         df, _ = self._encode_categorical(df, self.features_to_include + self.target_features_to_include)
 
-        X, y, _ = self._create_dataset_sliding(
+        if self.windowing == 'strided':
+            create_dataset = self._create_dataset_strided
+        elif self.windowing == 'loop':
+            create_dataset = self._create_dataset_sliding
+        else:
+            raise ValueError(f"Unknown windowing: {self.windowing}")
+
+        X, y, _ = create_dataset(
             df,
             self.window_size,
             self.target_col_prefix,
@@ -68,6 +77,33 @@ class Eco2mixPreprocessGBoostDay:
 
         return np.array(X_list), np.array(y_list), date_list
 
+    def _create_dataset_strided(self, df, window_size, target_col_prefix, date_col,
+                                features_to_include, target_features_to_include):
+        """Same samples and column order as `_create_dataset_sliding`, built from strided views."""
+        target_cols = [col for col in df.columns if col.startswith(target_col_prefix)]
+        n_samples = len(df) - window_size
+        if n_samples <= 0:
+            raise ValueError("Insufficient data to create at least one window.")
+
+        # One row per day: [features_to_include..., target_cols...]
+        day_block = np.concatenate([
+            df[features_to_include].to_numpy(dtype=float),
+            df[target_cols].to_numpy(dtype=float)
+        ], axis=1)
+        n_day_cols = day_block.shape[1]
+
+        # (n_samples, window_size, n_day_cols) view, flattened day by day
+        windows = np.lib.stride_tricks.sliding_window_view(day_block, window_shape=window_size, axis=0)[:n_samples]
+        X = windows.transpose(0, 2, 1).reshape(n_samples, window_size * n_day_cols)
+
+        if target_features_to_include:
+            X = np.concatenate([X, df[target_features_to_include].to_numpy(dtype=float)[window_size:]], axis=1)
+
+        y = df[target_cols].to_numpy(dtype=float)[window_size:]
+        date_list = df[date_col].iloc[window_size:].tolist()
+
+        return X, y, date_list
+
     def _encode_categorical(self, df, columns, start_at=0):
         df = df.copy()
         mappings = {}
@@ -1,7 +1,11 @@
 import os
+import json
+import hashlib
 import pandas as pd
 import logging
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from edf_forecasting.datasets.partitioned_parquet_dataset import PartitionedParquetDataset
 
 logger = logging.getLogger(__name__)
 
@@ -9,61 +13,157 @@ def read_df(path):
     """Read a data file as CSV with tab separator and latin1 encoding."""
     return pd.read_csv(path, sep="\t", encoding="latin1", index_col=False, low_memory=False)
 
+def file_digest(path, chunk_size=1 << 20):
+    """Short SHA-256 of a file's content, used as its parse cache key."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+def parse_consumption_file(path):
+    """Parse one yearly definitive file into a frame sorted by Datetime (runs in a worker process)."""
+    df = read_df(path)
+    df = df.iloc[:-1]
+    if "Date" in df.columns and "Heures" in df.columns:
+        df["Datetime"] = pd.to_datetime(df["Date"].astype(str) + " " + df["Heures"], errors="coerce")
+        df = df.drop(columns=["Date", "Heures"])
+        df = df.sort_values("Datetime").reset_index(drop=True)
+    return df
+
+def normalize_object_columns(df):
+    """Give mixed-type object columns a single Parquet type: numeric when every value parses, string otherwise."""
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        numeric = pd.to_numeric(df[col], errors="coerce")
+        if numeric.notna().sum() == df[col].notna().sum():
+            df[col] = numeric
+        else:
+            df[col] = df[col].astype("string")
+    return df
+
 class Eco2MixDataPreparator:
     """Prepare and merge eco2mix definitive and tempo data into structured CSVs."""
 
-    def __init__(self, raw_dir, output_dir):
+    def __init__(self, raw_dir, output_dir, max_workers=None):
         """Initialize preparator with raw and output directories."""
         self.raw_dir = Path(raw_dir)
         self.output_dir = Path(output_dir)
+        self.max_workers = max_workers
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def prepare_consumption_data(self, start_year: int, end_year: int, output_filename="consumption_data.csv"):
-        """Load, align, and merge consumption data between start and end years."""
+    def prepare_consumption_data(self, start_year: int, end_year: int, output_filename="consumption_data"):
+        """Load, align, and merge consumption data between start and end years into a year-partitioned Parquet dataset.
+
+        Files are parsed in a process pool and cached by content hash, so a re-run only
+        re-parses the files that changed. The manifest records the hash of every file
+        whose partitions were written, so a re-run only rewrites the years of files whose
+        hash differs from it, including those of a run that failed before saving.
+        """
         definitive_dir = self.raw_dir / "definitive"
         year_folders = sorted([p for p in definitive_dir.iterdir() if p.is_dir()])
+        cache_dir = self.output_dir / ".cache" / "definitive"
+        cache_dir.mkdir(parents=True, exist_ok=True)
 
-        baseline_columns = None
-        all_dfs = []
-
+        files = []
         for year_folder in year_folders:
             year = int(year_folder.name)
             if year < start_year or year > end_year:
                 continue
+            files.extend(sorted(year_folder.glob("*.xls")))
+
+        digests = {file: file_digest(file) for file in files}
+        cache_paths = {file: cache_dir / f"{file.stem}-{digests[file]}.pkl" for file in files}
+        to_parse = [file for file in files if not cache_paths[file].exists()]
+
+        if to_parse:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(parse_consumption_file, file): file for file in to_parse}
+                for future in as_completed(futures):
+                    file = futures[future]
+                    try:
+                        df = future.result()
+                        df.to_pickle(cache_paths[file])
+                        self._remove_stale_cache(cache_paths[file])
+                        logging.info(f"Parsed {file.name} with {df.shape[0]} rows.")
+                    except Exception as e:
+                        logging.error(f"Failed loading {file.name}: {e}")
 
-            for file in year_folder.glob("*.xls"):
-                try:
-                    df = read_df(file)
-                    df = df.iloc[:-1]
-                    if baseline_columns is None:
-                        baseline_columns = list(df.columns)
-                        logging.info(f"Baseline columns from {file.name} ({len(baseline_columns)} columns)")
-                    df = df[[col for col in baseline_columns if col in df.columns]]
-                    all_dfs.append(df)
-                    logging.info(f"Loaded {file.name} with {df.shape[0]} rows.")
-                except Exception as e:
-                    logging.error(f"Failed loading {file.name}: {e}")
+        baseline_columns = None
+        chunks = []
+        sources = {}
 
-        if not all_dfs:
+        for file in files:
+            if not cache_paths[file].exists():
+                continue
+            df = pd.read_pickle(cache_paths[file])
+            if baseline_columns is None:
+                baseline_columns = list(df.columns)
+                logging.info(f"Baseline columns from {file.name} ({len(baseline_columns)} columns)")
+            chunks.append(df[[col for col in baseline_columns if col in df.columns]])
+            sources[file.relative_to(self.raw_dir).as_posix()] = digests[file]
+
+        if not chunks:
             logging.error("No consumption data found.")
             return
 
-        df_all = pd.concat(all_dfs, ignore_index=True)
-        if "Date" in df_all.columns and "Heures" in df_all.columns:
-            df_all["Datetime"] = pd.to_datetime(df_all["Date"].astype(str) + " " + df_all["Heures"], errors="coerce")
-            df_all = df_all.drop(columns=["Date", "Heures"])
-            df_all = df_all.sort_values("Datetime").reset_index(drop=True)
+        df_all = self._merge_sorted_chunks(chunks)
+        df_all = normalize_object_columns(df_all)
 
         definitive_output_dir = self.output_dir / "definitive"
         definitive_output_dir.mkdir(parents=True, exist_ok=True)
         output_path = definitive_output_dir / output_filename
-
-        # Remove existing file if it exists
-        if output_path.exists():
-            output_path.unlink()
-
-        df_all.to_csv(output_path, index=False)
-        logging.info(f"Consumption data saved to {output_path}.")
+        self._save_consumption_data(df_all, chunks, sources, output_path, cache_dir / "manifest.json")
+
+    def _merge_sorted_chunks(self, chunks):
+        """Concatenate per-file chunks already sorted by Datetime, sorting again only if they overlap."""
+        if "Datetime" not in chunks[0].columns:
+            return pd.concat(chunks, ignore_index=True)
+
+        chunks = sorted(chunks, key=lambda c: c["Datetime"].min())
+        df_all = pd.concat(chunks, ignore_index=True)
+        if not df_all["Datetime"].is_monotonic_increasing:
+            df_all = df_all.sort_values("Datetime", kind="stable").reset_index(drop=True)
+        return df_all
+
+    def _save_consumption_data(self, df_all, chunks, sources, output_path, manifest_path):
+        """Rewrite only the year partitions of files whose hash differs from the manifest's.
+
+        `sources` maps each chunk's file to its content hash, in chunk order. The whole
+        dataset is rewritten when the schema or the year range moved. The manifest is
+        written last, so hashes are only recorded once their partitions are on disk.
+        """
+        years = sorted(int(y) for y in df_all["Datetime"].dt.year.dropna().unique())
+        dtypes = {col: str(dtype) for col, dtype in df_all.dtypes.items()}
+        manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+        saved = manifest.get("files", {})
+        dataset = PartitionedParquetDataset(filepath=str(output_path), datetime_col="Datetime")
+
+        if dataset.exists() and manifest.get("dtypes") == dtypes and manifest.get("years") == years:
+            changed_years = sorted({
+                int(y) for chunk, (source, digest) in zip(chunks, sources.items()) if saved.get(source) != digest
+                for y in chunk["Datetime"].dt.year.dropna().unique()
+            })
+            if not changed_years:
+                logging.info(f"Consumption data in {output_path} is up to date.")
+                return
+            df_changed = df_all[df_all["Datetime"].dt.year.isin(changed_years)]
+            PartitionedParquetDataset(
+                filepath=str(output_path), datetime_col="Datetime", save_args={"mode": "update"}
+            ).save(df_changed)
+            logging.info(f"Consumption data partitions {changed_years} updated in {output_path}.")
+        else:
+            dataset.save(df_all)
+            logging.info(f"Consumption data saved to {output_path}.")
+
+        manifest_path.write_text(json.dumps({"dtypes": dtypes, "years": years, "files": sources}, indent=2))
+
+    def _remove_stale_cache(self, cache_path):
+        """Drop cached parses of older contents of the same raw file."""
+        stem = cache_path.stem.rsplit("-", 1)[0]
+        for old in cache_path.parent.glob(f"{stem}-*.pkl"):
+            if old != cache_path and old.stem.rsplit("-", 1)[0] == stem:
+                old.unlink()
 
     def prepare_tempo_calendar(self, start_year: int, end_year: int, output_filename="tempo_calendar.csv"):
         """Load and merge tempo data into a cleaned CSV between given years."""
@@ -1,64 +1,251 @@
 import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import threading
 import requests
 import zipfile
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 import logging
 
 logger = logging.getLogger(__name__)
 
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def sha256_file(path, chunk_size=1 << 20):
+    """SHA-256 of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
 class Eco2MixScraper:
-    def __init__(self, output_dir="data/01_raw/eco2mix"):
+    """Download eco2mix archives concurrently over one pooled session.
+
+    Archives are streamed to a ``.part`` file that later attempts and runs resume with
+    a Range request, guarded by ``If-Range`` with the validator of the response that
+    started the file and by a check of the ``Content-Range`` start, extracted into a temporary directory and moved into place once complete.
+    ``manifest.json`` records the checksum of every extracted file: a year is only
+    skipped when its manifest entry matches what is on disk.
+    """
+
+    def __init__(self, output_dir="data/01_raw/eco2mix", max_workers=4, timeout=60, max_retries=3,
+                 chunk_size=1 << 20, backoff_factor=1.0):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.chunk_size = chunk_size
+        self.backoff_factor = backoff_factor
+        self.manifest_path = self.output_dir / "manifest.json"
+        self.download_dir = self.output_dir / ".downloads"
+        self._manifest_lock = threading.Lock()
+        self.session = self._build_session()
 
     def scrape_definitive_data(self, start_year: int, end_year: int):
         """Download and extract annual definitive electricity data from eco2mix."""
         base_url = "https://eco2mix.rte-france.com/download/eco2mix/eCO2mix_RTE_Annuel-Definitif_{}.zip"
+        jobs = []
         for year in range(start_year, end_year + 1):
-            url = base_url.format(year)
-            dest_dir = self.output_dir / "definitive" / str(year)
-            if dest_dir.exists():
-                logging.info(f"Data for year {year} already exists. Skipping.")
-                continue
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            zip_path = dest_dir / f"{year}.zip"
-            logging.info(f"Downloading {url}...")
-            response = requests.get(url)
-            if response.status_code == 200:
-                with open(zip_path, "wb") as f:
-                    f.write(response.content)
-                logging.info(f"Extracting {zip_path}...")
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(dest_dir)
-                zip_path.unlink()
-                logging.info(f"Done with year {year}.")
-            else:
-                logging.warning(f"Failed to download data for year {year}: {response.status_code}")
+            jobs.append({
+                "key": f"definitive/{year}",
+                "url": base_url.format(year),
+                "dest_dir": self.output_dir / "definitive" / str(year),
+                "archive_name": f"{year}.zip",
+                "keep_if_not_zip": False
+            })
+        self._download_all(jobs)
 
     def scrape_tempo_data(self, start_year: int, end_year: int):
         """Download and extract tempo tariff calendar data from eco2mix."""
         base_url = "https://eco2mix.rte-france.com/curves/downloadCalendrierTempo?season={}-{}"
+        jobs = []
         for year in range(start_year, end_year):
             start_suffix = str(year)[2:]
             end_suffix = str(year + 1)[2:]
-            url = base_url.format(start_suffix, end_suffix)
-            dest_dir = self.output_dir / "tempo" / f"{year}-{year+1}"
-            if dest_dir.exists():
-                logging.info(f"Tempo data for season {year}-{year+1} already exists. Skipping.")
+            jobs.append({
+                "key": f"tempo/{year}-{year+1}",
+                "url": base_url.format(start_suffix, end_suffix),
+                "dest_dir": self.output_dir / "tempo" / f"{year}-{year+1}",
+                "archive_name": f"{year}-{year+1}.zip",
+                "keep_if_not_zip": True
+            })
+        self._download_all(jobs)
+
+    def _build_session(self):
+        """Session whose connection pool is sized for the worker threads.
+
+        Retries are left to `_download_archive`, which resumes from the partial file.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _download_all(self, jobs):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for future in [executor.submit(self._download_archive, **job) for job in jobs]:
+                future.result()
+
+    def _download_archive(self, key, url, dest_dir, archive_name, keep_if_not_zip):
+        if self._is_complete(key, dest_dir):
+            logging.info(f"Data for {key} already complete. Skipping.")
+            return
+
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        part_path = self.download_dir / f"{key.replace('/', '_')}.part"
+        logging.info(f"Downloading {url}...")
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.backoff_factor * 2 ** (attempt - 1))
+            try:
+                status_code = self._stream_to_file(url, part_path)
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    logging.warning(f"Download of {key} interrupted, it will resume on the next run: {e}")
+                    return
+                logging.info(f"Download of {key} interrupted, resuming: {e}")
                 continue
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            zip_path = dest_dir / f"{year}-{year+1}.zip"
-            logging.info(f"Downloading {url}...")
-            response = requests.get(url)
+            if status_code not in RETRY_STATUSES:
+                break
+            logging.info(f"Server answered {status_code} for {key}, retrying.")
+        if status_code not in (200, 206):
+            logging.warning(f"Failed to download data for {key}: {status_code}")
+            return
+
+        tmp_dir = self.download_dir / f"{key.replace('/', '_')}.extract"
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+        try:
+            with zipfile.ZipFile(part_path, 'r') as zip_ref:
+                zip_ref.extractall(tmp_dir)
+            logging.info(f"Extracted {url} into {dest_dir}.")
+        except zipfile.BadZipFile:
+            if not keep_if_not_zip:
+                logging.warning(f"Downloaded file for {key} is not a valid zip. Discarding it.")
+                self._discard(part_path)
+                shutil.rmtree(tmp_dir)
+                return
+            logging.warning(f"Downloaded file for {key} is not a zip. Keeping as is.")
+            shutil.copyfile(part_path, tmp_dir / archive_name)
+
+        archive_sha256 = sha256_file(part_path)
+        files = {
+            str(path.relative_to(tmp_dir)): sha256_file(path)
+            for path in sorted(tmp_dir.rglob("*")) if path.is_file()
+        }
+
+        # Swap in the complete directory so an interrupted run never leaves a partial one behind
+        if dest_dir.exists():
+            shutil.rmtree(dest_dir)
+        dest_dir.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_dir, dest_dir)
+        self._discard(part_path)
+
+        self._record(key, {"url": url, "archive_sha256": archive_sha256, "files": files})
+        logging.info(f"Done with {key}.")
+
+    def _stream_to_file(self, url, part_path):
+        """Stream `url` to `part_path`, resuming from its current size; returns the HTTP status code."""
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        validator_path = self._validator_path(part_path)
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if validator_path.exists():
+                # The server sends the whole archive instead if it changed since the partial file was started
+                headers["If-Range"] = validator_path.read_text()
+
+        with self.session.get(url, stream=True, headers=headers, timeout=self.timeout) as response:
+            if response.status_code == 416:
+                # Nothing left after `offset`: the partial file is complete unless it outgrew the archive
+                if self._remote_size(response) == offset:
+                    return 206
+                self._discard(part_path)
+                return self._stream_to_file(url, part_path)
+            if response.status_code not in (200, 206):
+                return response.status_code
+            if response.status_code == 206 and self._range_start(response) != offset:
+                self._discard(part_path)
+                if not offset:
+                    raise requests.RequestException(f"Unexpected Content-Range for a full request: "
+                                                    f"{response.headers.get('Content-Range')}")
+                logging.info(f"Content-Range does not resume {part_path.name} at byte {offset}, restarting it.")
+                return self._stream_to_file(url, part_path)
+
+            # 200 means the server ignored the Range header, or If-Range failed, and sends the whole archive
+            mode = "ab" if response.status_code == 206 else "wb"
             if response.status_code == 200:
-                with open(zip_path, "wb") as f:
-                    f.write(response.content)
-                try:
-                    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                        zip_ref.extractall(dest_dir)
-                    logging.info(f"Extracted {zip_path} into {dest_dir}.")
-                    zip_path.unlink()
-                except zipfile.BadZipFile:
-                    logging.warning(f"Downloaded file for {year}-{year+1} is not a zip. Keeping as is.")
-            else:
-                logging.warning(f"Failed to download tempo data for season {year}-{year+1}: {response.status_code}")
+                validator = self._validator(response)
+                if validator:
+                    validator_path.write_text(validator)
+                else:
+                    validator_path.unlink(missing_ok=True)
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+            return response.status_code
+
+    @staticmethod
+    def _validator_path(part_path):
+        return part_path.with_name(part_path.name + ".validator")
+
+    def _discard(self, part_path):
+        """Remove a partial download and the validator it was started with."""
+        part_path.unlink(missing_ok=True)
+        self._validator_path(part_path).unlink(missing_ok=True)
+
+    @staticmethod
+    def _validator(response):
+        """Strong ETag, else Last-Modified, of a full response; weak ETags cannot be used with If-Range."""
+        etag = response.headers.get("ETag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return response.headers.get("Last-Modified")
+
+    @staticmethod
+    def _range_start(response):
+        """First byte of a ``Content-Range: bytes <start>-<end>/<size>`` header, or None."""
+        match = re.match(r"bytes (\d+)-", response.headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else None
+
+    @staticmethod
+    def _remote_size(response):
+        """Full size of the remote file from a ``Content-Range: bytes */<size>`` header, or None."""
+        total = response.headers.get("Content-Range", "").rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+
+    def _is_complete(self, key, dest_dir):
+        entry = self._load_manifest().get(key)
+        if entry is None:
+            if dest_dir.exists():
+                logging.info(f"{dest_dir} has no manifest entry, downloading it again.")
+            return False
+        for name, checksum in entry["files"].items():
+            path = dest_dir / name
+            if not path.is_file() or sha256_file(path) != checksum:
+                logging.info(f"{path} is missing or corrupted, downloading {key} again.")
+                return False
+        return True
+
+    def _load_manifest(self):
+        with self._manifest_lock:
+            if not self.manifest_path.exists():
+                return {}
+            return json.loads(self.manifest_path.read_text())
+
+    def _record(self, key, entry):
+        with self._manifest_lock:
+            manifest = json.loads(self.manifest_path.read_text()) if self.manifest_path.exists() else {}
+            manifest[key] = entry
+            tmp_path = self.manifest_path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+            os.replace(tmp_path, self.manifest_path)
@@ -0,0 +1,72 @@
+import numpy as np
+
+def pinball(y_true, y_pred, quantile):
+    delta = y_true - y_pred
+    return np.maximum(quantile * delta, (quantile - 1) * delta)
+
+class StreamingMetrics:
+    """Regression and interval metrics accumulated chunk by chunk, per group.
+
+    Only running sums are kept per group (counts, errors, squared errors, target sums,
+    interval hits...), so memory depends on the number of groups and not on the
+    number of samples. Groups are integer codes in `[0, n_groups)` given with each
+    chunk; every sum is updated with one `np.bincount`.
+    """
+
+    def __init__(self, n_groups=1, quantile=None):
+        self.n_groups = n_groups
+        self.quantile = quantile
+        self.sums = {}
+
+    def _add(self, name, codes, values):
+        total = np.bincount(codes, weights=values, minlength=self.n_groups)
+        self.sums[name] = self.sums.get(name, 0.0) + total
+
+    def update(self, y_true, y_pred, lower=None, upper=None, codes=None):
+        y_true = np.ravel(np.asarray(y_true, dtype=np.float64))
+        y_pred = np.ravel(np.asarray(y_pred, dtype=np.float64))
+        codes = np.zeros(len(y_true), dtype=np.int64) if codes is None else np.ravel(codes)
+        errors = y_true - y_pred
+
+        self._add("n", codes, None)
+        self._add("sq_error", codes, errors ** 2)
+        self._add("abs_error", codes, np.abs(errors))
+        self._add("y", codes, y_true)
+        self._add("y_sq", codes, y_true ** 2)
+
+        if lower is not None:
+            lower = np.ravel(np.asarray(lower, dtype=np.float64))
+            upper = np.ravel(np.asarray(upper, dtype=np.float64))
+            self._add("covered", codes, ((y_true >= lower) & (y_true <= upper)).astype(np.float64))
+            self._add("width", codes, upper - lower)
+            self._add("overflow", codes, (y_true > upper).astype(np.float64))
+            self._add("pinball_lower", codes, pinball(y_true, lower, self.quantile / 2))
+            self._add("pinball_upper", codes, pinball(y_true, upper, 1 - self.quantile / 2))
+
+    def result(self):
+        """One metrics dict per group, None for groups without samples."""
+        n = self.sums["n"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metrics = {
+                "rmse": np.sqrt(self.sums["sq_error"] / n),
+                "mae": self.sums["abs_error"] / n,
+                "r2": 1 - self.sums["sq_error"] / (self.sums["y_sq"] - self.sums["y"] ** 2 / n)
+            }
+            if "covered" in self.sums:
+                metrics.update({
+                    "coverage": self.sums["covered"] / n,
+                    "interval_width": self.sums["width"] / n,
+                    "pinball_loss_lower": self.sums["pinball_lower"] / n,
+                    "pinball_loss_upper": self.sums["pinball_upper"] / n,
+                    "overflow_rate": self.sums["overflow"] / n
+                })
+
+        results = []
+        for group in range(self.n_groups):
+            if n[group] == 0:
+                results.append(None)
+                continue
+            row = {name: float(values[group]) for name, values in metrics.items()}
+            row["n_samples"] = int(n[group])
+            results.append(row)
+        return results
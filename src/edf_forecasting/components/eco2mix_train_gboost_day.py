@@ -6,6 +6,22 @@ from sklearn.metrics import r2_score, root_mean_squared_error
 
 logging.basicConfig(level=logging.INFO)
 
+def build_day_model(params):
+    """XGBoost model for the 48 daily slots, following `params["multi_strategy"]`.
+
+    one_output_per_tree (default) and multi_output_tree (vector-leaf trees, gbtree only)
+    fit a single native multi-target booster; separate keeps one XGBRegressor per slot
+    inside a MultiOutputRegressor.
+    """
+    params = dict(params)
+    multi_strategy = params.pop("multi_strategy", "one_output_per_tree")
+    if multi_strategy == "separate":
+        return MultiOutputRegressor(XGBRegressor(**params))
+    elif multi_strategy in ("one_output_per_tree", "multi_output_tree"):
+        return XGBRegressor(multi_strategy=multi_strategy, **params)
+    else:
+        raise ValueError(f"Unknown multi_strategy: {multi_strategy}")
+
 class Eco2mixTrainGBoostDay:
     def __init__(self, X_train, y_train, params):
         self.X = X_train
@@ -13,7 +29,7 @@ class Eco2mixTrainGBoostDay:
         self.params = params
 
     def run(self):
-        model = MultiOutputRegressor(XGBRegressor(**self.params))
+        model = build_day_model(self.params)
         model.fit(self.X, self.y)
 
         y_pred = model.predict(self.X)
@@ -24,6 +40,7 @@ class Eco2mixTrainGBoostDay:
 
         metadata = {
             "model": "XGBoost_MultiOutput",
+            "multi_strategy": self.params.get("multi_strategy", "one_output_per_tree"),
             "params_used": self.params,
             "n_samples": len(self.X)
         }
@@ -2,46 +2,96 @@ import logging
 import numpy as np
 from xgboost import XGBRegressor
 from sklearn.metrics import r2_score, root_mean_squared_error
+from edf_forecasting.components.eco2mix_windowed_dataset import Eco2mixWindowedDataset
 
 logging.basicConfig(level=logging.INFO)
 
 class Eco2mixTrainGBoost30min:
-    def __init__(self, df_train, training_params, windows_size, target_col):
+    """Fit the 30-min XGBoost model on lag windows of the training split.
+
+    With `early_stopping_rounds`, the last `early_stopping_fraction` of the training
+    split is held out, and boosting stops once the RMSE on its windows has not improved
+    for that many rounds, up to `max_n_estimators` trees if given. The calibration split
+    stays unseen, so conformal bounds fitted on it keep their coverage. Scores are then
+    computed on the held-out slice; the in-sample pass over the training windows runs
+    when `score_train` is set, by default only without early stopping.
+    """
+
+    def __init__(self, df_train, training_params, windows_size, target_col, mmap_path=None,
+                 early_stopping_rounds=None, early_stopping_fraction=0.1, max_n_estimators=None, score_train=None):
         self.df_train = df_train
         self.training_params = training_params
         self.windows_size = windows_size
         self.target_col = target_col
+        self.mmap_path = mmap_path
+        self.early_stopping_rounds = early_stopping_rounds
+        self.early_stopping_fraction = early_stopping_fraction
+        self.max_n_estimators = max_n_estimators
+        self.score_train = early_stopping_rounds is None if score_train is None else score_train
         self.X_train = None
         self.y_train = None
+        self.X_eval = None
+        self.y_eval = None
     
     def _create_windows(self):
-        if self.target_col not in self.df_train.columns:
-            raise ValueError(f"Target column '{self.target_col}' not found in train dataframe.")
-        
-        values = self.df_train[self.target_col].values
+        df_fit, df_eval = self.df_train, None
+        if self.early_stopping_rounds is not None:
+            n_fit = len(self.df_train) - int(len(self.df_train) * self.early_stopping_fraction)
+            if n_fit <= self.windows_size or n_fit == len(self.df_train):
+                raise ValueError("early_stopping_fraction leaves no windows to fit or to stop on.")
+            df_fit = self.df_train.iloc[:n_fit]
+            # The held-out targets start at n_fit; their lags may reach back into the fitted part
+            df_eval = self.df_train.iloc[n_fit - self.windows_size:]
 
-        if len(values) <= self.windows_size:
-            raise ValueError("Insufficient data to create at least one windows.")
-        
-        self.X_train = np.lib.stride_tricks.sliding_window_view(values, window_shape=self.windows_size)[:-1]
-        self.y_train = values[self.windows_size:]
+        windows = Eco2mixWindowedDataset.from_frame(
+            df_fit, self.target_col, self.windows_size, name="train", mmap_path=self.mmap_path
+        )
+        self.X_train = windows.X
+        self.y_train = windows.y
+
+        if df_eval is not None:
+            eval_windows = Eco2mixWindowedDataset.from_frame(
+                df_eval, self.target_col, self.windows_size, name="early stopping"
+            )
+            self.X_eval = eval_windows.X
+            self.y_eval = eval_windows.y
 
     def run(self):
         self._create_windows()
-        
-        model = XGBRegressor(**self.training_params)
-        model.fit(self.X_train, self.y_train)
-
-        y_pred = model.predict(self.X_train)
-        scores = {
-            "r2_score": float(r2_score(self.y_train, y_pred)),
-            "rmse": float(root_mean_squared_error(self.y_train, y_pred))
-        }
+        early_stopping = self.early_stopping_rounds is not None
+
+        params = dict(self.training_params)
+        if self.max_n_estimators is not None:
+            params["n_estimators"] = self.max_n_estimators
+
+        if early_stopping:
+            model = XGBRegressor(**params, early_stopping_rounds=self.early_stopping_rounds)
+            model.fit(self.X_train, self.y_train, eval_set=[(self.X_eval, self.y_eval)], verbose=False)
+            logging.info(f"Early stopping kept {model.best_iteration + 1} of {params.get('n_estimators', 100)} rounds.")
+        else:
+            model = XGBRegressor(**params)
+            model.fit(self.X_train, self.y_train)
+
+        scores = {}
+        if self.X_eval is not None:
+            # predict() stops at the best iteration when early stopping was used
+            y_pred = model.predict(self.X_eval)
+            scores["eval_r2_score"] = float(r2_score(self.y_eval, y_pred))
+            scores["eval_rmse"] = float(root_mean_squared_error(self.y_eval, y_pred))
+        if self.score_train:
+            y_pred = model.predict(self.X_train)
+            scores["r2_score"] = float(r2_score(self.y_train, y_pred))
+            scores["rmse"] = float(root_mean_squared_error(self.y_train, y_pred))
 
         metadata = {
             "model": "XGBoostRegressor",
-            "params_used": self.training_params,
+            "params_used": params,
             "n_samples": len(self.X_train)
         }
+        if early_stopping:
+            metadata["early_stopping_rounds"] = self.early_stopping_rounds
+            metadata["early_stopping_samples"] = len(self.X_eval)
+            metadata["best_iteration"] = int(model.best_iteration)
+            metadata["best_score"] = float(model.best_score)
 
         return model, scores, metadata
@@ -1,41 +1,61 @@
-import os
-import yaml
 import logging
 import datetime
 import numpy as np
 import pandas as pd
-import optuna
 
-from xgboost import XGBRegressor
-from sklearn.multioutput import MultiOutputRegressor
 from sklearn.model_selection import cross_val_score
+from edf_forecasting.components.eco2mix_xgboost_cv import XGBoostFoldCache, make_splitter, make_pruner
+from edf_forecasting.components.eco2mix_optuna_study import run_study, save_study_summary
+from edf_forecasting.components.eco2mix_train_gboost_day import build_day_model
 
 logging.basicConfig(level=logging.INFO)
 
+MAX_N_ESTIMATORS = 80
+
 class XGBoostTuner:
-    def __init__(self, n_trials=20, timeout=None, seed=42):
+    def __init__(self, n_trials=20, timeout=None, seed=42, cv=3, engine="dmatrix", cv_strategy="timeseries",
+                 cv_gap=0, pruning=True, n_startup_trials=5, n_warmup_steps=0,
+                 n_workers=1, threads_per_worker=None, multi_strategy="one_output_per_tree",
+                 study_dir="data/07_model_output/eco2mix/xgboost/day/optuna_study", study_name="xgb_tuning",
+                 warm_start=True, warm_start_from=None, prior_study=None):
         self.n_trials = n_trials
         self.timeout = timeout
         self.seed = seed
+        self.cv = cv
+        self.engine = engine
+        self.cv_strategy = cv_strategy
+        self.cv_gap = cv_gap
+        self.pruning = pruning
+        self.n_startup_trials = n_startup_trials
+        self.n_warmup_steps = n_warmup_steps
+        self.n_workers = n_workers
+        self.threads_per_worker = threads_per_worker
+        self.study_dir = study_dir
+        self.study_name = study_name
+        self.warm_start = warm_start
+        self.warm_start_from = warm_start_from
+        self.prior_study = prior_study
+        self.multi_strategy = multi_strategy
 
-    def run(self, X, y):
-        timestamp = datetime.datetime.now().strftime("tuning_%Y-%m-%d_%H-%M")
-        base_dir = f"data/07_model_output/eco2mix/xgboost/day/optuna_study/{timestamp}"
-        os.makedirs(base_dir, exist_ok=True)
+    def pruner(self):
+        return make_pruner(self.pruning, self.n_startup_trials, self.n_warmup_steps)
 
-        study_path = os.path.join(base_dir, "optuna_study.db")
-        params_path = os.path.join(base_dir, "best_params.yml")
-
-        study = optuna.create_study(
-            direction="minimize",
-            study_name="xgb_tuning",
-            storage=f"sqlite:///{study_path}",
-            load_if_exists=True
-        )
+    def objective(self, X, y, n_jobs=-1):
+        """Optuna objective over X and y, training with `n_jobs` XGBoost threads."""
+        if self.engine == "dmatrix":
+            # One multi-target QuantileDMatrix per fold, shared by every trial and every slot model
+            fold_cache = XGBoostFoldCache(X, y, cv=self.cv, cv_strategy=self.cv_strategy, gap=self.cv_gap)
+        elif self.engine == "sklearn":
+            # Reference path: same folds, but no pruning since cross_val_score runs them all at once
+            splitter = make_splitter(self.cv, self.cv_strategy, self.cv_gap)
+            # Folds run one after another once a worker has its own thread budget
+            cv_jobs = -1 if n_jobs == -1 else 1
+        else:
+            raise ValueError(f"Unknown engine: {self.engine}")
 
         def objective(trial):
             params = {
-                "n_estimators": trial.suggest_int("n_estimators", 50, 80),
+                "n_estimators": trial.suggest_int("n_estimators", 50, MAX_N_ESTIMATORS),
                 "max_depth": trial.suggest_int("max_depth", 3, 10),
                 "learning_rate": trial.suggest_float("learning_rate", 0.01, 0.3, log=True),
                 "subsample": trial.suggest_float("subsample", 0.5, 1.0),
@@ -45,30 +65,28 @@ class XGBoostTuner:
                 "reg_alpha": trial.suggest_float("reg_alpha", 1e-8, 10.0, log=True),
                 "reg_lambda": trial.suggest_float("reg_lambda", 1e-8, 10.0, log=True),
                 "min_child_weight": trial.suggest_int("min_child_weight", 1, 20),
-                "booster": trial.suggest_categorical("booster", ["gbtree", "dart"]),
-                "n_jobs": -1,
-                "random_state": self.seed
+                # Vector-leaf trees are not implemented for DART
+                "booster": (
+                    "gbtree" if self.multi_strategy == "multi_output_tree"
+                    else trial.suggest_categorical("booster", ["gbtree", "dart"])
+                ),
+                "n_jobs": n_jobs,
+                "random_state": self.seed,
+                "multi_strategy": self.multi_strategy
             }
-            model = MultiOutputRegressor(XGBRegressor(**params))
-            score = cross_val_score(model, X, y, cv=3, scoring='neg_root_mean_squared_error', n_jobs=-1)
-            return -score.mean()
+            if self.engine == "dmatrix":
+                scores = fold_cache.score(params, trial if self.pruning else None)
+                return float(np.mean(scores))
 
-        study.optimize(objective, n_trials=self.n_trials, timeout=self.timeout, show_progress_bar=True)
-
-        best_params = study.best_params
-        best_score = study.best_value
-
-        summary = {
-            "study_path": study_path,
-            "best_score_rmse": best_score,
-            "best_params": best_params,
-            "n_trials": self.n_trials,
-            "seed": self.seed,
-            "timestamp": timestamp
-        }
+            model = build_day_model(params)
+            score = cross_val_score(model, X, y, cv=splitter, scoring='neg_root_mean_squared_error', n_jobs=cv_jobs)
+            return -score.mean()
 
-        with open(params_path, "w") as f:
-            yaml.dump(summary, f)
+        return objective
 
-        logging.info(f"Tuning complete. Params saved to : {params_path}")
+    def run(self, X, y):
+        timestamp = datetime.datetime.now().strftime("tuning_%Y-%m-%d_%H-%M")
+        study, n_previous_trials = run_study(self, X, y)
+        best_params = {**study.best_params, "multi_strategy": self.multi_strategy}
+        save_study_summary(study, self, best_params, n_previous_trials, timestamp, multi_strategy=self.multi_strategy)
         return best_params, study
@@ -1,38 +1,89 @@
-import os
-import yaml
 import datetime
 import optuna
 import logging
+import numpy as np
 from xgboost import XGBRegressor
 from sklearn.model_selection import cross_val_score
+from edf_forecasting.components.eco2mix_xgboost_cv import XGBoostFoldCache, make_splitter, make_pruner
+from edf_forecasting.components.eco2mix_optuna_study import run_study, save_study_summary
 
 logging.basicConfig(level=logging.INFO)
 
+MAX_N_ESTIMATORS = 80
+# Low rungs are cheap, so multi-fidelity studies can afford to search far more rounds
+MULTI_FIDELITY_MAX_N_ESTIMATORS = 400
+
+# (share of the most recent windows, share of the boosting rounds) scored at each rung
+DEFAULT_RUNGS = [(0.25, 0.25), (0.5, 0.5), (1.0, 1.0)]
+
 class XGBoostTuner:
-    def __init__(self, n_trials=20, cv=3, timeout=None, seed=42, study_dir="optuna_studies"):
+    def __init__(self, n_trials=20, cv=3, timeout=None, seed=42,
+                 study_dir="data/07_model_output/eco2mix/xgboost/30min/optuna_study", engine="dmatrix",
+                 cv_strategy="timeseries", cv_gap=0, pruning=True, n_startup_trials=5, n_warmup_steps=0,
+                 n_workers=1, threads_per_worker=None, study_name="xgb_tuning", warm_start=True,
+                 warm_start_from=None, prior_study=None, fidelity="full", rungs=None, reduction_factor=2,
+                 max_n_estimators=None):
         self.n_trials = n_trials
         self.cv = cv
         self.timeout = timeout
         self.seed = seed
+        self.engine = engine
+        self.cv_strategy = cv_strategy
+        self.cv_gap = cv_gap
+        self.pruning = pruning
+        self.n_startup_trials = n_startup_trials
+        self.n_warmup_steps = n_warmup_steps
+        self.n_workers = n_workers
+        self.threads_per_worker = threads_per_worker
+        self.study_dir = study_dir
+        self.study_name = study_name
+        self.warm_start = warm_start
+        self.warm_start_from = warm_start_from
+        self.prior_study = prior_study
+        self.fidelity = fidelity
+        self.rungs = [tuple(rung) for rung in (rungs or DEFAULT_RUNGS)]
+        self.reduction_factor = reduction_factor
+        if max_n_estimators is None:
+            max_n_estimators = MULTI_FIDELITY_MAX_N_ESTIMATORS if fidelity == "multi" else MAX_N_ESTIMATORS
+        self.max_n_estimators = max_n_estimators
 
-    def run(self, X, y):
-        timestamp = datetime.datetime.now().strftime("tuning_%Y-%m-%d_%H-%M")
-        base_dir = f"data/07_model_output/eco2mix/xgboost/30min/optuna_study/{timestamp}"
-        os.makedirs(base_dir, exist_ok=True)
+    def pruner(self):
+        if self.fidelity == "multi":
+            # Resources are rung numbers: Hyperband promotes the top 1/reduction_factor of each rung
+            return optuna.pruners.HyperbandPruner(
+                min_resource=1, max_resource=len(self.rungs), reduction_factor=self.reduction_factor
+            )
+        return make_pruner(self.pruning, self.n_startup_trials, self.n_warmup_steps)
 
-        study_path = os.path.join(base_dir, "optuna_study.db")
-        params_path = os.path.join(base_dir, "best_params.yml")
-
-        study = optuna.create_study(
-            direction="minimize",
-            study_name="xgb_tuning",
-            storage=f"sqlite:///{study_path}",
-            load_if_exists=True
-        )
+    def objective(self, X, y, n_jobs=-1):
+        """Optuna objective over X and y, training with `n_jobs` XGBoost threads."""
+        if self.fidelity == "multi":
+            if self.engine != "dmatrix":
+                raise ValueError("Multi-fidelity tuning requires the dmatrix engine.")
+            # Windows are in time order: each rung keeps the most recent share of them
+            rung_caches = []
+            for data_fraction, rounds_fraction in self.rungs:
+                start = len(X) - int(len(X) * data_fraction)
+                rung_cache = XGBoostFoldCache(
+                    X[start:], y[start:], cv=self.cv, cv_strategy=self.cv_strategy, gap=self.cv_gap
+                )
+                rung_caches.append((rung_cache, rounds_fraction))
+        elif self.fidelity != "full":
+            raise ValueError(f"Unknown fidelity: {self.fidelity}")
+        elif self.engine == "dmatrix":
+            # Folds are quantized once here and shared by every trial
+            fold_cache = XGBoostFoldCache(X, y, cv=self.cv, cv_strategy=self.cv_strategy, gap=self.cv_gap)
+        elif self.engine == "sklearn":
+            # Reference path: same folds, but no pruning since cross_val_score runs them all at once
+            splitter = make_splitter(self.cv, self.cv_strategy, self.cv_gap)
+            # Folds run one after another once a worker has its own thread budget
+            cv_jobs = -1 if n_jobs == -1 else 1
+        else:
+            raise ValueError(f"Unknown engine: {self.engine}")
 
         def objective(trial):
             params = {
-                "n_estimators": trial.suggest_int("n_estimators", 50, 80),
+                "n_estimators": trial.suggest_int("n_estimators", 50, self.max_n_estimators),
                 "max_depth": trial.suggest_int("max_depth", 3, 10),
                 "learning_rate": trial.suggest_float("learning_rate", 0.01, 0.3, log=True),
                 "subsample": trial.suggest_float("subsample", 0.5, 1.0),
@@ -43,31 +94,36 @@ class XGBoostTuner:
                 "reg_lambda": trial.suggest_float("reg_lambda", 1e-8, 10.0, log=True),
                 "min_child_weight": trial.suggest_int("min_child_weight", 1, 20),
                 "booster": trial.suggest_categorical("booster", ["gbtree", "dart"]),
-                "n_jobs": -1,
+                "n_jobs": n_jobs,
                 "random_state": self.seed
             }
 
+            if self.fidelity == "multi":
+                for rung, (rung_cache, rounds_fraction) in enumerate(rung_caches, start=1):
+                    rung_params = dict(params, n_estimators=max(1, int(params["n_estimators"] * rounds_fraction)))
+                    score = float(np.mean(rung_cache.score(rung_params)))
+                    if rung < len(rung_caches):
+                        trial.report(score, step=rung)
+                        if trial.should_prune():
+                            raise optuna.TrialPruned(f"Stopped at rung {rung}.")
+                return score
+
+            if self.engine == "dmatrix":
+                scores = fold_cache.score(params, trial if self.pruning else None)
+                return float(np.mean(scores))
+
             model = XGBRegressor(**params)
-            scores = cross_val_score(model, X, y, cv=self.cv, scoring="neg_root_mean_squared_error", n_jobs=-1)
+            scores = cross_val_score(model, X, y, cv=splitter, scoring="neg_root_mean_squared_error", n_jobs=cv_jobs)
             return -scores.mean()
 
-        study.optimize(objective, n_trials=self.n_trials, timeout=self.timeout, show_progress_bar=True)
+        return objective
 
+    def run(self, X, y):
+        timestamp = datetime.datetime.now().strftime("tuning_%Y-%m-%d_%H-%M")
+        study, n_previous_trials = run_study(self, X, y)
         best_params = study.best_params
-        best_score = study.best_value
-
-        summary = {
-            "study_path": study_path,
-            "best_score_rmse": best_score,
-            "best_params": best_params,
-            "n_trials": self.n_trials,
-            "cv": self.cv,
-            "seed": self.seed,
-            "timestamp": timestamp
-        }
-
-        with open(params_path, "w") as f:
-            yaml.dump(summary, f)
-
-        logging.info(f"Tuning complete. Params saved to : {params_path}")
-        return best_params, study
\ No newline at end of file
+        save_study_summary(
+            study, self, best_params, n_previous_trials, timestamp,
+            fidelity=self.fidelity, max_n_estimators=self.max_n_estimators
+        )
+        return best_params, study
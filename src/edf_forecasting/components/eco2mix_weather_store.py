@@ -0,0 +1,109 @@
+import pandas as pd
+import requests
+import logging
+from pathlib import Path
+
+logging.basicConfig(level=logging.INFO)
+
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+
+# Open-Meteo applies one UTC offset to a whole response, so every day has the same count
+VALUES_PER_DAY = {"daily": 1, "hourly": 24}
+
+class OpenMeteoWeatherStore:
+    """On-disk cache of Open-Meteo archive data, keyed by location, variable and date.
+
+    Each location and frequency ("daily" or "hourly") is one Parquet file in long format
+    (time, variable, value). Requests only fetch the date ranges missing from the cache,
+    with every missing variable in the same call, so once the cache covers a period the
+    features are built fully offline. `base_url` can point to a local stand-in server.
+    """
+
+    def __init__(self, cache_dir="data/01_raw/open_meteo", base_url=ARCHIVE_URL, timezone="Europe/Paris",
+                 timeout=60):
+        self.cache_dir = Path(cache_dir)
+        self.base_url = base_url
+        self.timezone = timezone
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def get(self, frequency, variables, start_date, end_date, latitude=48.85, longitude=2.35):
+        """Wide frame with a `time` column and one column per variable, fetching only what is missing."""
+        self.prefetch(frequency, variables, start_date, end_date, latitude, longitude)
+
+        cache = self._load(frequency, latitude, longitude)
+        start, end = pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize()
+        cache = cache[cache["variable"].isin(variables) & cache["time"].between(start, end + pd.Timedelta(days=1), inclusive="left")]
+
+        wide = cache.pivot(index="time", columns="variable", values="value")
+        wide = wide.reindex(columns=list(variables))
+        wide.columns.name = None
+        return wide.reset_index().rename(columns={"index": "time"})
+
+    def prefetch(self, frequency, variables, start_date, end_date, latitude=48.85, longitude=2.35):
+        """Fill the cache for `variables` between both dates, one request per contiguous gap."""
+        cache = self._load(frequency, latitude, longitude)
+        days = pd.date_range(pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize(), freq="D")
+
+        # A day is covered once every one of its values is cached, so partly published days are fetched again
+        missing = pd.DataFrame(False, index=days, columns=list(variables))
+        for variable in variables:
+            counts = cache.loc[cache["variable"] == variable, "time"].dt.normalize().value_counts()
+            missing[variable] = counts.reindex(days, fill_value=0).to_numpy() < VALUES_PER_DAY[frequency]
+
+        missing_days = missing.any(axis=1)
+        if not missing_days.any():
+            return
+
+        # Contiguous runs of missing days, each fetched with all the variables it lacks
+        run_ids = (missing_days != missing_days.shift()).cumsum()[missing_days]
+        fetched = []
+        for _, run_days in run_ids.groupby(run_ids):
+            run_vars = [v for v in variables if missing.loc[run_days.index, v].any()]
+            fetched.append(self._fetch(
+                frequency, run_vars, run_days.index[0], run_days.index[-1], latitude, longitude
+            ))
+
+        cache = pd.concat([cache] + fetched, ignore_index=True)
+        cache = cache.drop_duplicates(subset=["time", "variable"], keep="last").sort_values(["variable", "time"])
+        self._save(cache, frequency, latitude, longitude)
+
+    def _fetch(self, frequency, variables, start, end, latitude, longitude):
+        params = {
+            "latitude": latitude, "longitude": longitude,
+            "start_date": start.strftime("%Y-%m-%d"), "end_date": end.strftime("%Y-%m-%d"),
+            frequency: ",".join(variables),
+            "timezone": self.timezone
+        }
+        try:
+            response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logging.error(f"[API Error - Weather] {e}")
+            raise
+
+        data = pd.DataFrame(response.json()[frequency])
+        data["time"] = pd.to_datetime(data["time"])
+        logging.info(f"Fetched {frequency} {', '.join(variables)} from {params['start_date']} to {params['end_date']}.")
+
+        # Values not published yet come back null: leave them out so a later run fills them
+        long = data.melt(id_vars="time", var_name="variable", value_name="value")
+        return long.dropna(subset=["value"])
+
+    def _path(self, frequency, latitude, longitude):
+        return self.cache_dir / f"lat{latitude:.4f}_lon{longitude:.4f}_{frequency}.parquet"
+
+    def _load(self, frequency, latitude, longitude):
+        path = self._path(frequency, latitude, longitude)
+        if not path.exists():
+            return pd.DataFrame({
+                "time": pd.Series(dtype="datetime64[ns]"),
+                "variable": pd.Series(dtype=object),
+                "value": pd.Series(dtype=float)
+            })
+        return pd.read_parquet(path)
+
+    def _save(self, cache, frequency, latitude, longitude):
+        path = self._path(frequency, latitude, longitude)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        cache.to_parquet(path, index=False)
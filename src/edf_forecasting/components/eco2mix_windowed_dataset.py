@@ -0,0 +1,78 @@
+import numpy as np
+from pathlib import Path
+
+class Eco2mixWindowedDataset:
+    """Lag windows of a 30-min series, exposed as read-only views over one contiguous array.
+
+    `X[i]` holds the `window_size` values preceding `y[i]`. Neither is materialized:
+    both are strided views of `values`, which can live in memory or in a
+    memory-mapped ``.npy`` file for long histories.
+    """
+
+    def __init__(self, values, window_size):
+        values = np.ascontiguousarray(values).view()
+        values.flags.writeable = False
+
+        if len(values) <= window_size:
+            raise ValueError("Insufficient data to create at least one window.")
+
+        self.values = values
+        self.window_size = window_size
+
+    @classmethod
+    def from_frame(cls, df, target_col, window_size, name="", mmap_path=None):
+        """Build from `df[target_col]`, optionally backed by a memory-mapped copy at `mmap_path`.
+
+        An existing file at `mmap_path` is reused when it already holds these values.
+        """
+        if target_col not in df.columns:
+            where = f"{name} dataframe" if name else "dataframe"
+            raise ValueError(f"Target column '{target_col}' not found in {where}.")
+
+        values = df[target_col].to_numpy()
+        if mmap_path is not None:
+            path = Path(mmap_path)
+            if not cls._holds(path, values):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                np.save(path, values)
+            return cls.from_memmap(path, window_size)
+        return cls(values, window_size)
+
+    @classmethod
+    def from_memmap(cls, path, window_size):
+        return cls(np.load(path, mmap_mode="r"), window_size)
+
+    @staticmethod
+    def _holds(path, values, chunk_size=1 << 20):
+        """Whether the ``.npy`` file at `path` has the shape, dtype and content of `values`."""
+        if not path.exists():
+            return False
+        try:
+            existing = np.load(path, mmap_mode="r")
+        except ValueError:
+            return False
+        if existing.shape != values.shape or existing.dtype != values.dtype:
+            return False
+        # Compared chunk by chunk, so only one chunk of the file is paged in at a time
+        equal_nan = values.dtype.kind in "fc"
+        return all(
+            np.array_equal(existing[start:start + chunk_size], values[start:start + chunk_size], equal_nan=equal_nan)
+            for start in range(0, len(values), chunk_size)
+        )
+
+    @property
+    def X(self):
+        return np.lib.stride_tricks.sliding_window_view(self.values, window_shape=self.window_size)[:-1]
+
+    @property
+    def y(self):
+        return self.values[self.window_size:]
+
+    def __len__(self):
+        return len(self.values) - self.window_size
+
+    def chunks(self, chunk_size):
+        """Yield `(start, X, y)` views of at most `chunk_size` consecutive windows."""
+        X, y = self.X, self.y
+        for start in range(0, len(self), chunk_size):
+            yield start, X[start:start + chunk_size], y[start:start + chunk_size]
@@ -0,0 +1,147 @@
+import numpy as np
+import optuna
+import xgboost as xgb
+from sklearn.model_selection import KFold, TimeSeriesSplit
+
+# sklearn wrapper names that the native booster spells differently
+SKLEARN_TO_NATIVE = {"n_jobs": "nthread", "random_state": "seed"}
+# Pruning steps reserved per booster of a fold, above any number of boosting rounds searched
+ROUND_STEPS = 100_000
+
+def to_native_params(params):
+    """Split XGBRegressor-style params into native booster params and a number of boosting rounds."""
+    params = dict(params)
+    num_boost_round = params.pop("n_estimators", 100)
+    native = {SKLEARN_TO_NATIVE.get(key, key): value for key, value in params.items()}
+    if native.get("nthread") is not None and native["nthread"] < 0:
+        native.pop("nthread")
+    native.setdefault("objective", "reg:squarederror")
+    native.setdefault("tree_method", "hist")
+    return native, num_boost_round
+
+def rmse(y_true, y_pred):
+    """RMSE averaged over outputs, like sklearn's neg_root_mean_squared_error scorer."""
+    errors = np.sqrt(np.mean((np.asarray(y_true) - y_pred) ** 2, axis=0))
+    return float(np.mean(errors))
+
+def make_splitter(cv, strategy="timeseries", gap=0):
+    """Splitter for an int `cv`: expanding-window folds in time order, or plain unshuffled KFold."""
+    if not isinstance(cv, int):
+        return cv
+    if strategy == "timeseries":
+        return TimeSeriesSplit(n_splits=cv, gap=gap)
+    elif strategy == "kfold":
+        return KFold(n_splits=cv)
+    else:
+        raise ValueError(f"Unknown cv_strategy: {strategy}")
+
+def make_pruner(pruning=True, n_startup_trials=5, n_warmup_steps=0):
+    """Median pruner over boosting rounds, or a no-op one when pruning is disabled.
+
+    Steps are the rounds of `XGBoostFoldCache.score`, so `n_warmup_steps` is the number
+    of rounds of the first fold a trial always completes.
+    """
+    if not pruning:
+        return optuna.pruners.NopPruner()
+    return optuna.pruners.MedianPruner(n_startup_trials=n_startup_trials, n_warmup_steps=n_warmup_steps)
+
+class PruningCallback(xgb.callback.TrainingCallback):
+    """Report the validation RMSE of every boosting round to an Optuna trial and stop it once pruned.
+
+    The RMSE is the `rmse` trials are scored on, computed from the booster's predictions
+    on `dvalid`, which XGBoost keeps cached between rounds.
+    """
+
+    def __init__(self, trial, dvalid, y_valid, step_offset=0):
+        self.trial = trial
+        self.dvalid = dvalid
+        self.y_valid = y_valid
+        self.step_offset = step_offset
+
+    def after_iteration(self, model, epoch, evals_log):
+        y_pred = model.predict(self.dvalid)
+        self.trial.report(rmse(self.y_valid, y_pred.reshape(self.y_valid.shape)), step=self.step_offset + epoch)
+        if self.trial.should_prune():
+            raise optuna.TrialPruned(f"Pruned at step {self.step_offset + epoch}.")
+        return False
+
+class XGBoostFoldCache:
+    """Cross-validation folds quantized once into DMatrix pairs and reused by every trial.
+
+    Each training fold becomes a QuantileDMatrix, and its validation fold shares the
+    same bin boundaries through `ref`. A trial then only pays for boosting, not for
+    slicing, copying and re-quantizing the folds.
+
+    Folds default to expanding windows in time order (`cv_strategy="timeseries"`), so
+    no fold trains on data that comes after its validation period.
+
+    With ``multi_strategy="separate"`` in the params, a multi-target `y` is scored like a
+    `MultiOutputRegressor`: one booster per target column, all trained on the same
+    quantized fold with its label swapped.
+    """
+
+    def __init__(self, X, y, cv=5, max_bin=256, cv_strategy="timeseries", gap=0):
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y, dtype=np.float32)
+        splitter = make_splitter(cv, cv_strategy, gap)
+
+        self.max_bin = max_bin
+        self.folds = []
+        for train_idx, valid_idx in splitter.split(X):
+            dtrain = xgb.QuantileDMatrix(X[train_idx], y[train_idx], max_bin=max_bin)
+            dvalid = xgb.QuantileDMatrix(X[valid_idx], y[valid_idx], ref=dtrain)
+            self.folds.append((dtrain, dvalid, y[train_idx], y[valid_idx]))
+
+    def score(self, params, trial=None):
+        """Validation RMSE of each fold for XGBRegressor-style `params`.
+
+        With a `trial`, the validation RMSE of every boosting round is reported, and
+        `optuna.TrialPruned` is raised as soon as its pruner asks to stop. Booster `j` of
+        fold `k` (`j = 0` unless one booster is trained per column) reports round `r` at
+        step `(k * n_boosters + j) * ROUND_STEPS + r`, so a step always means the same
+        fold, column and round, whatever the number of rounds a trial draws. DART
+        re-predicts every tree on each round, so its boosters only report their last round.
+        """
+        native, num_boost_round = to_native_params(params)
+        native["max_bin"] = self.max_bin
+        separate = native.get("multi_strategy") == "separate"
+        if separate:
+            native.pop("multi_strategy")
+
+        scores = []
+        for fold, (dtrain, dvalid, y_train, y_valid) in enumerate(self.folds):
+            if separate:
+                # One booster per column, all trained on the same quantized fold with its label swapped
+                targets = list(zip(y_train.reshape(len(y_train), -1).T, y_valid.reshape(len(y_valid), -1).T))
+            else:
+                targets = [(None, y_valid)]
+            predictions = []
+            try:
+                for j, (label, target) in enumerate(targets):
+                    if label is not None:
+                        dtrain.set_label(label)
+                    step_offset = (fold * len(targets) + j) * ROUND_STEPS
+                    predictions.append(
+                        self._train_predict(native, num_boost_round, dtrain, dvalid, target, trial, step_offset)
+                    )
+            finally:
+                dtrain.set_label(y_train)
+            y_pred = np.column_stack(predictions) if separate else predictions[0]
+            scores.append(rmse(y_valid, y_pred.reshape(y_valid.shape)))
+        return scores
+
+    @staticmethod
+    def _train_predict(native, num_boost_round, dtrain, dvalid, y_valid, trial=None, step_offset=0):
+        """Validation predictions of one booster, whose rounds are reported to `trial` from `step_offset` on."""
+        if trial is None:
+            return xgb.train(native, dtrain, num_boost_round=num_boost_round).predict(dvalid)
+        if native.get("booster") != "dart":
+            callbacks = [PruningCallback(trial, dvalid, y_valid, step_offset)]
+            return xgb.train(native, dtrain, num_boost_round=num_boost_round, callbacks=callbacks).predict(dvalid)
+
+        y_pred = xgb.train(native, dtrain, num_boost_round=num_boost_round).predict(dvalid)
+        step = step_offset + num_boost_round - 1
+        trial.report(rmse(y_valid, y_pred.reshape(y_valid.shape)), step=step)
+        if trial.should_prune():
+            raise optuna.TrialPruned(f"Pruned at step {step}.")
+        return y_pred
@@ -0,0 +1,108 @@
+from kedro.io import AbstractDataset
+from typing import Any, Dict, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import shutil
+from pathlib import Path
+
+class PartitionedParquetDataset(AbstractDataset):
+    """Parquet dataset partitioned by year (``<filepath>/year=YYYY/part-0.parquet``).
+
+    The year is derived from ``datetime_col``, or from the index when ``datetime_col``
+    is None. On load, ``years`` prunes whole partitions, ``load_args["columns"]``
+    projects columns and ``load_args["filters"]`` (pyarrow DNF filters) is pushed
+    down to the row group statistics.
+
+    Saving replaces the whole dataset by default. With ``save_args["mode"] = "update"``
+    only the partitions present in the saved frame are replaced.
+    """
+
+    PARTITION_COL = "year"
+
+    def __init__(
+        self,
+        filepath: str,
+        datetime_col: Optional[str] = None,
+        years: Optional[list] = None,
+        load_args: Optional[Dict[str, Any]] = None,
+        save_args: Optional[Dict[str, Any]] = None,
+    ):
+        self._filepath = Path(filepath)
+        self._datetime_col = datetime_col
+        self._years = years
+        self._load_args = dict(load_args or {})
+        self._save_args = dict(save_args or {})
+
+    def _load(self) -> pd.DataFrame:
+        dataset = ds.dataset(self._filepath, format="parquet", partitioning="hive")
+
+        expression = None
+        if self._years is not None:
+            expression = ds.field(self.PARTITION_COL).isin([int(y) for y in self._years])
+        filters = self._load_args.get("filters")
+        if filters:
+            filter_expression = pq.filters_to_expression(filters)
+            expression = filter_expression if expression is None else expression & filter_expression
+
+        columns = self._load_args.get("columns")
+        if columns is not None:
+            columns = list(columns) + [c for c in self._index_columns(dataset.schema) if c not in columns]
+
+        table = dataset.to_table(columns=columns, filter=expression)
+        if self.PARTITION_COL in table.column_names:
+            table = table.drop_columns([self.PARTITION_COL])
+        df = table.to_pandas()
+
+        # Partitions are not guaranteed to come back in chronological order
+        if self._datetime_col is None:
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()
+        elif not df[self._datetime_col].is_monotonic_increasing:
+            df = df.sort_values(self._datetime_col).reset_index(drop=True)
+        return df
+
+    def _save(self, df: pd.DataFrame) -> None:
+        save_args = dict(self._save_args)
+        mode = save_args.pop("mode", "overwrite")
+        if mode not in ("overwrite", "update"):
+            raise ValueError(f"Unknown save mode: {mode}")
+
+        if mode == "overwrite" and self._filepath.exists():
+            shutil.rmtree(self._filepath)
+        self._filepath.mkdir(parents=True, exist_ok=True)
+
+        if self._datetime_col is None:
+            years = pd.DatetimeIndex(df.index).year
+        else:
+            years = pd.to_datetime(df[self._datetime_col]).dt.year
+        table = pa.Table.from_pandas(df, preserve_index=self._datetime_col is None)
+        table = table.append_column(self.PARTITION_COL, pa.array(years, type=pa.int32()))
+
+        pq.write_to_dataset(
+            table,
+            root_path=str(self._filepath),
+            partition_cols=[self.PARTITION_COL],
+            existing_data_behavior="delete_matching",
+            basename_template="part-{i}.parquet",
+            **save_args,
+        )
+
+    def _exists(self) -> bool:
+        return self._filepath.is_dir() and any(self._filepath.glob(f"{self.PARTITION_COL}=*"))
+
+    def _describe(self) -> Dict[str, Any]:
+        return {
+            "filepath": str(self._filepath),
+            "datetime_col": self._datetime_col,
+            "years": self._years,
+            "load_args": self._load_args,
+            "save_args": self._save_args,
+        }
+
+    @staticmethod
+    def _index_columns(schema: pa.Schema) -> list:
+        """Index columns recorded in the pandas metadata, needed to rebuild the index."""
+        metadata = schema.pandas_metadata or {}
+        return [c for c in metadata.get("index_columns", []) if isinstance(c, str)]
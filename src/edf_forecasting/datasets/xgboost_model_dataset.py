@@ -0,0 +1,114 @@
+from kedro.io import AbstractVersionedDataset
+from typing import Any, Dict, Optional
+import json
+import pickle
+import shutil
+import numpy as np
+import xgboost as xgb
+from pathlib import Path
+
+MANIFEST_FILE = "manifest.json"
+
+class XGBoostModelBundle:
+    """XGBoost boosters in native binary format, with metadata such as conformal quantiles.
+
+    A bundle is a directory holding ``manifest.json`` and one ``booster_<i>.ubj`` per
+    booster: one for an `XGBRegressor` (including native multi-output ones), one per
+    slot for a `MultiOutputRegressor`. Loading only reads the manifest; boosters are
+    read on first use. `predict` goes straight to `Booster.inplace_predict`, without
+    the sklearn wrapper or a DMatrix.
+    """
+
+    def __init__(self, boosters=None, metadata=None, path=None):
+        self._boosters = boosters
+        self.metadata = dict(metadata or {})
+        self.path = Path(path) if path is not None else None
+
+    @classmethod
+    def from_model(cls, model, **metadata):
+        """Bundle a fitted `XGBRegressor`, `MultiOutputRegressor` of them, or another bundle."""
+        if isinstance(model, cls):
+            return cls(model.boosters, {**model.metadata, **metadata})
+        estimators = getattr(model, "estimators_", [model])
+        boosters = [cls._trained_booster(estimator) for estimator in estimators]
+        n_features = getattr(model, "n_features_in_", None)
+        if n_features is not None:
+            metadata.setdefault("n_features_in", int(n_features))
+        return cls(boosters, metadata)
+
+    @staticmethod
+    def _trained_booster(estimator):
+        booster = estimator.get_booster()
+        # Keep the trees the wrapper would predict with after early stopping
+        if getattr(estimator, "early_stopping_rounds", None) is not None and hasattr(estimator, "best_iteration"):
+            booster = booster[:estimator.best_iteration + 1]
+        return booster
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        manifest = json.loads((path / MANIFEST_FILE).read_text())
+        return cls(metadata=manifest["metadata"], path=path)
+
+    def save(self, path):
+        path = Path(path)
+        if path.exists():
+            shutil.rmtree(path)
+        path.mkdir(parents=True)
+        for i, booster in enumerate(self.boosters):
+            booster.save_model(str(path / f"booster_{i}.ubj"))
+        manifest = {"n_boosters": len(self.boosters), "xgboost_version": xgb.__version__, "metadata": self.metadata}
+        (path / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2, default=str))
+
+    @property
+    def boosters(self):
+        if self._boosters is None:
+            files = sorted(self.path.glob("booster_*.ubj"), key=lambda f: int(f.stem.split("_")[1]))
+            self._boosters = [xgb.Booster(model_file=str(f)) for f in files]
+        return self._boosters
+
+    @property
+    def n_features_in_(self):
+        return self.metadata.get("n_features_in")
+
+    def predict(self, X):
+        X = np.asarray(X)
+        outputs = [booster.inplace_predict(X) for booster in self.boosters]
+        if len(outputs) == 1:
+            return outputs[0]
+        return np.column_stack(outputs)
+
+class XGBoostModelDataset(AbstractVersionedDataset):
+    """Kedro dataset storing models as `XGBoostModelBundle` directories.
+
+    Saving accepts anything `XGBoostModelBundle.from_model` does. Loading returns a
+    lazily loaded bundle, or unpickles the model when the path holds a file, so
+    models saved by ``pickle.PickleDataset`` stay readable.
+    """
+
+    def __init__(self, filepath: str, version: Optional[str] = None):
+        super().__init__(filepath, version)
+        self._filepath = Path(filepath)
+
+    def _load(self) -> Any:
+        load_path = Path(self._get_load_path())
+        if load_path.is_dir():
+            return XGBoostModelBundle.load(load_path)
+        with open(load_path, "rb") as f:
+            return pickle.load(f)
+
+    def _save(self, model: Any) -> None:
+        XGBoostModelBundle.from_model(model).save(self._get_save_path())
+
+    def _exists(self) -> bool:
+        try:
+            load_path = self._get_load_path()
+        except Exception:
+            return False
+        return Path(load_path).exists()
+
+    def _describe(self) -> Dict[str, Any]:
+        return {
+            "filepath": str(self._filepath),
+            "version": str(self._version) if self._version else None,
+        }
@@ -0,0 +1,320 @@
+"""Project hooks."""
+import os
+import sys
+import json
+import time
+import html
+import pickle
+import hashlib
+import inspect
+import logging
+import datetime
+import functools
+import threading
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from kedro.framework.hooks import hook_impl
+
+logger = logging.getLogger(__name__)
+
+PACKAGE = __name__.split(".")[0]
+
+# add_features is left out: it reads the weather store, which its inputs do not fingerprint
+CACHED_NODES = ("aggregate_data", "add_tempo", "preprocess_data")
+
+def value_digest(value, digest):
+    """Feed a node input into `digest`: frames and arrays by content, anything else as JSON or pickle."""
+    if isinstance(value, pd.DataFrame):
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        digest.update(json.dumps([list(map(str, value.columns)), list(map(str, value.dtypes))]).encode())
+    elif isinstance(value, pd.Series):
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(str((value.dtype, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        try:
+            digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+        except TypeError:
+            digest.update(pickle.dumps(value))
+
+def _project_module(value):
+    """Name of the project module `value` is or was defined in, else None."""
+    module = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+    if isinstance(module, str) and module.split(".")[0] == PACKAGE and module in sys.modules:
+        return module
+    return None
+
+def _code_names(code):
+    """Global names used by `code` and the functions, lambdas and comprehensions nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+def source_digest(func, digest):
+    """Feed the source of `func` and of the project modules it depends on into `digest`.
+
+    A node function usually delegates to a component class, which may itself rely on
+    other project modules: starting from the project objects named in its body, every
+    project module they import is followed, transitively, and hashed.
+    """
+    digest.update(inspect.getsource(func).encode())
+    pending = [_project_module(func.__globals__.get(name)) for name in _code_names(func.__code__)]
+    modules = set()
+    while pending:
+        module = pending.pop()
+        if module is None or module in modules:
+            continue
+        modules.add(module)
+        pending.extend(_project_module(value) for value in vars(sys.modules[module]).values())
+    for module in sorted(modules):
+        digest.update(inspect.getsource(sys.modules[module]).encode())
+
+class NodeCacheHook:
+    """Skip nodes whose inputs, parameters and source are unchanged since their last run.
+
+    Before the pipeline runs, each node named in `nodes` gets its function wrapped.
+    The wrapper fingerprints the loaded inputs (parameters included) and the node's
+    source. On a match it returns the outputs stored under `cache_dir` by the
+    previous run instead of calling the function. Only the latest fingerprint of a
+    node is kept.
+
+    Set the environment variable ``EDF_NODE_CACHE=0`` to run every node.
+    """
+
+    def __init__(self, cache_dir="data/08_cache/nodes", nodes=CACHED_NODES):
+        self.cache_dir = Path(cache_dir)
+        self.nodes = set(nodes)
+
+    @hook_impl
+    def before_pipeline_run(self, run_params, pipeline, catalog):
+        if os.environ.get("EDF_NODE_CACHE", "1") == "0":
+            return
+        for node in pipeline.nodes:
+            if node.name in self.nodes and not getattr(node.func, "_node_cache", False):
+                node.func = self._wrap(node.name, node.func)
+
+    def _wrap(self, name, func):
+        node_dir = self.cache_dir / name
+
+        @functools.wraps(func)
+        def cached(*args, **kwargs):
+            digest = hashlib.sha256()
+            source_digest(func, digest)
+            for value in list(args) + [kwargs[key] for key in sorted(kwargs)]:
+                value_digest(value, digest)
+            cache_path = node_dir / f"{digest.hexdigest()[:16]}.pkl"
+
+            if cache_path.exists():
+                logger.info(f"Node '{name}' unchanged, restoring its outputs from {cache_path}.")
+                with open(cache_path, "rb") as f:
+                    return pickle.load(f)
+
+            outputs = func(*args, **kwargs)
+            node_dir.mkdir(parents=True, exist_ok=True)
+            for stale in node_dir.glob("*.pkl"):
+                stale.unlink()
+            with open(cache_path, "wb") as f:
+                pickle.dump(outputs, f, protocol=pickle.HIGHEST_PROTOCOL)
+            return outputs
+
+        cached._node_cache = True
+        return cached
+
+def dataset_size(value):
+    """Size of a dataset in bytes, None when it cannot be measured.
+
+    Frames count the contents of object columns and arrays their buffer. Anything
+    else (models, dicts...) is measured by its pickled length, since `sys.getsizeof`
+    only sees the outer object.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, np.ndarray):
+        return array_size(value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return None
+
+def array_size(array):
+    """Bytes held by `array`, capped by the buffer of the array owning its memory.
+
+    `nbytes` counts every element of a view, so strided views such as the windows of
+    `sliding_window_view` would be counted once per overlapping window. `.base` is
+    followed (through non-array holders like `as_strided`'s) to the owning array.
+    """
+    owner, base = array, array.base
+    while base is not None:
+        if isinstance(base, np.ndarray):
+            owner = base
+        base = getattr(base, "base", None)
+    return int(min(array.nbytes, owner.nbytes))
+
+def dataset_sizes(datasets):
+    """Sizes of the measurable datasets of `datasets`, by name."""
+    sizes = {name: dataset_size(value) for name, value in datasets.items()}
+    return {name: size for name, size in sizes.items() if size is not None}
+
+def current_rss():
+    """Resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        # No /proc (macOS): fall back to the lifetime peak, reported in bytes there
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+class RssSampler(threading.Thread):
+    """Track the peak RSS of the process between `start` and `stop`."""
+
+    def __init__(self, interval=0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+        self.peak = max(self.peak, current_rss())
+        return self.peak
+
+class NodePerformanceHook:
+    """Record wall time, CPU time, peak RSS and dataset sizes of every node.
+
+    Metrics are logged to the active MLflow run as ``perf.<node>.<metric>``, and the
+    whole run is written to ``<report_dir>/<timestamp>.json`` and ``.html`` (also
+    logged as MLflow artifacts). CPU time is the process's, so it includes XGBoost
+    threads but not worker processes; peak RSS is sampled every `interval` seconds.
+    """
+
+    def __init__(self, report_dir="data/08_reporting/performance", interval=0.05):
+        self.report_dir = Path(report_dir)
+        self.interval = interval
+        self._running = {}
+        self._records = []
+        self._lock = threading.Lock()
+
+    @hook_impl
+    def before_pipeline_run(self, run_params, pipeline, catalog):
+        self._records = []
+        self._started = datetime.datetime.now()
+
+    @hook_impl
+    def before_node_run(self, node, inputs):
+        # Measured before the clocks start, so sizing the inputs is not billed to the node
+        input_sizes = dataset_sizes(inputs)
+        sampler = RssSampler(self.interval)
+        sampler.start()
+        with self._lock:
+            self._running[node.name] = {
+                "sampler": sampler,
+                "inputs": input_sizes,
+                "rss_start": current_rss(),
+                "wall_start": time.perf_counter(),
+                "cpu_start": time.process_time()
+            }
+
+    @hook_impl
+    def after_node_run(self, node, inputs, outputs):
+        with self._lock:
+            state = self._running.pop(node.name, None)
+        if state is None:
+            return
+        wall = time.perf_counter() - state["wall_start"]
+        cpu = time.process_time() - state["cpu_start"]
+        peak = state["sampler"].stop()
+        output_sizes = dataset_sizes(outputs or {})
+
+        record = {
+            "node": node.name,
+            "wall_time_s": wall,
+            "cpu_time_s": cpu,
+            "peak_rss_mb": peak / 2**20,
+            "rss_increase_mb": (peak - state["rss_start"]) / 2**20,
+            "input_mb": sum(state["inputs"].values()) / 2**20,
+            "output_mb": sum(output_sizes.values()) / 2**20,
+            "datasets_mb": {name: size / 2**20 for name, size in {**state["inputs"], **output_sizes}.items()}
+        }
+        with self._lock:
+            self._records.append(record)
+        logger.info(f"Node '{node.name}': {wall:.2f}s wall, {cpu:.2f}s CPU, {record['peak_rss_mb']:.0f} MB peak RSS.")
+        self._log_mlflow_metrics(record)
+
+    @hook_impl
+    def on_node_error(self, error, node):
+        with self._lock:
+            state = self._running.pop(node.name, None)
+        if state is not None:
+            state["sampler"].stop()
+
+    # Before kedro-mlflow's own after_pipeline_run, which ends the MLflow run
+    @hook_impl(tryfirst=True)
+    def after_pipeline_run(self, run_params, run_result, pipeline, catalog):
+        if not self._records:
+            return
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        stem = self._started.strftime("%Y-%m-%d_%H-%M-%S")
+        report = {
+            "started": self._started.isoformat(),
+            "pipeline": run_params.get("pipeline_name") or "__default__",
+            "nodes": self._records
+        }
+        json_path = self.report_dir / f"{stem}.json"
+        html_path = self.report_dir / f"{stem}.html"
+        json_path.write_text(json.dumps(report, indent=2))
+        html_path.write_text(self._html(report))
+        logger.info(f"Performance report written to {json_path}.")
+
+        mlflow = self._mlflow()
+        if mlflow is not None:
+            mlflow.log_artifact(str(json_path), artifact_path="performance")
+            mlflow.log_artifact(str(html_path), artifact_path="performance")
+
+    @staticmethod
+    def _mlflow():
+        """The mlflow module when a run is active, else None."""
+        try:
+            import mlflow
+        except ImportError:
+            return None
+        return mlflow if mlflow.active_run() is not None else None
+
+    def _log_mlflow_metrics(self, record):
+        mlflow = self._mlflow()
+        if mlflow is None:
+            return
+        metrics = ("wall_time_s", "cpu_time_s", "peak_rss_mb", "rss_increase_mb", "input_mb", "output_mb")
+        mlflow.log_metrics({f"perf.{record['node']}.{metric}": record[metric] for metric in metrics})
+
+    @staticmethod
+    def _html(report):
+        columns = ("wall_time_s", "cpu_time_s", "peak_rss_mb", "rss_increase_mb", "input_mb", "output_mb")
+        total = sum(record["wall_time_s"] for record in report["nodes"]) or 1.0
+        rows = []
+        for record in sorted(report["nodes"], key=lambda r: r["wall_time_s"], reverse=True):
+            share = 100 * record["wall_time_s"] / total
+            cells = "".join(f"<td>{record[column]:.2f}</td>" for column in columns)
+            rows.append(
+                f"<tr><td>{html.escape(record['node'])}</td>{cells}"
+                f"<td><div style='background:#4a90d9;height:10px;width:{share:.1f}%'></div></td></tr>"
+            )
+        header = "".join(f"<th>{column}</th>" for column in ("node",) + columns + ("share of wall time",))
+        return (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            f"<title>Performance - {html.escape(report['pipeline'])}</title>"
+            "<style>body{font-family:sans-serif}table{border-collapse:collapse}"
+            "td,th{border:1px solid #ccc;padding:4px 8px;text-align:right}td:first-child{text-align:left}"
+            "td:last-child{width:200px}</style></head><body>"
+            f"<h1>{html.escape(report['pipeline'])} - {html.escape(report['started'])}</h1>"
+            f"<table><tr>{header}</tr>{''.join(rows)}</table></body></html>"
+        )
@@ -0,0 +1,23 @@
+"""
+This is a boilerplate pipeline 'backtest_xgboost_30min'
+generated using Kedro 0.19.12
+"""
+from edf_forecasting.components.eco2mix_backtest_xgboost_30min import XGBBacktest30min, rolling_origins
+
+def backtest(df_data, training_params, params):
+    origins = rolling_origins(
+        df_data.index.year.unique(),
+        n_origins=params["n_origins"],
+        window=params.get("window", "expanding"),
+        train_years=params.get("train_years"),
+        min_train_years=params.get("min_train_years", 1)
+    )
+    backtester = XGBBacktest30min(
+        training_params=training_params,
+        params=params,
+        cache_dir=params["cache_dir"],
+        n_workers=params.get("n_workers", 1),
+        threads_per_worker=params.get("threads_per_worker")
+    )
+    df_scores = backtester.run(df_data, origins)
+    return df_scores, backtester.summarize(df_scores)
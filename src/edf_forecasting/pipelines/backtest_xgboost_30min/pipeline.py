@@ -0,0 +1,17 @@
+"""
+This is a boilerplate pipeline 'backtest_xgboost_30min'
+generated using Kedro 0.19.12
+"""
+
+from kedro.pipeline import node, Pipeline, pipeline  # noqa
+from .nodes import *
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline([
+        node(
+            func=backtest,
+            inputs=["backtest_consumption_data", "xgboost_optuna_best_params_30min", "params:backtest"],
+            outputs=["backtest_scores_xgboost_30min", "backtest_summary_xgboost_30min"],
+            name="backtest"
+        )
+    ])
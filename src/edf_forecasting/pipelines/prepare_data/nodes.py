@@ -14,7 +14,7 @@ def scrape_data(params):
     start_year_tempo = params["start_year_tempo"]
     end_year_tempo = params["end_year_tempo"]
 
-    scraper = Eco2MixScraper(output_dir=output_dir)
+    scraper = Eco2MixScraper(output_dir=output_dir, max_workers=params.get("max_workers", 4))
     scraper.scrape_definitive_data(start_year_def, end_year_def)
     scraper.scrape_tempo_data(start_year_tempo, end_year_tempo)
 
@@ -27,7 +27,7 @@ def prestructure_data(_, params):
     start_year = params["start_year"]
     end_year = params["end_year"]
 
-    preparator = Eco2MixDataPreparator(raw_dir, output_dir)
+    preparator = Eco2MixDataPreparator(raw_dir, output_dir, max_workers=params.get("max_workers"))
     preparator.prepare_consumption_data(start_year, end_year)
     preparator.prepare_tempo_calendar(start_year, end_year)
     
@@ -39,8 +39,9 @@ def clean_data(_, df_definitive, df_tempo, params):
         columns_to_keep=params["columns_to_keep"],
         tempo_column_name=params["tempo_column_name"],
         new_tempo_column_name=params["new_tempo_column_name"],
-        consumption_col=params["consumption_col"]
+        consumption_col=params["consumption_col"],
+        tempo_repair=params.get("tempo_repair", "vectorized")
     )
     df_def_cleaned = cleaner.clean_definitive(df_definitive)
     df_tempo_cleaned = cleaner.clean_tempo(df_tempo)
-    return df_def_cleaned, df_tempo_cleaned
+    return df_def_cleaned, df_tempo_cleaned, cleaner.synthesized_dates
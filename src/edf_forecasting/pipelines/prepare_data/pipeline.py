@@ -29,7 +29,7 @@ def create_pipeline(**kwargs) -> Pipeline:
                 "tempo_calendar",
                 "params:cleaning"
             ],
-            outputs=["cleaned_consumption_data", "cleaned_tempo_calendar"],
+            outputs=["cleaned_consumption_data", "cleaned_tempo_calendar", "tempo_synthesized_dates"],
             name="clean_data"
         )
     ])
\ No newline at end of file
@@ -4,6 +4,7 @@ generated using Kedro 0.19.12
 """
 from edf_forecasting.components.eco2mix_add_tempo import Eco2MixAddTempo
 from edf_forecasting.components.eco2mix_add_features import Eco2mixFeaturesMinute
+from edf_forecasting.components.eco2mix_weather_store import OpenMeteoWeatherStore
 import pandas as pd
 
 def add_tempo_min(df_data, df_tempo, params):
@@ -13,7 +14,8 @@ def add_tempo_min(df_data, df_tempo, params):
 
 def add_features_min(df, params):
     include = params.get("include", [])
-    engineer = Eco2mixFeaturesMinute(df)
+    weather_store = OpenMeteoWeatherStore(**params.get("weather", {}))
+    engineer = Eco2mixFeaturesMinute(df, weather_store=weather_store)
     return engineer.run(include=include)
 
 def check_frequency(df_data, params):
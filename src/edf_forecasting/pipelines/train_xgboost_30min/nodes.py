@@ -3,17 +3,23 @@ This is a boilerplate pipeline 'train_xgboost_30min'
 generated using Kedro 0.19.12
 """
 
-from edf_forecasting.components.eco2mix_evaluate_xgboost_30min import XGBEvaluate30min
+from edf_forecasting.components.eco2mix_evaluate_xgboost_30min import XGBEvaluate30min, BREAKDOWNS
 from edf_forecasting.components.eco2mix_calibrate_xgboost_30min import XGBCalibrator30min
 from edf_forecasting.components.eco2mix_train_xgboost_30min import Eco2mixTrainGBoost30min
+from edf_forecasting.components.eco2mix_forecast_recursive_xgboost_30min import XGBRecursiveForecaster30min
+from edf_forecasting.datasets.xgboost_model_dataset import XGBoostModelBundle
 
 def train(df_train, training_params, params):
     trainer = Eco2mixTrainGBoost30min(
         df_train=df_train,
         training_params=training_params,
         windows_size=params["windows_size"],
-        target_col=params["target_col"]
-
+        target_col=params["target_col"],
+        mmap_path=params.get("mmap_path"),
+        early_stopping_rounds=params.get("early_stopping_rounds"),
+        early_stopping_fraction=params.get("early_stopping_fraction", 0.1),
+        max_n_estimators=params.get("max_n_estimators"),
+        score_train=params.get("score_train")
     )
 
     model, scores, metadata = trainer.run()
@@ -31,6 +37,30 @@ def calibrate(df_data, model, params):
     q_inf, q_sup = calibrator.run(alpha=params["alpha"])
     return q_inf, q_sup
 
+def calibrate_online(df_data, model, params):
+    calibrator = XGBCalibrator30min(
+        df_cal=df_data,
+        model=model,
+        error_type=params["error_type"],
+        windows_size=params["windows_size"],
+        target_col=params["target_col"]
+    )
+    return calibrator.run_online(
+        alpha=params["alpha"],
+        gamma=params["gamma"],
+        n_bins=params["n_bins"],
+        decay=params["decay"],
+        step_size=params["step_size"]
+    )
+
+def calibrate_horizons(df_data, model, params):
+    forecaster = XGBRecursiveForecaster30min(model, windows_size=params["windows_size"])
+    y_pred, y_true = forecaster.forecast_frame(
+        df_data, params["target_col"], horizon=params["horizon"], stride=params["stride"], name="calibration"
+    )
+    q_inf, q_sup = forecaster.horizon_quantiles(y_pred, y_true, alpha=params["alpha"], error_type=params["error_type"])
+    return {"q_inf": q_inf.tolist(), "q_sup": q_sup.tolist(), "n_origins": int(y_pred.shape[1])}
+
 def evaluate(model, df_test, q_inf, q_sup, params):
     evaluator = XGBEvaluate30min(
         model,
@@ -39,8 +69,20 @@ def evaluate(model, df_test, q_inf, q_sup, params):
         q_sup,
         params["quantile"],
         params["windows_size"],
-        params["target_col"]
+        params["target_col"],
+        chunk_size=params.get("chunk_size", 65536),
+        breakdowns=params.get("breakdowns", BREAKDOWNS)
     )
 
     results = evaluator.run()
-    return results
\ No newline at end of file
+    return results
+
+def bundle_model(model, q_inf, q_sup, metadata, params):
+    return XGBoostModelBundle.from_model(
+        model,
+        q_inf=q_inf,
+        q_sup=q_sup,
+        windows_size=params["windows_size"],
+        target_col=params["target_col"],
+        training=metadata
+    )
@@ -10,7 +10,11 @@ def create_pipeline(**kwargs) -> Pipeline:
     return pipeline([
         node(
             func=train,
-            inputs=["train_checked_consumption_data", "xgboost_optuna_best_params_30min", "params:train"],
+            inputs=[
+                "train_checked_consumption_data",
+                "xgboost_optuna_best_params_30min",
+                "params:train"
+            ],
             outputs=["model_xgboost_30min", "train_scores_xgboost_30min", "metadata_xgboost_30min"],
             name="train"
         ),
@@ -21,6 +25,33 @@ def create_pipeline(**kwargs) -> Pipeline:
             outputs=["q_inf_xgboost_30min", "q_sup_xgboost_30min"],
             name="calibrate"
         ),
+
+        node(
+            func=bundle_model,
+            inputs=[
+                "model_xgboost_30min",
+                "q_inf_xgboost_30min",
+                "q_sup_xgboost_30min",
+                "metadata_xgboost_30min",
+                "params:train"
+            ],
+            outputs="model_bundle_xgboost_30min",
+            name="bundle_model"
+        ),
+
+        node(
+            func=calibrate_online,
+            inputs=["cal_checked_consumption_data", "model_xgboost_30min", "params:online_calibration"],
+            outputs="online_calibrator_xgboost_30min",
+            name="calibrate_online"
+        ),
+
+        node(
+            func=calibrate_horizons,
+            inputs=["cal_checked_consumption_data", "model_xgboost_30min", "params:horizon_calibration"],
+            outputs="horizon_quantiles_xgboost_30min",
+            name="calibrate_horizons"
+        ),
         
         node(
             func=evaluate,
@@ -2,25 +2,17 @@
 This is a boilerplate pipeline 'tune_xgboost_30min'
 generated using Kedro 0.19.12
 """
-import numpy as np
 from edf_forecasting.components.eco2mix_tune_xgboost_30min import XGBoostTuner
+from edf_forecasting.components.eco2mix_windowed_dataset import Eco2mixWindowedDataset
 
 def create_windows(df_data, params):
-    df = df_data.copy()
-    window_size = params["window_size"]
-    target_col = params["target_col"]
-
-    if target_col not in df.columns:
-        raise ValueError(f"Target colums '{target_col}' not found.")
-    
-    values = df[target_col].values
-    if len(values) <= window_size:
-        raise ValueError("Insufficient data size to create at least one window.")
-
-    X = np.lib.stride_tricks.sliding_window_view(values, window_shape=window_size)[:-1]
-    y = values[window_size:]
-
-    return X, y
+    windows = Eco2mixWindowedDataset.from_frame(
+        df_data,
+        params["target_col"],
+        params["window_size"],
+        mmap_path=params.get("mmap_path")
+    )
+    return windows.X, windows.y
 
 # Tuning (with Optuna)
 def tune(X, y, params):
@@ -28,7 +20,24 @@ def tune(X, y, params):
         n_trials=params["n_trials"],
         timeout=params["timeout"],
         cv = params["cv"],
-        seed=params["seed"]
+        seed=params["seed"],
+        engine=params.get("engine", "dmatrix"),
+        cv_strategy=params.get("cv_strategy", "timeseries"),
+        cv_gap=params.get("cv_gap", 0),
+        pruning=params.get("pruning", True),
+        n_startup_trials=params.get("n_startup_trials", 5),
+        n_warmup_steps=params.get("n_warmup_steps", 0),
+        n_workers=params.get("n_workers", 1),
+        threads_per_worker=params.get("threads_per_worker"),
+        study_dir=params.get("study_dir", "data/07_model_output/eco2mix/xgboost/30min/optuna_study"),
+        study_name=params.get("study_name", "xgb_tuning"),
+        warm_start=params.get("warm_start", True),
+        warm_start_from=params.get("warm_start_from"),
+        prior_study=params.get("prior_study"),
+        fidelity=params.get("fidelity", "full"),
+        rungs=params.get("rungs"),
+        reduction_factor=params.get("reduction_factor", 2),
+        max_n_estimators=params.get("max_n_estimators")
     )
 
     best_params, _ = tuner.run(X,y)
@@ -1,6 +1,7 @@
 from edf_forecasting.components.eco2mix_aggregate import Eco2mixAggregate
 from edf_forecasting.components.eco2mix_add_tempo import Eco2MixAddTempo
 from edf_forecasting.components.eco2mix_add_features import Eco2mixFeaturesDay
+from edf_forecasting.components.eco2mix_weather_store import OpenMeteoWeatherStore
 from edf_forecasting.components.eco2mix_preprocess_gboost_day import Eco2mixPreprocessGBoostDay
 from edf_forecasting.components.eco2mix_tune_gboost_day import XGBoostTuner
 from edf_forecasting.components.eco2mix_generate_tuning_plots_gboost_day import generate_tuning_plots
@@ -8,8 +9,8 @@ import os
 import optuna
 
 # Aggregate data 30min daily data
-def aggregate_data(df):
-    aggregator = Eco2mixAggregate()
+def aggregate_data(df, params):
+    aggregator = Eco2mixAggregate(mode=params["mode"])
     return aggregator.aggregate(df)
 
 # Add tempo data (Bleu/Blanc/Rouge)
@@ -19,7 +20,8 @@ def add_tempo(df_data, df_tempo, params):
 
 # Added weather, calendar, etc.
 def add_features(df, params):
-    extractor = Eco2mixFeaturesDay(df)
+    weather_store = OpenMeteoWeatherStore(**params.get("weather", {}))
+    extractor = Eco2mixFeaturesDay(df, weather_store=weather_store)
     return extractor.run(include=params["include"])
 
 # Prepares X/y train/test datasets
@@ -31,7 +33,8 @@ def preprocess_data(df, params):
         features_to_include=params["features_to_include"],
         target_features_to_include=params["target_features_to_include"],
         test_size=params["test_size"],
-        shuffle=params["shuffle"]
+        shuffle=params["shuffle"],
+        windowing=params.get("windowing", "strided")
     )
     X_train, X_test, y_train, y_test = processor.run(df)
     return X_train, X_test, y_train, y_test
@@ -41,7 +44,33 @@ def tune_model(X, y, params):
     tuner = XGBoostTuner(
         n_trials=params["n_trials"],
         timeout=params["timeout"],
-        seed=params["seed"]
+        seed=params["seed"],
+        cv=params.get("cv", 3),
+        engine=params.get("engine", "dmatrix"),
+        cv_strategy=params.get("cv_strategy", "timeseries"),
+        cv_gap=params.get("cv_gap", 0),
+        pruning=params.get("pruning", True),
+        n_startup_trials=params.get("n_startup_trials", 5),
+        n_warmup_steps=params.get("n_warmup_steps", 0),
+        n_workers=params.get("n_workers", 1),
+        threads_per_worker=params.get("threads_per_worker"),
+        multi_strategy=params.get("multi_strategy", "one_output_per_tree"),
+        study_dir=params.get("study_dir", "data/07_model_output/eco2mix/xgboost/day/optuna_study"),
+        study_name=params.get("study_name", "xgb_tuning"),
+        warm_start=params.get("warm_start", True),
+        warm_start_from=params.get("warm_start_from"),
+        prior_study=params.get("prior_study")
     )
     best_params, _ = tuner.run(X, y)
+
+    plots = params.get("plots")
+    if plots:
+        generate_tuning_plots(
+            study_dir=os.path.join(tuner.study_dir, tuner.study_name),
+            study_name=tuner.study_name,
+            output_dir=plots["output_dir"],
+            image_format=plots.get("image_format", "html"),
+            mode=plots.get("mode", "background"),
+            max_workers=plots.get("max_workers")
+        )
     return best_params
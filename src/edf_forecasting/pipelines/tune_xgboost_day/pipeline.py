@@ -9,7 +9,7 @@ def create_pipeline(**kwargs) -> Pipeline:
     return pipeline([
         node(
             func=aggregate_data,
-            inputs="cleaned_consumption_data",
+            inputs=["cleaned_consumption_data", "params:aggregate"],
             outputs="aggregated_consumption_data",
             name="aggregate_data"
         ),
@@ -28,7 +28,9 @@ def generate_plots(_, model, X_test, y_test, params):
         y_test=y_test,
         output_dir=params["plot_repo"],
         n_days=params["n_days"],
-        random_seed=params["random_seed"]
+        random_seed=params["random_seed"],
+        mode=params.get("mode", "background"),
+        max_workers=params.get("max_workers")
     )
 
 
@@ -15,7 +15,7 @@ def create_pipeline(**kwargs) -> Pipeline:
                 "params:training_params"
             ],
             outputs=[
-                "xgboost_model",
+                "xgboost_model_artifact_path",
                 "xgboost_training_scores",
                 "xgboost_training_metadata"
             ],
@@ -25,7 +25,7 @@ def create_pipeline(**kwargs) -> Pipeline:
         node(
             func=evaluate_model,
             inputs=[
-                "xgboost_model",
+                "xgboost_model_artifact_path",
                 "X_test_agg_day",
                 "y_test_agg_day"
             ],
@@ -36,7 +36,7 @@ def create_pipeline(**kwargs) -> Pipeline:
             func=generate_plots,
             inputs=[
                 "xgboost_evaluation_scores",
-                "xgboost_model",
+                "xgboost_model_artifact_path",
                 "X_test_agg_day",
                 "y_test_agg_day",
                 "params:plots_params"
@@ -7,6 +7,9 @@ https://docs.kedro.org/en/stable/kedro_project_setup/settings.html."""
 # from edf_forecasting.hooks import ProjectHooks
 # Hooks are executed in a Last-In-First-Out (LIFO) order.
 # HOOKS = (ProjectHooks(),)
+from edf_forecasting.hooks import NodeCacheHook, NodePerformanceHook
+
+HOOKS = (NodeCacheHook(), NodePerformanceHook())
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
@@ -0,0 +1,71 @@
+import holidays
+import pandas as pd
+import pytest
+
+from edf_forecasting.components.eco2mix_add_features import Eco2mixFeaturesDay, Eco2mixFeaturesMinute
+
+CALENDAR = ["weekday", "month", "season", "vacation"]
+
+def per_row_calendar(dates):
+    """The per-row implementation the vectorized features replaced, kept as the reference."""
+    jours = ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche"]
+    mois = [
+        "janvier", "février", "mars", "avril", "mai", "juin",
+        "juillet", "août", "septembre", "octobre", "novembre", "décembre"
+    ]
+
+    def season(m):
+        return (
+            "hiver" if m in [12, 1, 2] else
+            "printemps" if m in [3, 4, 5] else
+            "été" if m in [6, 7, 8] else
+            "automne"
+        )
+
+    years = dates.dt.year.unique()
+    public_holidays = holidays.FR(years=years)
+    vacation_ranges = {
+        "winter": ("02-05", "03-07"), "spring": ("04-09", "05-09"),
+        "summer": ("07-06", "08-31"), "Toussaint": ("10-17", "11-02"),
+        "christmas": ("12-18", "12-31")
+    }
+    vacations = set()
+    for y in years:
+        for start, end in vacation_ranges.values():
+            vacations.update(pd.date_range(f"{y}-{start}", f"{y}-{end}").date)
+
+    return pd.DataFrame({
+        "weekday": dates.dt.dayofweek.apply(lambda x: jours[x]),
+        "month": dates.dt.month.apply(lambda x: mois[x - 1]),
+        "season": dates.dt.month.apply(season),
+        "is_vacation": dates.dt.date.apply(lambda d: int(d in public_holidays or d in vacations)),
+    })
+
+def assert_same_calendar(df, expected):
+    for col in ("weekday", "month", "season"):
+        assert df[col].astype(str).tolist() == expected[col].tolist()
+    assert df["is_vacation"].astype(int).tolist() == expected["is_vacation"].tolist()
+
+def test_daily_calendar_matches_the_per_row_version():
+    # Five years: leap day, every school vacation and every season boundary
+    dates = pd.Series(pd.date_range("2019-01-01", "2023-12-31", freq="D"))
+    df = Eco2mixFeaturesDay(pd.DataFrame({"Date": dates}), weather_store=object()).run(include=CALENDAR)
+
+    expected = per_row_calendar(dates)
+    assert_same_calendar(df, expected)
+    assert 0 < expected["is_vacation"].mean() < 1
+    assert set(expected["season"]) == {"hiver", "printemps", "été", "automne"}
+
+@pytest.mark.parametrize("start, end", [
+    ("2021-12-17", "2022-01-03"),  # Christmas vacation, New Year's Day, winter across the year change
+    ("2022-02-27", "2022-03-09"),  # end of winter vacation and of winter
+    ("2023-05-30", "2023-07-08"),  # spring to summer, start of summer vacation
+    ("2023-10-15", "2023-11-13"),  # Toussaint, 1 and 11 November
+])
+def test_half_hourly_calendar_matches_the_per_row_version(start, end):
+    datetimes = pd.Series(pd.date_range(start, end, freq="30min", inclusive="left"))
+    df = Eco2mixFeaturesMinute(pd.DataFrame({"Datetime": datetimes}), weather_store=object()).run(include=CALENDAR)
+
+    expected = per_row_calendar(datetimes)
+    assert_same_calendar(df, expected)
+    assert expected["is_vacation"].nunique() == 2
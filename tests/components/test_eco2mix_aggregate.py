@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from edf_forecasting.components.eco2mix_aggregate import Eco2mixAggregate
+
+def half_hourly(start, end):
+    """Naive local 30-min timestamps as published by Eco2mix, DST days included."""
+    datetimes = pd.date_range(start, end, freq="30min", tz="Europe/Paris", inclusive="left").tz_localize(None)
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "Datetime": datetimes.strftime("%Y-%m-%d %H:%M:%S"),
+        "Consommation": rng.normal(50000, 5000, len(datetimes)),
+        "Temperature": rng.normal(10, 5, len(datetimes))
+    })
+
+def aggregate_both(df):
+    pivot = Eco2mixAggregate(mode="pivot").aggregate(df.copy())
+    loop = Eco2mixAggregate(mode="loop").aggregate(df.copy())
+    return pivot, loop.reindex(columns=pivot.columns)
+
+def test_pivot_matches_loop_on_regular_days():
+    pivot, loop = aggregate_both(half_hourly("2023-06-01", "2023-06-08"))
+    assert len(pivot) == 7
+    pd.testing.assert_frame_equal(pivot, loop)
+
+@pytest.mark.parametrize("start, end, dst_day", [
+    ("2023-03-24", "2023-03-28", "2023-03-26"),
+    ("2023-10-27", "2023-10-31", "2023-10-29"),
+])
+def test_pivot_matches_loop_around_dst(start, end, dst_day):
+    df = half_hourly(start, end)
+    pivot, loop = aggregate_both(df)
+    is_dst = pd.to_datetime(pivot["Date"]) == pd.Timestamp(dst_day)
+    assert is_dst.sum() == 1
+
+    pd.testing.assert_frame_equal(pivot[~is_dst], loop[~is_dst])
+
+    dst_slots = [f"{feature}_{slot}" for feature in ("Consommation", "Temperature") for slot in ("02h00", "02h30")]
+    other = [col for col in pivot.columns if col not in dst_slots]
+    pd.testing.assert_frame_equal(pivot.loc[is_dst, other], loop.loc[is_dst, other])
+
+def test_pivot_fills_the_missing_spring_forward_hour():
+    pivot, loop = aggregate_both(half_hourly("2023-03-26", "2023-03-27"))
+    row_pivot, row_loop = pivot.iloc[0], loop.iloc[0]
+    for slot in ("02h00", "02h30"):
+        assert np.isnan(row_loop[f"Consommation_{slot}"])
+        assert not np.isnan(row_pivot[f"Consommation_{slot}"])
+    before, after = row_pivot["Consommation_01h30"], row_pivot["Consommation_03h00"]
+    assert row_pivot["Consommation_02h00"] == pytest.approx(before + (after - before) / 3)
+    assert row_pivot["Consommation_02h30"] == pytest.approx(before + 2 * (after - before) / 3)
+
+def test_pivot_keeps_missing_measurements_missing():
+    df = half_hourly("2023-03-25", "2023-03-27")
+    ordinary = df["Datetime"].isin(["2023-03-25 11:00:00", "2023-03-25 02:00:00"])
+    spring = df["Datetime"] == "2023-03-26 11:00:00"
+    df.loc[ordinary | spring, "Consommation"] = np.nan
+    # A slot missing altogether on an ordinary day is not invented either
+    df = df[df["Datetime"] != "2023-03-25 15:30:00"]
+
+    pivot, loop = aggregate_both(df)
+    ordinary_day, dst_day = pivot.iloc[0], pivot.iloc[1]
+    for slot in ("02h00", "11h00", "15h30"):
+        assert np.isnan(ordinary_day[f"Consommation_{slot}"])
+    assert not np.isnan(ordinary_day["Temperature_11h00"])
+    assert np.isnan(dst_day["Consommation_11h00"])
+    assert not np.isnan(dst_day["Consommation_02h00"])
+
+def test_pivot_averages_the_repeated_fall_back_hour():
+    df = half_hourly("2023-10-29", "2023-10-30")
+    assert len(df) == 50
+    pivot, loop = aggregate_both(df)
+    repeated = df[df["Datetime"].str.endswith("02:00:00")]["Consommation"]
+    assert len(repeated) == 2
+    assert pivot.iloc[0]["Consommation_02h00"] == pytest.approx(repeated.mean())
+    # The loop keeps whichever of the two rows comes last
+    assert loop.iloc[0]["Consommation_02h00"] == repeated.iloc[-1]
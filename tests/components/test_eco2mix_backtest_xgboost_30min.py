@@ -0,0 +1,21 @@
+import pytest
+
+from edf_forecasting.components.eco2mix_backtest_xgboost_30min import rolling_origins
+
+
+def test_expanding_origins_train_on_every_earlier_year():
+    origins = rolling_origins(range(2015, 2021), n_origins=2, min_train_years=2)
+    assert origins == [
+        {"train_years": [2015, 2016, 2017], "cal_year": 2018, "test_year": 2019},
+        {"train_years": [2015, 2016, 2017, 2018], "cal_year": 2019, "test_year": 2020},
+    ]
+
+
+def test_rolling_origins_keep_the_last_train_years():
+    origins = rolling_origins(range(2015, 2021), n_origins=2, window="rolling", train_years=2)
+    assert [origin["train_years"] for origin in origins] == [[2016, 2017], [2017, 2018]]
+
+
+def test_rolling_window_needs_train_years():
+    with pytest.raises(ValueError, match="train_years"):
+        rolling_origins(range(2015, 2021), n_origins=2, window="rolling")
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from edf_forecasting.components.eco2mix_calibrate_xgboost_30min import OnlineConformalCalibrator
+
+
+def replay(calibrator, errors, step_size=48):
+    """Miss rate of the bounds in force before each step, as the service would serve them."""
+    misses = []
+    for step in range(0, len(errors), step_size):
+        batch = errors[step:step + step_size]
+        q_inf, q_sup = calibrator.bounds()
+        misses.extend((batch < q_inf) | (batch > q_sup))
+        calibrator.update(batch, np.zeros_like(batch))
+    return np.asarray(misses)
+
+
+@pytest.mark.parametrize("alpha", [0.05, 0.2])
+def test_online_coverage_converges_to_the_target(alpha):
+    rng = np.random.default_rng(0)
+    seed = rng.normal(0.0, 100.0, 480)
+    calibrator = OnlineConformalCalibrator.from_errors(seed, alpha=alpha, gamma=0.01, n_bins=512, decay=0.999)
+    calibrator.add_errors(seed)
+
+    # The residual spread triples halfway through, far past the range of the seed
+    errors = np.concatenate([rng.normal(0.0, 100.0, 48 * 200), rng.normal(0.0, 300.0, 48 * 400)])
+    misses = replay(calibrator, errors)
+
+    assert np.mean(misses[-48 * 200:]) == pytest.approx(alpha, abs=0.02)
+
+
+def test_range_grows_to_take_in_outlying_residuals():
+    calibrator = OnlineConformalCalibrator(-1.0, 1.0, alpha=0.1, n_bins=8)
+    calibrator.add_errors(np.linspace(-0.9, 0.9, 100))
+    calibrator.add_errors(np.full(1000, 10.0))
+
+    assert calibrator.low == -1.0 and calibrator.high >= 10.0
+    assert calibrator.weights.sum() == pytest.approx(1100.0)
+    assert calibrator.bounds()[1] > 1.0
+
+
+def test_missing_values_are_skipped():
+    rng = np.random.default_rng(0)
+    errors = rng.normal(0.0, 1.0, 480)
+    calibrator = OnlineConformalCalibrator.from_errors(np.append(errors, np.nan), alpha=0.1, gamma=0.05, n_bins=64)
+    calibrator.add_errors(errors)
+    weights, bounds, alpha_t = calibrator.weights.copy(), calibrator.bounds(), calibrator.alpha_t
+
+    calibrator.add_errors(np.array([np.nan, np.inf, -np.inf]))
+    calibrator.update(np.full(48, np.nan), np.zeros(48))
+    calibrator.update(np.zeros(48), np.full(48, np.nan))
+
+    assert calibrator.n_seen == 480
+    assert calibrator.alpha_t == alpha_t
+    assert calibrator.bounds() == bounds
+    np.testing.assert_array_equal(calibrator.weights, weights)
+
+    # Only the finite pairs are scored and added
+    calibrator.update(np.array([np.nan, 0.0, 100.0]), np.zeros(3))
+    assert calibrator.n_seen == 482
+    assert calibrator.alpha_t == pytest.approx(alpha_t + 0.05 * (0.1 - 0.5))
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from edf_forecasting.components.eco2mix_clean_data import Eco2mixCleaner
+
+@pytest.fixture
+def df_tempo():
+    """A tempo calendar with unparsable dates, a missing colour and a gap of absent days."""
+    dates = pd.date_range("2022-09-01", periods=30, freq="D").strftime("%Y-%m-%d").tolist()
+    colours = ["BLEU", "BLANC", "ROUGE"] * 10
+    dates[3] = "not a date"
+    dates[4] = None
+    dates[12] = ""
+    colours[7] = None
+    colours[20] = np.nan
+    df = pd.DataFrame({"Date": dates, "Type de jour Tempo": colours})
+    # Days 16 to 18 are absent altogether
+    return df.drop(index=[16, 17, 18]).reset_index(drop=True)
+
+def clean(df, tempo_repair):
+    cleaner = Eco2mixCleaner(columns_to_keep=["Datetime", "Consommation"], tempo_repair=tempo_repair)
+    return cleaner, cleaner.clean_tempo(df.copy())
+
+def test_vectorized_repair_matches_loop_on_rows_the_loop_keeps(df_tempo):
+    _, loop = clean(df_tempo, "loop")
+    _, vectorized = clean(df_tempo, "vectorized")
+
+    # The loop only rebuilds dates and leaves absent days out
+    expected = loop.set_index("Date")
+    repaired = vectorized.set_index("Date").loc[expected.index]
+    pd.testing.assert_frame_equal(repaired, expected, check_names=False)
+
+def test_vectorized_repair_fills_the_calendar(df_tempo):
+    cleaner, vectorized = clean(df_tempo, "vectorized")
+
+    pd.testing.assert_series_equal(
+        vectorized["Date"], pd.Series(pd.date_range("2022-09-01", periods=30, freq="D"), name="Date"),
+        check_freq=False
+    )
+    assert vectorized["tempo"].notna().all()
+    # Absent days take the colour of the day before them
+    assert vectorized.set_index("Date").loc["2022-09-17":"2022-09-19", "tempo"].eq("BLEU").all()
+
+    synthesized = cleaner.synthesized_dates.set_index("Date")["repair"]
+    assert synthesized.to_dict() == {
+        pd.Timestamp("2022-09-04"): "rebuilt",
+        pd.Timestamp("2022-09-05"): "rebuilt",
+        pd.Timestamp("2022-09-13"): "rebuilt",
+        pd.Timestamp("2022-09-17"): "inserted",
+        pd.Timestamp("2022-09-18"): "inserted",
+        pd.Timestamp("2022-09-19"): "inserted",
+    }
+
+def test_clean_tempo_leaves_its_input_alone(df_tempo):
+    before = df_tempo.copy()
+    clean(df_tempo, "vectorized")
+    pd.testing.assert_frame_equal(df_tempo, before)
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+from xgboost import XGBRegressor
+
+from edf_forecasting.components.eco2mix_forecast_recursive_xgboost_30min import XGBRecursiveForecaster30min
+
+WINDOWS_SIZE = 4
+
+class DampedMean:
+    """Linear one-step model: a weighted mean of the lags plus a constant."""
+
+    def predict(self, X):
+        X = np.asarray(X)
+        return 0.9 * X.mean(axis=1) + 0.1 * X[:, -1] + 1.0
+
+@pytest.fixture(params=["linear", "xgboost"])
+def model(request):
+    if request.param == "linear":
+        return DampedMean()
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, WINDOWS_SIZE)).astype(np.float32)
+    return XGBRegressor(n_estimators=10, max_depth=3).fit(X, X.mean(axis=1))
+
+def one_step_loop(model, window, horizon):
+    """Reference: one origin at a time, predicting one step and appending it to the window."""
+    window = list(np.asarray(window, dtype=np.float32))
+    forecasts = []
+    for _ in range(horizon):
+        lags = np.asarray(window[-WINDOWS_SIZE:], dtype=np.float32)[None, :]
+        forecasts.append(np.float32(model.predict(lags)[0]))
+        window.append(forecasts[-1])
+    return np.asarray(forecasts)
+
+def test_forecast_matches_a_per_origin_recursive_loop(model):
+    rng = np.random.default_rng(1)
+    windows = rng.normal(size=(7, WINDOWS_SIZE)).astype(np.float32)
+    forecaster = XGBRecursiveForecaster30min(model, windows_size=WINDOWS_SIZE)
+
+    y_pred = forecaster.forecast(windows, horizon=10)
+    assert y_pred.shape == (10, 7)
+    expected = np.column_stack([one_step_loop(model, window, 10) for window in windows])
+    np.testing.assert_allclose(y_pred, expected, rtol=1e-6)
+
+def test_forecast_needs_exactly_windows_size_lags():
+    forecaster = XGBRecursiveForecaster30min(DampedMean(), windows_size=WINDOWS_SIZE)
+    with pytest.raises(ValueError, match="exactly 4 lags"):
+        forecaster.forecast(np.zeros((2, WINDOWS_SIZE + 1)))
+
+@pytest.mark.parametrize("n_values, horizon, stride, n_origins", [
+    (100, 6, 5, 19),  # (100 - 4 - 6) // 5 + 1
+    (100, 6, 1, 91),
+    (10, 6, 3, 1),  # exactly one full horizon
+])
+def test_forecast_frame_pairs_origins_with_their_actuals(n_values, horizon, stride, n_origins):
+    df = pd.DataFrame({"Consommation": np.arange(n_values, dtype=np.float32)})
+    forecaster = XGBRecursiveForecaster30min(DampedMean(), windows_size=WINDOWS_SIZE)
+
+    y_pred, y_true = forecaster.forecast_frame(df, "Consommation", horizon=horizon, stride=stride)
+    assert y_pred.shape == y_true.shape == (horizon, n_origins)
+    for j in range(n_origins):
+        start = j * stride
+        # Origin j forecasts the horizon values right after its window
+        np.testing.assert_array_equal(y_true[:, j], np.arange(start + WINDOWS_SIZE, start + WINDOWS_SIZE + horizon))
+        np.testing.assert_allclose(
+            y_pred[:, j], one_step_loop(DampedMean(), np.arange(start, start + WINDOWS_SIZE), horizon), rtol=1e-6
+        )
+
+def test_forecast_frame_needs_one_full_horizon():
+    df = pd.DataFrame({"Consommation": np.arange(9, dtype=np.float32)})
+    forecaster = XGBRecursiveForecaster30min(DampedMean(), windows_size=WINDOWS_SIZE)
+    with pytest.raises(ValueError, match="Insufficient data"):
+        forecaster.forecast_frame(df, "Consommation", horizon=6)
+
+@pytest.mark.parametrize("error_type", ["raw", "absolute"])
+def test_horizon_quantiles_are_per_step(error_type):
+    rng = np.random.default_rng(2)
+    y_true = rng.normal(size=(6, 200))
+    # Errors grow with the horizon step
+    y_pred = y_true - rng.normal(size=(6, 200)) * np.arange(1, 7)[:, None]
+
+    q_inf, q_sup = XGBRecursiveForecaster30min.horizon_quantiles(y_pred, y_true, alpha=0.1, error_type=error_type)
+    assert q_inf.shape == q_sup.shape == (6,)
+    errors = y_true - y_pred
+    if error_type == "absolute":
+        errors = np.abs(errors)
+    for h in range(6):
+        assert q_inf[h] == pytest.approx(np.quantile(errors[h], 0.05))
+        assert q_sup[h] == pytest.approx(np.quantile(errors[h], 0.95))
+    assert np.all(np.diff(q_sup - q_inf) > 0)
+
+def test_scalar_bounds_widen_with_the_square_root_of_the_step():
+    y_pred = np.full((9, 3), 100.0)
+    lower, upper = XGBRecursiveForecaster30min.bands(y_pred, -2.0, 4.0)
+
+    assert lower.shape == upper.shape == (9, 3)
+    steps = np.sqrt(np.arange(1, 10))[:, None]
+    np.testing.assert_allclose(lower, 100.0 - 2.0 * steps * np.ones((1, 3)))
+    np.testing.assert_allclose(upper, 100.0 + 4.0 * steps * np.ones((1, 3)))
+    # Step 1 is the one-step interval, step 4 twice as wide
+    assert (upper - lower)[0, 0] == pytest.approx(6.0)
+    assert (upper - lower)[3, 0] == pytest.approx(12.0)
+
+def test_per_horizon_bounds_are_applied_as_they_are():
+    y_pred = np.arange(12.0).reshape(4, 3)
+    q_inf, q_sup = np.array([-1.0, -2.0, -3.0, -4.0]), np.array([1.0, 1.5, 2.0, 2.5])
+    lower, upper = XGBRecursiveForecaster30min.bands(y_pred, q_inf, q_sup)
+
+    np.testing.assert_allclose(lower, y_pred + q_inf[:, None])
+    np.testing.assert_allclose(upper, y_pred + q_sup[:, None])
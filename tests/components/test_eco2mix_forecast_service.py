@@ -0,0 +1,134 @@
+import json
+import threading
+from http.client import HTTPConnection
+
+import numpy as np
+import pytest
+
+from edf_forecasting.components.eco2mix_forecast_service import Eco2mixForecastService, ForecastClient, serve
+
+class StubModel:
+    """Predicts the sum of each row and records the size of every batch it is given."""
+
+    def __init__(self, n_features_in=None):
+        self.n_features_in_ = n_features_in
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def predict(self, X):
+        with self._lock:
+            self.batch_sizes.append(len(X))
+        return np.asarray(X).sum(axis=1)
+
+@pytest.fixture
+def models():
+    return StubModel(), StubModel(n_features_in=3)
+
+@pytest.fixture
+def max_wait_ms():
+    return 2.0
+
+@pytest.fixture
+def service(models, max_wait_ms):
+    model_30min, model_day = models
+    service = Eco2mixForecastService(
+        model_30min, q_inf=-10.0, q_sup=20.0, windows_size=4, model_day=model_day,
+        max_batch_size=8, max_wait_ms=max_wait_ms
+    )
+    yield service
+    service.close()
+
+@pytest.fixture
+def server(service):
+    server = serve(service, port=0)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client(server):
+    return ForecastClient(f"http://127.0.0.1:{server.server_port}")
+
+def test_health(client):
+    assert client.health() == {"30min": True, "day": True, "online_calibration": False}
+
+def test_forecast_30min_uses_the_last_window(client):
+    response = client.forecast_30min([[100.0, 1.0, 2.0, 3.0, 4.0], [1.0, 1.0, 1.0, 1.0, 1.0]])
+    assert response["forecast"] == [10.0, 4.0]
+    assert response["lower"] == [0.0, -6.0]
+    assert response["upper"] == [30.0, 24.0]
+    assert (response["q_inf"], response["q_sup"]) == (-10.0, 20.0)
+
+def test_forecast_day(client):
+    assert client.forecast_day([[1.0, 2.0, 3.0]]) == {"forecast": [6.0]}
+
+def test_bad_requests_get_400(client):
+    with pytest.raises(ValueError, match="at least 4 values"):
+        client.forecast_30min([[1.0, 2.0]])
+    with pytest.raises(ValueError, match="3 values"):
+        client.forecast_day([[1.0, 2.0]])
+    with pytest.raises(ValueError, match="online calibrator"):
+        client.update_actuals([1.0], [1.0])
+
+def test_unknown_path_keeps_the_connection_usable(server):
+    connection = HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    body = json.dumps({"history": [[1.0, 2.0, 3.0, 4.0]]})
+    headers = {"Content-Type": "application/json"}
+
+    connection.request("POST", "/forecast/unknown", body=body, headers=headers)
+    response = connection.getresponse()
+    assert response.status == 404
+    response.read()
+
+    connection.request("POST", "/forecast/30min", body=body, headers=headers)
+    response = connection.getresponse()
+    assert response.status == 200
+    assert json.loads(response.read())["forecast"] == [10.0]
+    connection.close()
+
+# A long wait so that concurrent requests reliably land in the same batch
+@pytest.mark.parametrize("max_wait_ms", [2000.0])
+def test_concurrent_requests_are_coalesced_into_one_batch(client, models):
+    model_30min, _ = models
+    n_requests = 8
+    barrier = threading.Barrier(n_requests)
+    results = [None] * n_requests
+
+    def request(i):
+        barrier.wait()
+        results[i] = client.forecast_30min([[float(i)] * 4])["forecast"]
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(n_requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert model_30min.batch_sizes == [n_requests]
+    # Every request got its own rows back
+    assert results == [[4.0 * i] for i in range(n_requests)]
+
+@pytest.fixture
+def bundle_path(tmp_path):
+    from xgboost import XGBRegressor
+    from edf_forecasting.datasets.xgboost_model_dataset import XGBoostModelBundle
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 6)).astype(np.float32)
+    model = XGBRegressor(n_estimators=5, max_depth=2).fit(X, X.sum(axis=1))
+    path = tmp_path / "model_bundle"
+    XGBoostModelBundle.from_model(model, q_inf=-1.0, q_sup=2.0, windows_size=6).save(path)
+    return str(path)
+
+@pytest.mark.parametrize("windows_size, expected", [(None, 6), (12, 12)])
+def test_from_paths_takes_the_windows_size_of_the_bundle(bundle_path, windows_size, expected):
+    service = Eco2mixForecastService.from_paths(
+        model_30min_path=bundle_path, model_day_path=None, windows_size=windows_size
+    )
+    try:
+        assert service.windows_size == expected
+        assert (service.q_inf, service.q_sup) == (-1.0, 2.0)
+        if windows_size is None:
+            assert len(service.forecast_30min(np.ones((2, 10)))["forecast"]) == 2
+    finally:
+        service.close()
@@ -0,0 +1,163 @@
+import os
+import time
+
+import numpy as np
+import optuna
+import yaml
+from optuna.trial import TrialState
+
+from edf_forecasting.components.eco2mix_optuna_study import (
+    STUDY_FILE, add_prior_trials, journal_storage, open_study, run_parallel_study, run_study, save_study_summary,
+    warm_start
+)
+
+class ToyTuner:
+    """Just enough of a tuner for the study helpers; pickled into spawned workers."""
+
+    def __init__(self, n_trials, study_dir=None, study_name="toy", prior_study=None, warm_start=False,
+                 warm_start_from=None, n_workers=1):
+        self.n_trials = n_trials
+        self.timeout = 60
+        self.study_dir = study_dir
+        self.study_name = study_name
+        self.prior_study = prior_study
+        self.warm_start = warm_start
+        self.warm_start_from = warm_start_from
+        self.n_workers = n_workers
+        self.threads_per_worker = 1
+        self.cv = 3
+        self.cv_strategy = "timeseries"
+        self.engine = "dmatrix"
+        self.pruning = False
+        self.seed = 0
+
+    def pruner(self):
+        return optuna.pruners.NopPruner()
+
+    def objective(self, X, y, n_jobs=None):
+        def objective(trial):
+            x = trial.suggest_float("x", -1.0, 1.0)
+            trial.set_user_attr("pid", os.getpid())
+            trial.set_user_attr("data_path", getattr(X, "filename", None))
+            # Long enough for every worker to pick up trials
+            time.sleep(0.2)
+            return (x - float(np.mean(X))) ** 2 + float(np.mean(y))
+        return objective
+
+def load(study_dir, study_name="toy"):
+    return optuna.load_study(study_name=study_name, storage=journal_storage(os.path.join(study_dir, STUDY_FILE)))
+
+def test_workers_share_one_journal_study_and_stop_at_max_trials(tmp_path):
+    study_dir = str(tmp_path / "toy")
+    open_study(study_dir, "toy")
+    X, y = np.full((10, 2), 0.5), np.zeros(10)
+
+    run_parallel_study(ToyTuner(n_trials=8), X, y, study_dir, "toy", n_workers=2, threads_per_worker=1)
+
+    trials = load(study_dir).trials
+    # Trials already running elsewhere when the budget is reached still finish
+    assert 8 <= len(trials) <= 9
+    assert all(trial.state == TrialState.COMPLETE for trial in trials)
+    assert len({trial.user_attrs["pid"] for trial in trials}) == 2
+    assert os.getpid() not in {trial.user_attrs["pid"] for trial in trials}
+
+    # Worker data lives outside the study directory and is gone afterwards
+    data_paths = {trial.user_attrs["data_path"] for trial in trials}
+    assert len(data_paths) == 1
+    data_path = data_paths.pop()
+    assert not data_path.startswith(study_dir) and not os.path.exists(data_path)
+    assert os.listdir(study_dir) == [STUDY_FILE]
+
+def test_rerun_counts_the_trials_already_done(tmp_path):
+    study_dir = str(tmp_path / "toy")
+    open_study(study_dir, "toy")
+    X, y = np.zeros((10, 2)), np.zeros(10)
+
+    run_parallel_study(ToyTuner(n_trials=2), X, y, study_dir, "toy", n_workers=2, threads_per_worker=1)
+    n_first = len(load(study_dir).trials)
+    run_parallel_study(ToyTuner(n_trials=2), X, y, study_dir, "toy", n_workers=2, threads_per_worker=1)
+
+    assert n_first + 2 <= len(load(study_dir).trials) <= n_first + 3
+
+def quadratic(trial):
+    return (trial.suggest_float("x", -1.0, 1.0) - 0.3) ** 2
+
+def toy_study(study_dir, n_trials, study_name=None):
+    study_name = study_name or os.path.basename(study_dir)
+    study = open_study(study_dir, study_name)
+    study.optimize(quadratic, n_trials=n_trials)
+    return study
+
+def enqueued(study):
+    """Params of the trials waiting in `study`, as given to `enqueue_trial`."""
+    waiting = study.get_trials(deepcopy=False, states=(TrialState.WAITING,))
+    return [trial.system_attrs["fixed_params"] for trial in waiting]
+
+def test_named_study_resumes_from_its_journal(tmp_path):
+    first = toy_study(str(tmp_path / "toy"), n_trials=3)
+    resumed = open_study(str(tmp_path / "toy"), "toy")
+
+    assert [trial.params for trial in resumed.trials] == [trial.params for trial in first.trials]
+    resumed.optimize(quadratic, n_trials=2)
+    assert len(load(str(tmp_path / "toy")).trials) == 5
+
+def test_warm_start_enqueues_the_best_params_of_a_resumed_study(tmp_path):
+    study = toy_study(str(tmp_path / "toy"), n_trials=4)
+    warm_start(study, params_path=str(tmp_path / "ignored.yml"))
+
+    assert enqueued(study) == [study.best_params]
+
+def test_warm_start_enqueues_saved_params_in_a_new_study(tmp_path):
+    params_path = tmp_path / "best_params.yml"
+    params_path.write_text(yaml.dump({"best_params": {"x": 0.25}, "best_score_rmse": 1.0}))
+    study = open_study(str(tmp_path / "toy"), "toy")
+    warm_start(study, params_path=str(params_path))
+
+    study.optimize(quadratic, n_trials=1)
+    assert study.trials[0].params == {"x": 0.25}
+
+def test_warm_start_reads_the_latest_version_of_a_versioned_dataset(tmp_path):
+    # Kedro versioned dataset layout: <path>/<version>/<file name>
+    params_path = tmp_path / "xgboost_optuna_best_params.yml"
+    for version, x in [("2026-01-01T10.00.00.000Z", -0.5), ("2026-02-01T10.00.00.000Z", 0.75)]:
+        (params_path / version).mkdir(parents=True)
+        (params_path / version / params_path.name).write_text(yaml.dump({"x": x}))
+    study = open_study(str(tmp_path / "toy"), "toy")
+    warm_start(study, params_path=str(params_path))
+
+    assert enqueued(study) == [{"x": 0.75}]
+
+def test_warm_start_without_params_enqueues_nothing(tmp_path):
+    study = open_study(str(tmp_path / "toy"), "toy")
+    warm_start(study, params_path=str(tmp_path / "missing.yml"))
+    assert study.trials == []
+
+def test_prior_trials_are_imported_once_across_reruns(tmp_path):
+    prior = toy_study(str(tmp_path / "prior"), n_trials=3)
+    prior.enqueue_trial({"x": 0.0})  # never run: only completed trials are a prior
+
+    study = open_study(str(tmp_path / "toy"), "toy")
+    add_prior_trials(study, str(tmp_path / "prior") + "/")
+    assert [trial.params for trial in study.trials] == [trial.params for trial in prior.trials[:3]]
+
+    # A rerun resumes the study, which already holds the prior
+    study.optimize(quadratic, n_trials=1)
+    rerun = open_study(str(tmp_path / "toy"), "toy")
+    add_prior_trials(rerun, str(tmp_path / "prior"))
+    assert len(load(str(tmp_path / "toy")).trials) == 4
+
+def test_run_study_and_summary(tmp_path):
+    toy_study(str(tmp_path / "prior"), n_trials=2)
+    tuner = ToyTuner(n_trials=3, study_dir=str(tmp_path), prior_study=str(tmp_path / "prior"), warm_start=True)
+    X, y = np.zeros((10, 2)), np.zeros(10)
+
+    study, n_previous_trials = run_study(tuner, X, y)
+    assert n_previous_trials == 2
+    assert len(study.trials) == 2 + 3
+
+    summary = save_study_summary(study, tuner, study.best_params, n_previous_trials, "tuning_now", fidelity="full")
+    saved = yaml.safe_load((tmp_path / "toy" / "best_params.yml").read_text())
+    assert saved == summary
+    assert saved["best_params"] == study.best_params
+    assert saved["study_path"] == os.path.join(str(tmp_path), "toy", STUDY_FILE)
+    assert (saved["n_trials"], saved["n_previous_trials"], saved["fidelity"]) == (3, 2, "full")
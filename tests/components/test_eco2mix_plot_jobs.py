@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from edf_forecasting.components import eco2mix_plot_jobs
+from edf_forecasting.components.eco2mix_plot_jobs import (
+    DEFERRED_DIR, plot_executor, render_deferred, run_plot_jobs, wait_background
+)
+
+
+def render_text(output_dir, name):
+    """Stand-in for a figure: runs in a worker process, so it must be importable."""
+    with open(os.path.join(output_dir, f"{name}.txt"), "w") as f:
+        f.write(name)
+
+
+def render_failure(output_dir, name):
+    raise ValueError(f"cannot render {name}")
+
+
+def rendered(output_dir):
+    return sorted(name for name in os.listdir(output_dir) if name.endswith(".txt"))
+
+
+def test_defer_then_render_deferred(tmp_path):
+    jobs = [(str(tmp_path), "a"), (str(tmp_path), "b")]
+    run_plot_jobs(render_text, jobs, str(tmp_path), mode="defer")
+    run_plot_jobs(render_text, [(str(tmp_path), "c")], str(tmp_path), mode="defer")
+
+    assert rendered(tmp_path) == []
+    assert len(os.listdir(tmp_path / DEFERRED_DIR)) == 2
+
+    render_deferred(str(tmp_path), max_workers=1)
+    assert rendered(tmp_path) == ["a.txt", "b.txt", "c.txt"]
+    assert os.listdir(tmp_path / DEFERRED_DIR) == []
+
+
+def test_skip_renders_nothing(tmp_path):
+    run_plot_jobs(render_text, [(str(tmp_path), "a")], str(tmp_path), mode="skip")
+    assert os.listdir(tmp_path) == []
+
+
+def test_unknown_mode(tmp_path):
+    with pytest.raises(ValueError, match="Unknown plot mode"):
+        run_plot_jobs(render_text, [(str(tmp_path), "a")], str(tmp_path), mode="later")
+
+
+def test_pools_are_kept_per_max_workers():
+    assert plot_executor(1) is plot_executor(1)
+    assert plot_executor(1) is not plot_executor(2)
+    assert plot_executor(2)._max_workers == 2
+
+
+def test_background_failures_surface(tmp_path):
+    run_plot_jobs(render_text, [(str(tmp_path), "a")], str(tmp_path), mode="background", max_workers=1)
+    run_plot_jobs(render_failure, [(str(tmp_path), "b")], str(tmp_path), mode="background", max_workers=1)
+
+    with pytest.raises(RuntimeError, match="1 of 2 background plots failed.*cannot render b"):
+        wait_background()
+    assert rendered(tmp_path) == ["a.txt"]
+    assert eco2mix_plot_jobs._background == []
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from edf_forecasting.components.eco2mix_preprocess_gboost_day import Eco2mixPreprocessGBoostDay
+
+@pytest.fixture
+def df_day():
+    rng = np.random.default_rng(0)
+    n_days = 30
+    df = pd.DataFrame({"Date": pd.date_range("2023-01-01", periods=n_days, freq="D")})
+    for slot in range(4):
+        df[f"Consommation_{slot}"] = rng.normal(50000, 5000, n_days)
+    df["Temperature"] = rng.normal(10, 5, n_days)
+    df["Tempo"] = rng.integers(0, 3, n_days)
+    df["is_holiday"] = rng.integers(0, 2, n_days).astype(bool)
+    return df
+
+@pytest.mark.parametrize("features, target_features", [
+    ([], []),
+    (["Temperature", "Tempo"], []),
+    (["Temperature"], ["Tempo", "is_holiday"]),
+])
+@pytest.mark.parametrize("window_size", [1, 7])
+def test_strided_windows_match_sliding_loop(df_day, features, target_features, window_size):
+    preprocess = Eco2mixPreprocessGBoostDay(window_size=window_size)
+    df, _ = preprocess._encode_categorical(df_day, features + target_features)
+    args = (df, window_size, "Consommation_", "Date", features, target_features)
+
+    X_loop, y_loop, dates_loop = preprocess._create_dataset_sliding(*args)
+    X_strided, y_strided, dates_strided = preprocess._create_dataset_strided(*args)
+
+    np.testing.assert_array_equal(X_strided, X_loop.astype(float))
+    np.testing.assert_array_equal(y_strided, y_loop.astype(float))
+    assert dates_strided == dates_loop
+
+def test_strided_run_matches_loop_run(df_day):
+    kwargs = dict(window_size=7, features_to_include=["Temperature"], target_features_to_include=["Tempo"])
+    strided = Eco2mixPreprocessGBoostDay(windowing="strided", **kwargs).run(df_day)
+    loop = Eco2mixPreprocessGBoostDay(windowing="loop", **kwargs).run(df_day)
+    for frame_strided, frame_loop in zip(strided, loop):
+        pd.testing.assert_frame_equal(frame_strided, frame_loop.astype(float))
+
+def test_strided_rejects_too_short_frame(df_day):
+    preprocess = Eco2mixPreprocessGBoostDay()
+    with pytest.raises(ValueError):
+        preprocess._create_dataset_strided(df_day.head(3), 7, "Consommation_", "Date", [], [])
@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from edf_forecasting.components import eco2mix_prestructuration_data
+from edf_forecasting.components.eco2mix_prestructuration_data import Eco2MixDataPreparator
+from edf_forecasting.datasets.partitioned_parquet_dataset import PartitionedParquetDataset
+
+YEARS = (2020, 2021, 2022)
+
+
+def write_definitive(raw_dir, year, offset=0.0):
+    """A yearly definitive file as published: tab-separated latin1 text named .xls, with a footer line."""
+    datetimes = pd.date_range(f"{year}-01-01", f"{year}-01-03", freq="30min", inclusive="left")
+    df = pd.DataFrame({
+        "Périmètre": "France",
+        "Date": datetimes.strftime("%Y-%m-%d"),
+        "Heures": datetimes.strftime("%H:%M"),
+        "Consommation": np.arange(len(datetimes), dtype=float) + year + offset,
+    })
+    folder = raw_dir / "definitive" / str(year)
+    folder.mkdir(parents=True, exist_ok=True)
+    text = df.to_csv(sep="\t", index=False) + "RTE ne pourra être tenu responsable\n"
+    (folder / f"eCO2mix_RTE_Annuel-Definitif_{year}.xls").write_bytes(text.encode("latin1"))
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    raw_dir = tmp_path / "raw"
+    for year in YEARS:
+        write_definitive(raw_dir, year)
+    return raw_dir
+
+
+def prepare(raw_dir, tmp_path):
+    preparator = Eco2MixDataPreparator(raw_dir, tmp_path / "out", max_workers=2)
+    preparator.prepare_consumption_data(min(YEARS), max(YEARS))
+    return tmp_path / "out" / "definitive" / "consumption_data"
+
+
+def load(output_path):
+    return PartitionedParquetDataset(filepath=str(output_path), datetime_col="Datetime").load()
+
+
+def partition_mtimes(output_path):
+    return {year: os.stat(output_path / f"year={year}" / "part-0.parquet").st_mtime_ns for year in YEARS}
+
+
+def test_files_are_parsed_in_parallel_and_merged(raw_dir, tmp_path):
+    df = load(prepare(raw_dir, tmp_path))
+
+    assert len(df) == 3 * 96
+    assert df["Datetime"].is_monotonic_increasing
+    assert sorted(df["Datetime"].dt.year.unique()) == list(YEARS)
+    assert df.loc[df["Datetime"] == "2021-01-01 00:30", "Consommation"].item() == 2022.0
+
+
+def test_unchanged_files_are_neither_parsed_nor_saved_again(raw_dir, tmp_path, caplog):
+    output_path = prepare(raw_dir, tmp_path)
+    cached = sorted((tmp_path / "out" / ".cache" / "definitive").glob("*.pkl"))
+    mtimes = partition_mtimes(output_path)
+
+    with caplog.at_level(logging.INFO):
+        prepare(raw_dir, tmp_path)
+
+    assert not [record for record in caplog.records if record.getMessage().startswith("Parsed")]
+    assert "up to date" in caplog.text
+    assert sorted((tmp_path / "out" / ".cache" / "definitive").glob("*.pkl")) == cached
+    assert partition_mtimes(output_path) == mtimes
+
+
+def test_only_the_changed_year_is_rewritten(raw_dir, tmp_path):
+    output_path = prepare(raw_dir, tmp_path)
+    mtimes = partition_mtimes(output_path)
+
+    write_definitive(raw_dir, 2021, offset=1000.0)
+    prepare(raw_dir, tmp_path)
+
+    new_mtimes = partition_mtimes(output_path)
+    assert new_mtimes[2021] != mtimes[2021]
+    assert new_mtimes[2020] == mtimes[2020] and new_mtimes[2022] == mtimes[2022]
+    # The stale parse of the old content is dropped
+    assert len(list((tmp_path / "out" / ".cache" / "definitive").glob("*2021-*.pkl"))) == 1
+
+    df = load(output_path)
+    assert df.loc[df["Datetime"] == "2021-01-01 00:30", "Consommation"].item() == 3022.0
+    assert df.loc[df["Datetime"] == "2020-01-01 00:30", "Consommation"].item() == 2021.0
+
+
+def test_a_failed_save_is_retried_on_the_next_run(raw_dir, tmp_path, monkeypatch):
+    output_path = prepare(raw_dir, tmp_path)
+    write_definitive(raw_dir, 2021, offset=1000.0)
+
+    def failing_save(self, df):
+        raise OSError("disk full")
+
+    # The new file is parsed and cached, then writing its partition fails
+    with monkeypatch.context() as patch:
+        patch.setattr(eco2mix_prestructuration_data.PartitionedParquetDataset, "save", failing_save)
+        with pytest.raises(OSError):
+            prepare(raw_dir, tmp_path)
+
+    prepare(raw_dir, tmp_path)
+
+    df = load(output_path)
+    assert df.loc[df["Datetime"] == "2021-01-01 00:30", "Consommation"].item() == 3022.0
+    manifest = json.loads((tmp_path / "out" / ".cache" / "definitive" / "manifest.json").read_text())
+    assert sorted(manifest["files"]) == [
+        f"definitive/{year}/eCO2mix_RTE_Annuel-Definitif_{year}.xls" for year in YEARS
+    ]
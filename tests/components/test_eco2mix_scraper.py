@@ -0,0 +1,176 @@
+import io
+import json
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from edf_forecasting.components.eco2mix_scraper import Eco2MixScraper, sha256_file
+
+def make_zip(text):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("eCO2mix_RTE_Annuel-Definitif_2020.xls", text)
+    return buffer.getvalue()
+
+class Eco2mixStandIn(BaseHTTPRequestHandler):
+    """Download endpoint stand-in honouring Range and If-Range against the ETag of `body`."""
+
+    body = b""
+    etag = '"v1"'
+    failures = []  # statuses answered, one per request, before serving
+    range_start = None  # when set, 206 responses start there whatever the requested offset
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        cls.requests.append({key: value for key, value in self.headers.items() if key in ("Range", "If-Range")})
+        if cls.failures:
+            self.send_response(cls.failures.pop(0))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body, start = cls.body, None
+        requested = self.headers.get("Range")
+        if requested and self.headers.get("If-Range", cls.etag) == cls.etag:
+            start = int(requested.removeprefix("bytes=").rstrip("-"))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if cls.range_start is not None:
+                start = cls.range_start
+
+        payload = body if start is None else body[start:]
+        self.send_response(200 if start is None else 206)
+        self.send_header("ETag", cls.etag)
+        self.send_header("Content-Length", str(len(payload)))
+        if start is not None:
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        self.end_headers()
+        self.wfile.write(payload)
+
+@pytest.fixture
+def url():
+    Eco2mixStandIn.body = make_zip("Date\tHeures\tConsommation\n" * 200)
+    Eco2mixStandIn.etag = '"v1"'
+    Eco2mixStandIn.failures = []
+    Eco2mixStandIn.range_start = None
+    Eco2mixStandIn.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Eco2mixStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/eco2mix.zip"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def scraper(tmp_path):
+    return Eco2MixScraper(output_dir=tmp_path, max_workers=1, max_retries=2, backoff_factor=0.0)
+
+def download(scraper, url, key="definitive/2020", keep_if_not_zip=False):
+    dest_dir = scraper.output_dir / key
+    scraper._download_archive(key, url, dest_dir, "archive.zip", keep_if_not_zip)
+    return dest_dir
+
+def part_path(scraper, key="definitive/2020"):
+    scraper.download_dir.mkdir(parents=True, exist_ok=True)
+    return scraper.download_dir / f"{key.replace('/', '_')}.part"
+
+def extracted(dest_dir):
+    return (dest_dir / "eCO2mix_RTE_Annuel-Definitif_2020.xls").read_text()
+
+def test_download_is_recorded_and_skipped_once_complete(scraper, url):
+    dest_dir = download(scraper, url)
+    manifest = json.loads(scraper.manifest_path.read_text())["definitive/2020"]
+
+    assert extracted(dest_dir).startswith("Date\tHeures")
+    name = "eCO2mix_RTE_Annuel-Definitif_2020.xls"
+    assert manifest["files"] == {name: sha256_file(dest_dir / name)}
+    assert list(scraper.download_dir.iterdir()) == []
+
+    download(scraper, url)
+    assert len(Eco2mixStandIn.requests) == 1
+
+def test_corrupted_file_is_downloaded_again(scraper, url):
+    dest_dir = download(scraper, url)
+    (dest_dir / "eCO2mix_RTE_Annuel-Definitif_2020.xls").write_text("truncated")
+
+    download(scraper, url)
+    assert len(Eco2mixStandIn.requests) == 2
+    assert extracted(dest_dir).startswith("Date\tHeures")
+
+def test_partial_file_is_resumed(scraper, url):
+    path = part_path(scraper)
+    path.write_bytes(Eco2mixStandIn.body[:100])
+    path.with_name(path.name + ".validator").write_text(Eco2mixStandIn.etag)
+
+    dest_dir = download(scraper, url)
+    assert Eco2mixStandIn.requests == [{"Range": "bytes=100-", "If-Range": '"v1"'}]
+    assert extracted(dest_dir).startswith("Date\tHeures")
+
+def test_partial_file_of_an_older_archive_is_replaced(scraper, url):
+    path = part_path(scraper, "tempo/2020-2021")
+    path.write_bytes(b"old calendar bytes")
+    path.with_name(path.name + ".validator").write_text('"v0"')
+    Eco2mixStandIn.body = b"new calendar, not a zip"
+
+    dest_dir = download(scraper, url, key="tempo/2020-2021", keep_if_not_zip=True)
+    assert (dest_dir / "archive.zip").read_bytes() == b"new calendar, not a zip"
+
+def test_mismatched_content_range_restarts_from_zero(scraper, url):
+    path = part_path(scraper, "tempo/2020-2021")
+    path.write_bytes(b"old calendar bytes")
+    Eco2mixStandIn.body = b"new calendar, not a zip, longer than the old one"
+    # A server answering 206 from the start of the file whatever the offset asked for
+    Eco2mixStandIn.range_start = 0
+
+    dest_dir = download(scraper, url, key="tempo/2020-2021", keep_if_not_zip=True)
+    assert [request.get("Range") for request in Eco2mixStandIn.requests] == ["bytes=18-", None]
+    assert (dest_dir / "archive.zip").read_bytes() == Eco2mixStandIn.body
+    manifest = json.loads(scraper.manifest_path.read_text())["tempo/2020-2021"]
+    assert manifest["files"]["archive.zip"] == sha256_file(dest_dir / "archive.zip")
+
+def test_complete_partial_file_is_extracted_on_416(scraper, url):
+    part_path(scraper).write_bytes(Eco2mixStandIn.body)
+
+    dest_dir = download(scraper, url)
+    assert len(Eco2mixStandIn.requests) == 1
+    assert extracted(dest_dir).startswith("Date\tHeures")
+
+def test_oversized_partial_file_is_restarted_on_416(scraper, url):
+    part_path(scraper).write_bytes(Eco2mixStandIn.body + b"trailing garbage")
+
+    dest_dir = download(scraper, url)
+    assert [request.get("Range") for request in Eco2mixStandIn.requests] == [
+        f"bytes={len(Eco2mixStandIn.body) + 16}-", None
+    ]
+    assert extracted(dest_dir).startswith("Date\tHeures")
+
+def test_transient_errors_are_retried(scraper, url):
+    Eco2mixStandIn.failures = [503, 429]
+
+    dest_dir = download(scraper, url)
+    assert len(Eco2mixStandIn.requests) == 3
+    assert extracted(dest_dir).startswith("Date\tHeures")
+
+def test_persistent_errors_give_up_without_recording(scraper, url):
+    Eco2mixStandIn.failures = [503] * 3
+
+    dest_dir = download(scraper, url)
+    assert len(Eco2mixStandIn.requests) == 3
+    assert not dest_dir.exists()
+    assert not scraper.manifest_path.exists()
+
+def test_client_errors_are_not_retried(scraper, url):
+    Eco2mixStandIn.failures = [404]
+
+    download(scraper, url)
+    assert len(Eco2mixStandIn.requests) == 1
+    assert not scraper.manifest_path.exists()
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from sklearn.metrics import mean_absolute_error, mean_pinball_loss, r2_score, root_mean_squared_error
+
+from edf_forecasting.components.eco2mix_streaming_metrics import StreamingMetrics
+
+QUANTILE = 0.1
+
+
+def batch_metrics(y_true, y_pred, lower, upper):
+    return {
+        "rmse": root_mean_squared_error(y_true, y_pred),
+        "mae": mean_absolute_error(y_true, y_pred),
+        "r2": r2_score(y_true, y_pred),
+        "coverage": np.mean((y_true >= lower) & (y_true <= upper)),
+        "interval_width": np.mean(upper - lower),
+        "pinball_loss_lower": mean_pinball_loss(y_true, lower, alpha=QUANTILE / 2),
+        "pinball_loss_upper": mean_pinball_loss(y_true, upper, alpha=1 - QUANTILE / 2),
+        "overflow_rate": np.mean(y_true > upper),
+        "n_samples": len(y_true),
+    }
+
+
+@pytest.fixture
+def forecasts():
+    rng = np.random.default_rng(0)
+    n = 10_000
+    # Consumption-like levels, in MW, so the sums stay far from their variance
+    y_true = 55_000 + 10_000 * np.sin(np.arange(n) / 48) + rng.normal(0, 1_000, n)
+    y_pred = y_true + rng.normal(200, 1_500, n)
+    return y_true, y_pred, y_pred - 2_500, y_pred + 2_500, rng.integers(0, 3, n)
+
+
+def test_streaming_metrics_match_sklearn(forecasts):
+    y_true, y_pred, lower, upper, _ = forecasts
+    metrics = StreamingMetrics(quantile=QUANTILE)
+    for start in range(0, len(y_true), 1_024):
+        chunk = slice(start, start + 1_024)
+        metrics.update(y_true[chunk], y_pred[chunk], lower[chunk], upper[chunk])
+
+    (result,) = metrics.result()
+    assert result == pytest.approx(batch_metrics(y_true, y_pred, lower, upper), rel=1e-9)
+
+
+def test_streaming_metrics_match_sklearn_per_group(forecasts):
+    y_true, y_pred, lower, upper, codes = forecasts
+    metrics = StreamingMetrics(n_groups=4, quantile=QUANTILE)
+    for start in range(0, len(y_true), 999):
+        chunk = slice(start, start + 999)
+        metrics.update(y_true[chunk], y_pred[chunk], lower[chunk], upper[chunk], codes[chunk])
+
+    results = metrics.result()
+    for group in range(3):
+        mask = codes == group
+        expected = batch_metrics(y_true[mask], y_pred[mask], lower[mask], upper[mask])
+        assert results[group] == pytest.approx(expected, rel=1e-9)
+    assert results[3] is None
+
+
+def test_streaming_metrics_without_bounds():
+    y_true, y_pred = np.array([1.0, 2.0, 4.0]), np.array([1.5, 2.0, 3.0])
+    metrics = StreamingMetrics()
+    metrics.update(y_true, y_pred)
+
+    (result,) = metrics.result()
+    assert set(result) == {"rmse", "mae", "r2", "n_samples"}
+    assert result["r2"] == pytest.approx(r2_score(y_true, y_pred))
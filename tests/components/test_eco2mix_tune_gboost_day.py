@@ -0,0 +1,39 @@
+import numpy as np
+import optuna
+import pytest
+
+from edf_forecasting.components.eco2mix_tune_gboost_day import XGBoostTuner
+
+TRIAL_PARAMS = {
+    "n_estimators": 50,
+    "max_depth": 3,
+    "learning_rate": 0.1,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+    "colsample_bynode": 1.0,
+    "gamma": 0.0,
+    "reg_alpha": 1e-3,
+    "reg_lambda": 1.0,
+    "min_child_weight": 1,
+    "booster": "gbtree"
+}
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 6)).astype(np.float32)
+    y = (X @ rng.normal(size=(6, 4)) + rng.normal(scale=0.1, size=(300, 4))).astype(np.float32)
+    return X, y
+
+@pytest.mark.parametrize("multi_strategy", ["separate", "one_output_per_tree", "multi_output_tree"])
+def test_dmatrix_engine_tunes_the_same_model_as_sklearn(data, multi_strategy):
+    X, y = data
+    params = dict(TRIAL_PARAMS)
+    if multi_strategy == "multi_output_tree":
+        params.pop("booster")
+
+    scores = {}
+    for engine in ("dmatrix", "sklearn"):
+        tuner = XGBoostTuner(engine=engine, multi_strategy=multi_strategy, pruning=False)
+        scores[engine] = tuner.objective(X, y, n_jobs=1)(optuna.trial.FixedTrial(params))
+    assert scores["dmatrix"] == pytest.approx(scores["sklearn"], rel=1e-5)
@@ -0,0 +1,35 @@
+import numpy as np
+import optuna
+import pytest
+from optuna.trial import TrialState
+
+from edf_forecasting.components.eco2mix_tune_xgboost_30min import (
+    MAX_N_ESTIMATORS, MULTI_FIDELITY_MAX_N_ESTIMATORS, XGBoostTuner
+)
+
+@pytest.fixture
+def windows():
+    t = np.arange(1200)
+    series = 50000 + 8000 * np.sin(2 * np.pi * t / 48) + np.random.default_rng(0).normal(0, 500, len(t))
+    X = np.lib.stride_tricks.sliding_window_view(series, 8)[:-1].astype(np.float32)
+    return X, series[8:].astype(np.float32)
+
+def test_multi_fidelity_searches_more_rounds_by_default():
+    assert XGBoostTuner().max_n_estimators == MAX_N_ESTIMATORS
+    assert XGBoostTuner(fidelity="multi").max_n_estimators == MULTI_FIDELITY_MAX_N_ESTIMATORS
+    assert XGBoostTuner(fidelity="multi", max_n_estimators=120).max_n_estimators == 120
+
+def test_low_rungs_prune_under_hyperband(windows):
+    X, y = windows
+    tuner = XGBoostTuner(fidelity="multi", cv=2, max_n_estimators=60)
+    study = optuna.create_study(sampler=optuna.samplers.RandomSampler(seed=0), pruner=tuner.pruner())
+    study.optimize(tuner.objective(X, y, n_jobs=1), n_trials=20)
+
+    assert isinstance(study.pruner, optuna.pruners.HyperbandPruner)
+    pruned = study.get_trials(deepcopy=False, states=(TrialState.PRUNED,))
+    complete = study.get_trials(deepcopy=False, states=(TrialState.COMPLETE,))
+    assert pruned and complete
+    # Pruned trials never reach the last rung, and some stop at the first one
+    assert all(max(trial.intermediate_values) < len(tuner.rungs) for trial in pruned)
+    assert any(max(trial.intermediate_values) == 1 for trial in pruned)
+    assert all(set(trial.intermediate_values) == {1, 2} for trial in complete)
@@ -0,0 +1,88 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from edf_forecasting.components.eco2mix_weather_store import OpenMeteoWeatherStore
+
+class OpenMeteoStandIn(BaseHTTPRequestHandler):
+    """Archive API stand-in: the value of a timestamp is its day of month, null from `published_until` on."""
+
+    requests = []
+    published_until = pd.Timestamp("2100-01-01")
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        frequency = "daily" if "daily" in query else "hourly"
+        variables = query[frequency].split(",")
+        type(self).requests.append((frequency, query["start_date"], query["end_date"], variables))
+
+        end = pd.Timestamp(query["end_date"]) + pd.Timedelta(days=1)
+        times = pd.date_range(query["start_date"], end, freq="D" if frequency == "daily" else "h", inclusive="left")
+        body = {frequency: {"time": [t.strftime("%Y-%m-%dT%H:%M") for t in times]}}
+        for variable in variables:
+            body[frequency][variable] = [float(t.day) if t < self.published_until else None for t in times]
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+@pytest.fixture
+def store(tmp_path):
+    OpenMeteoStandIn.requests = []
+    OpenMeteoStandIn.published_until = pd.Timestamp("2100-01-01")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OpenMeteoStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield OpenMeteoWeatherStore(cache_dir=tmp_path, base_url=f"http://127.0.0.1:{server.server_port}/v1/archive")
+    server.shutdown()
+    server.server_close()
+
+def test_only_missing_ranges_are_requested(store):
+    store.get("daily", ["temperature_2m_mean"], "2023-01-10", "2023-01-20")
+    df = store.get("daily", ["temperature_2m_mean"], "2023-01-01", "2023-01-31")
+
+    assert OpenMeteoStandIn.requests == [
+        ("daily", "2023-01-10", "2023-01-20", ["temperature_2m_mean"]),
+        ("daily", "2023-01-01", "2023-01-09", ["temperature_2m_mean"]),
+        ("daily", "2023-01-21", "2023-01-31", ["temperature_2m_mean"]),
+    ]
+    assert df["temperature_2m_mean"].tolist() == [float(day) for day in range(1, 32)]
+
+def test_new_variable_is_requested_alone(store):
+    store.get("daily", ["temperature_2m_mean"], "2023-01-01", "2023-01-31")
+    df = store.get("daily", ["temperature_2m_mean", "sunshine_duration"], "2023-01-05", "2023-01-25")
+
+    assert OpenMeteoStandIn.requests[1:] == [("daily", "2023-01-05", "2023-01-25", ["sunshine_duration"])]
+    assert list(df.columns) == ["time", "temperature_2m_mean", "sunshine_duration"]
+    assert df.notna().all().all()
+
+def test_second_run_is_offline(store):
+    first = store.get("hourly", ["temperature_2m"], "2023-03-01", "2023-03-05")
+    n_requests = len(OpenMeteoStandIn.requests)
+    second = store.get("hourly", ["temperature_2m"], "2023-03-01", "2023-03-05")
+
+    assert len(OpenMeteoStandIn.requests) == n_requests == 1
+    assert len(first) == 5 * 24
+    pd.testing.assert_frame_equal(first, second)
+
+def test_null_values_are_not_cached(store):
+    OpenMeteoStandIn.published_until = pd.Timestamp("2023-03-05 12:00")
+    partial = store.get("hourly", ["temperature_2m"], "2023-03-01", "2023-03-05")
+    assert len(partial) == 4 * 24 + 12
+    assert partial["temperature_2m"].notna().all()
+
+    # The partly published day is requested again, and only that day
+    OpenMeteoStandIn.published_until = pd.Timestamp("2100-01-01")
+    full = store.get("hourly", ["temperature_2m"], "2023-03-01", "2023-03-05")
+    assert OpenMeteoStandIn.requests[-1] == ("hourly", "2023-03-05", "2023-03-05", ["temperature_2m"])
+    assert len(full) == 5 * 24
+    assert full["temperature_2m"].notna().all()
@@ -0,0 +1,50 @@
+import mmap
+import numpy as np
+import pandas as pd
+import pytest
+
+from edf_forecasting.components.eco2mix_windowed_dataset import Eco2mixWindowedDataset
+
+def is_memory_mapped(array):
+    while array is not None and not isinstance(array, mmap.mmap):
+        array = getattr(array, "base", None)
+    return array is not None
+
+@pytest.fixture
+def df():
+    values = np.random.default_rng(0).normal(50000, 5000, 500)
+    values[10] = np.nan
+    return pd.DataFrame({"Consommation": values})
+
+def test_windows_are_views_of_the_series(df):
+    dataset = Eco2mixWindowedDataset.from_frame(df, "Consommation", 48)
+    values = df["Consommation"].to_numpy()
+
+    assert len(dataset) == len(df) - 48
+    np.testing.assert_array_equal(dataset.X[100], values[100:148])
+    assert dataset.y[100] == values[148]
+    assert not dataset.X.flags.writeable
+
+def test_mmap_file_is_reused_when_it_holds_the_values(tmp_path, df):
+    path = tmp_path / "values.npy"
+    Eco2mixWindowedDataset.from_frame(df, "Consommation", 48, mmap_path=path)
+    written = path.stat().st_mtime_ns
+
+    dataset = Eco2mixWindowedDataset.from_frame(df, "Consommation", 48, mmap_path=path)
+    assert path.stat().st_mtime_ns == written
+    assert is_memory_mapped(dataset.values)
+    np.testing.assert_array_equal(dataset.values, df["Consommation"].to_numpy())
+
+@pytest.mark.parametrize("change", [
+    lambda df: df.assign(Consommation=df["Consommation"] + 1.0),
+    lambda df: df.iloc[:-1],
+    lambda df: df.astype("float32"),
+])
+def test_mmap_file_is_rewritten_when_the_values_change(tmp_path, df, change):
+    path = tmp_path / "values.npy"
+    Eco2mixWindowedDataset.from_frame(df, "Consommation", 48, mmap_path=path)
+
+    changed = change(df)
+    dataset = Eco2mixWindowedDataset.from_frame(changed, "Consommation", 48, mmap_path=path)
+    np.testing.assert_array_equal(dataset.values, changed["Consommation"].to_numpy())
+    assert dataset.values.dtype == changed["Consommation"].dtype
@@ -0,0 +1,116 @@
+import numpy as np
+import optuna
+import pytest
+from optuna.trial import TrialState
+from sklearn.model_selection import cross_val_score
+from sklearn.multioutput import MultiOutputRegressor
+from xgboost import XGBRegressor
+
+from edf_forecasting.components.eco2mix_xgboost_cv import ROUND_STEPS, XGBoostFoldCache, make_pruner, make_splitter
+
+PARAMS = {
+    "n_estimators": 20,
+    "max_depth": 4,
+    "learning_rate": 0.1,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+    "n_jobs": 1,
+    "random_state": 42
+}
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 8)).astype(np.float32)
+    coefs = rng.normal(size=(8, 3))
+    y = (X @ coefs + rng.normal(scale=0.1, size=(400, 3))).astype(np.float32)
+    return X, y
+
+def sklearn_scores(model, X, y, cv_strategy="timeseries"):
+    splitter = make_splitter(3, cv_strategy)
+    return -cross_val_score(model, X, y, cv=splitter, scoring="neg_root_mean_squared_error")
+
+@pytest.mark.parametrize("cv_strategy", ["timeseries", "kfold"])
+def test_single_target_scores_match_cross_val_score(data, cv_strategy):
+    X, y = data
+    cache = XGBoostFoldCache(X, y[:, 0], cv=3, cv_strategy=cv_strategy)
+    expected = sklearn_scores(XGBRegressor(**PARAMS), X, y[:, 0], cv_strategy)
+    np.testing.assert_allclose(cache.score(PARAMS), expected, rtol=1e-5)
+
+def test_separate_scores_match_multi_output_regressor(data):
+    X, y = data
+    cache = XGBoostFoldCache(X, y, cv=3)
+    expected = sklearn_scores(MultiOutputRegressor(XGBRegressor(**PARAMS)), X, y)
+    np.testing.assert_allclose(cache.score({**PARAMS, "multi_strategy": "separate"}), expected, rtol=1e-5)
+
+def test_multi_target_scores_match_native_multi_output(data):
+    X, y = data
+    params = {**PARAMS, "multi_strategy": "one_output_per_tree"}
+    cache = XGBoostFoldCache(X, y, cv=3)
+    expected = sklearn_scores(XGBRegressor(**params), X, y)
+    np.testing.assert_allclose(cache.score(params), expected, rtol=1e-5)
+
+def test_separate_scoring_restores_fold_labels(data):
+    X, y = data
+    cache = XGBoostFoldCache(X, y, cv=3)
+    before = cache.score(PARAMS)
+    cache.score({**PARAMS, "multi_strategy": "separate"})
+    np.testing.assert_allclose(cache.score(PARAMS), before)
+
+def run_trial(cache, params, pruner=None):
+    study = optuna.create_study(pruner=pruner or make_pruner(n_startup_trials=100))
+    study.optimize(lambda trial: float(np.mean(cache.score(params, trial))), n_trials=1)
+    return study.trials[0]
+
+@pytest.mark.parametrize("multi_strategy", ["one_output_per_tree", "multi_output_tree"])
+def test_trials_report_every_round_of_every_fold(data, multi_strategy):
+    X, y = data
+    cache = XGBoostFoldCache(X, y, cv=3)
+    params = {**PARAMS, "multi_strategy": multi_strategy}
+    trial = run_trial(cache, params)
+
+    assert sorted(trial.intermediate_values) == [fold * ROUND_STEPS + r for fold in range(3) for r in range(20)]
+    # The last round of a fold is that fold's score, with the metric trials are scored on
+    scores = cache.score(params)
+    for fold in range(3):
+        assert trial.intermediate_values[fold * ROUND_STEPS + 19] == pytest.approx(scores[fold], rel=1e-5)
+
+def test_separate_boosters_report_their_own_steps(data):
+    X, y = data
+    cache = XGBoostFoldCache(X, y, cv=3)
+    params = {**PARAMS, "multi_strategy": "separate"}
+    trial = run_trial(cache, params)
+
+    # Fold k, column j: steps (3k + j) * ROUND_STEPS + round
+    assert sorted(trial.intermediate_values) == [booster * ROUND_STEPS + r for booster in range(9) for r in range(20)]
+    scores = cache.score(params)
+    for fold in range(3):
+        last_rounds = [trial.intermediate_values[(3 * fold + j) * ROUND_STEPS + 19] for j in range(3)]
+        # Per-column RMSEs average to the fold score, as for a MultiOutputRegressor
+        assert np.mean(last_rounds) == pytest.approx(scores[fold], rel=1e-5)
+
+def test_dart_boosters_only_report_their_last_round(data):
+    X, y = data
+    cache = XGBoostFoldCache(X, y[:, 0], cv=3)
+    trial = run_trial(cache, {**PARAMS, "booster": "dart"})
+    assert sorted(trial.intermediate_values) == [fold * ROUND_STEPS + 19 for fold in range(3)]
+
+def test_hopeless_trial_is_pruned_inside_its_first_fold(data):
+    X, y = data
+    cache = XGBoostFoldCache(X, y[:, 0], cv=3)
+    study = optuna.create_study(pruner=make_pruner(n_startup_trials=1, n_warmup_steps=5))
+
+    def objective(trial):
+        learning_rate = trial.suggest_float("learning_rate", 1e-3, 0.3, log=True)
+        return float(np.mean(cache.score({**PARAMS, "learning_rate": learning_rate}, trial)))
+
+    study.enqueue_trial({"learning_rate": 0.3})
+    study.enqueue_trial({"learning_rate": 1e-3})
+    study.optimize(objective, n_trials=2)
+
+    good, hopeless = study.trials
+    assert good.state == TrialState.COMPLETE
+    assert hopeless.state == TrialState.PRUNED
+    # Compared round by round with the good trial, and stopped right after the warm-up
+    assert sorted(hopeless.intermediate_values) == list(range(6))
+    assert hopeless.intermediate_values[5] > good.intermediate_values[5]
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from edf_forecasting.datasets.partitioned_parquet_dataset import PartitionedParquetDataset
+
+@pytest.fixture
+def df_indexed():
+    index = pd.date_range("2020-12-31 12:00", "2023-01-01 12:00", freq="6h", name="Datetime")
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "Consommation": rng.normal(50000, 5000, len(index)),
+        "Temperature": rng.normal(10, 5, len(index)),
+        "Tempo": rng.choice(["BLEU", "BLANC", "ROUGE"], len(index))
+    }, index=index)
+
+def test_round_trip_with_datetime_index(tmp_path, df_indexed):
+    dataset = PartitionedParquetDataset(str(tmp_path / "data"))
+    dataset.save(df_indexed)
+
+    partitions = sorted(p.name for p in (tmp_path / "data").iterdir())
+    assert partitions == ["year=2020", "year=2021", "year=2022", "year=2023"]
+    pd.testing.assert_frame_equal(dataset.load(), df_indexed, check_freq=False)
+
+def test_round_trip_with_datetime_column(tmp_path, df_indexed):
+    df = df_indexed.reset_index()
+    dataset = PartitionedParquetDataset(str(tmp_path / "data"), datetime_col="Datetime")
+    dataset.save(df)
+    pd.testing.assert_frame_equal(dataset.load(), df)
+
+def test_years_prune_partitions(tmp_path, df_indexed):
+    PartitionedParquetDataset(str(tmp_path / "data")).save(df_indexed)
+    loaded = PartitionedParquetDataset(str(tmp_path / "data"), years=[2021, 2022]).load()
+    expected = df_indexed[df_indexed.index.year.isin([2021, 2022])]
+    pd.testing.assert_frame_equal(loaded, expected, check_freq=False)
+
+def test_filters_and_column_projection(tmp_path, df_indexed):
+    PartitionedParquetDataset(str(tmp_path / "data")).save(df_indexed)
+    dataset = PartitionedParquetDataset(
+        str(tmp_path / "data"),
+        load_args={"columns": ["Consommation"], "filters": [[("year", "<=", 2021), ("Tempo", "==", "ROUGE")]]}
+    )
+    loaded = dataset.load()
+
+    expected = df_indexed.loc[(df_indexed.index.year <= 2021) & (df_indexed["Tempo"] == "ROUGE"), ["Consommation"]]
+    assert list(loaded.columns) == ["Consommation"]
+    pd.testing.assert_frame_equal(loaded, expected, check_freq=False)
+
+def test_update_mode_replaces_only_saved_years(tmp_path, df_indexed):
+    PartitionedParquetDataset(str(tmp_path / "data")).save(df_indexed)
+    update = df_indexed[df_indexed.index.year == 2022].copy()
+    update["Consommation"] = 0.0
+    PartitionedParquetDataset(str(tmp_path / "data"), save_args={"mode": "update"}).save(update)
+
+    loaded = PartitionedParquetDataset(str(tmp_path / "data")).load()
+    expected = df_indexed.copy()
+    expected.loc[expected.index.year == 2022, "Consommation"] = 0.0
+    pd.testing.assert_frame_equal(loaded, expected, check_freq=False)
+    assert PartitionedParquetDataset(str(tmp_path / "data"))._exists()
@@ -0,0 +1,75 @@
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.multioutput import MultiOutputRegressor
+from xgboost import XGBRegressor
+
+from edf_forecasting.datasets.xgboost_model_dataset import XGBoostModelBundle, XGBoostModelDataset
+
+PARAMS = {"n_estimators": 60, "max_depth": 3, "learning_rate": 0.3, "n_jobs": 1, "random_state": 0}
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 8)).astype(np.float32)
+    y = X[:, :2] @ np.array([[1.0, -0.5], [2.0, 0.3]]) + rng.normal(scale=0.5, size=(600, 2))
+    return X, y
+
+
+def round_trip(model, tmp_path):
+    dataset = XGBoostModelDataset(filepath=str(tmp_path / "model"))
+    dataset.save(model)
+    return dataset.load()
+
+
+def test_regressor_round_trip(data, tmp_path):
+    X, y = data
+    model = XGBRegressor(**PARAMS).fit(X, y[:, 0])
+
+    bundle = round_trip(model, tmp_path)
+    assert isinstance(bundle, XGBoostModelBundle)
+    assert bundle.n_features_in_ == X.shape[1]
+    np.testing.assert_allclose(bundle.predict(X), model.predict(X), rtol=1e-6)
+
+
+def test_early_stopped_regressor_keeps_the_best_iteration(data, tmp_path):
+    X, y = data
+    # A high learning rate overfits fast, so the best iteration is well before the last
+    model = XGBRegressor(**{**PARAMS, "n_estimators": 200, "learning_rate": 1.0}, early_stopping_rounds=5)
+    model.fit(X[:400], y[:400, 0], eval_set=[(X[400:], y[400:, 0])], verbose=False)
+    assert model.best_iteration + 1 < model.get_booster().num_boosted_rounds()
+
+    bundle = round_trip(model, tmp_path)
+    assert bundle.boosters[0].num_boosted_rounds() == model.best_iteration + 1
+    np.testing.assert_allclose(bundle.predict(X), model.predict(X), rtol=1e-6)
+
+
+@pytest.mark.parametrize("multi_strategy", ["one_output_per_tree", "multi_output_tree"])
+def test_native_multi_output_round_trip(data, tmp_path, multi_strategy):
+    X, y = data
+    model = XGBRegressor(**PARAMS, tree_method="hist", multi_strategy=multi_strategy).fit(X, y)
+
+    bundle = round_trip(model, tmp_path)
+    assert len(bundle.boosters) == 1
+    np.testing.assert_allclose(bundle.predict(X), model.predict(X), rtol=1e-6)
+
+
+def test_multi_output_regressor_round_trip(data, tmp_path):
+    X, y = data
+    model = MultiOutputRegressor(XGBRegressor(**PARAMS)).fit(X, y)
+
+    bundle = round_trip(model, tmp_path)
+    assert len(bundle.boosters) == 2
+    np.testing.assert_allclose(bundle.predict(X), model.predict(X), rtol=1e-6)
+
+
+def test_pickled_model_stays_readable(data, tmp_path):
+    X, y = data
+    model = XGBRegressor(**PARAMS).fit(X, y[:, 0])
+    path = tmp_path / "model.pkl"
+    path.write_bytes(pickle.dumps(model))
+
+    loaded = XGBoostModelDataset(filepath=str(path)).load()
+    np.testing.assert_allclose(loaded.predict(X), model.predict(X))
@@ -0,0 +1,158 @@
+import json
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from kedro.framework.hooks.manager import _create_hook_manager
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.pipeline import node, pipeline
+from kedro.runner import SequentialRunner
+
+from edf_forecasting import hooks
+from edf_forecasting.hooks import NodeCacheHook, NodePerformanceHook, dataset_size
+
+TOY_MODULES = {
+    "__init__.py": "",
+    "core.py": "OFFSET = 0\n",
+    "helpers.py": "from cachetoy import core\n\ndef scale(df, factor):\n    return df * factor + core.OFFSET\n",
+    "nodes.py": (
+        "from cachetoy.helpers import scale\n\ncalls = []\n\n"
+        "def double(df, params):\n    calls.append(params)\n    return scale(df, params['factor'])\n"
+    ),
+}
+
+
+@pytest.fixture
+def toy_package(tmp_path, monkeypatch):
+    """A throwaway project package: nodes.py -> helpers.py -> core.py."""
+    package_dir = tmp_path / "src" / "cachetoy"
+    package_dir.mkdir(parents=True)
+    for name, source in TOY_MODULES.items():
+        (package_dir / name).write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    monkeypatch.setattr(hooks, "PACKAGE", "cachetoy")
+    monkeypatch.delenv("EDF_NODE_CACHE", raising=False)
+
+    import cachetoy.nodes
+    yield package_dir
+    for module in [name for name in sys.modules if name.split(".")[0] == "cachetoy"]:
+        del sys.modules[module]
+
+
+def run_cached(toy_package, tmp_path, df, params):
+    """Wrap the toy node as a pipeline run would, then call it."""
+    from cachetoy.nodes import double
+
+    toy = pipeline([node(double, ["df", "params:toy"], "doubled", name="double")])
+    NodeCacheHook(cache_dir=tmp_path / "cache", nodes=["double"]).before_pipeline_run({}, toy, None)
+    return toy.nodes[0].func(df, params)
+
+
+def test_unchanged_run_hits_the_cache(toy_package, tmp_path):
+    from cachetoy.nodes import calls
+
+    df = pd.DataFrame({"x": [1.0, 2.0]})
+    first = run_cached(toy_package, tmp_path, df, {"factor": 2})
+    second = run_cached(toy_package, tmp_path, df.copy(), {"factor": 2})
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_input_or_parameter_change_misses_the_cache(toy_package, tmp_path):
+    from cachetoy.nodes import calls
+
+    df = pd.DataFrame({"x": [1.0, 2.0]})
+    run_cached(toy_package, tmp_path, df, {"factor": 2})
+    result = run_cached(toy_package, tmp_path, df, {"factor": 3})
+    run_cached(toy_package, tmp_path, df.assign(x=[1.0, 5.0]), {"factor": 3})
+
+    assert len(calls) == 3
+    assert result["x"].tolist() == [3.0, 6.0]
+
+
+@pytest.mark.parametrize("module, old, new", [
+    ("nodes.py", "calls.append(params)", "calls.append(dict(params))"),
+    ("helpers.py", "df * factor", "factor * df"),
+    # Two modules away: nodes.py only imports helpers.py
+    ("core.py", "OFFSET = 0", "OFFSET = 0.0"),
+])
+def test_source_change_misses_the_cache(toy_package, tmp_path, module, old, new):
+    from cachetoy.nodes import calls
+
+    df = pd.DataFrame({"x": [1.0, 2.0]})
+    run_cached(toy_package, tmp_path, df, {"factor": 2})
+    path = toy_package / module
+    path.write_text(path.read_text().replace(old, new))
+    run_cached(toy_package, tmp_path, df, {"factor": 2})
+
+    assert len(calls) == 2
+
+
+def test_cache_can_be_disabled(toy_package, tmp_path, monkeypatch):
+    from cachetoy.nodes import calls
+
+    monkeypatch.setenv("EDF_NODE_CACHE", "0")
+    df = pd.DataFrame({"x": [1.0, 2.0]})
+    run_cached(toy_package, tmp_path, df, {"factor": 2})
+    run_cached(toy_package, tmp_path, df, {"factor": 2})
+
+    assert len(calls) == 2
+
+
+def make_frame(n):
+    return pd.DataFrame({"x": np.arange(n, dtype=np.float64), "label": [str(i) for i in range(n)]})
+
+
+def summarize(df):
+    return {"n": len(df), "total": float(df["x"].sum())}
+
+
+def test_performance_report_of_a_toy_pipeline(tmp_path):
+    toy = pipeline([
+        node(make_frame, "params:n", "frame", name="make_frame"),
+        node(summarize, "frame", "summary", name="summarize"),
+    ])
+    catalog = DataCatalog({"params:n": MemoryDataset(10_000), "frame": MemoryDataset(copy_mode="assign")})
+    hook = NodePerformanceHook(report_dir=tmp_path / "performance", interval=0.01)
+    hook_manager = _create_hook_manager()
+    hook_manager.register(hook)
+
+    run_params = {"pipeline_name": "toy"}
+    hook_manager.hook.before_pipeline_run(run_params=run_params, pipeline=toy, catalog=catalog)
+    outputs = SequentialRunner().run(toy, catalog, hook_manager)
+    hook_manager.hook.after_pipeline_run(run_params=run_params, run_result=outputs, pipeline=toy, catalog=catalog)
+
+    (json_path,) = (tmp_path / "performance").glob("*.json")
+    assert json_path.with_suffix(".html").exists()
+    report = json.loads(json_path.read_text())
+    assert report["pipeline"] == "toy"
+
+    records = {record["node"]: record for record in report["nodes"]}
+    assert list(records) == ["make_frame", "summarize"]
+    frame_mb = dataset_size(make_frame(10_000)) / 2**20
+    assert records["make_frame"]["datasets_mb"]["frame"] == pytest.approx(frame_mb)
+    assert records["summarize"]["input_mb"] == pytest.approx(frame_mb)
+    assert records["summarize"]["datasets_mb"]["summary"] == pytest.approx(
+        len(pickle.dumps(outputs["summary"], protocol=pickle.HIGHEST_PROTOCOL)) / 2**20
+    )
+    for record in records.values():
+        assert record["wall_time_s"] >= 0 and record["cpu_time_s"] >= 0
+        assert record["peak_rss_mb"] > 0
+
+
+def test_unpicklable_datasets_are_left_out():
+    assert dataset_size(lambda x: x) is None
+    assert hooks.dataset_sizes({"func": lambda x: x, "array": np.zeros(4)}) == {"array": 32}
+
+
+def test_views_are_sized_by_their_buffer():
+    series = np.zeros(1000)
+    windows = np.lib.stride_tricks.sliding_window_view(series, 48)
+    assert windows.nbytes == 953 * 48 * 8
+    assert dataset_size(windows) == series.nbytes
+    assert dataset_size(np.broadcast_to(series, (10, 1000))) == series.nbytes
+    # A slice holds on to the whole buffer but is counted for its own elements
+    assert dataset_size(series[:10]) == 80